@@ -1,8 +1,12 @@
+from fastapi import Query
+
 from app.container.container import DIContainer
+from app.core.exceptions import InvalidFieldsError
+from app.schemas.user import UserResponse
 from app.usecase.user.user_service import UserService
 
 
-def get_user_service() -> UserService:
+async def get_user_service() -> UserService:
     """UserService の依存関数。
 
     エンドポイントで service: UserService = Depends(get_user_service) として使う。
@@ -12,5 +16,25 @@ def get_user_service() -> UserService:
     - 関数シグネチャに依存が明示されるため、中身を読まなくても何が必要かわかる
     - FastAPI が依存のライフサイクル管理・キャッシュ・ネスト解決を担う
     - エンドポイントとコンテナの結合が薄くなり、DI 基盤の差し替えがこの関数だけで済む
+
+    async def にしているのは、同期の依存関数だと FastAPI がスレッドプールで実行してしまうため。
     """
     return DIContainer.resolve(UserService)
+
+
+async def get_user_fields(
+    fields: str | None = Query(
+        default=None,
+        description="返す属性をカンマ区切りで指定する (例: user_id,name)。未指定なら全属性を返す",
+    ),
+) -> frozenset[str] | None:
+    """fields クエリを属性名の集合にする。UserResponse にない属性が含まれていれば InvalidFieldsError。"""
+    if fields is None:
+        return None
+    requested = frozenset(field.strip() for field in fields.split(",") if field.strip())
+    if not requested:
+        return None
+    unknown = sorted(requested - UserResponse.model_fields.keys())
+    if unknown:
+        raise InvalidFieldsError(unknown)
+    return requested
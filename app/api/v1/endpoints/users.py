@@ -1,41 +1,132 @@
-from fastapi import APIRouter, Depends, Query
+from collections.abc import AsyncIterator
+
+from fastapi import APIRouter, Depends, Header, Query
+from fastapi.responses import Response, StreamingResponse
 from starlette import status
 
-from app.api.dependencies import get_user_service
+from app.api.dependencies import get_user_fields, get_user_service
+from app.core.config import settings
+from app.core.constants import (
+    DEFAULT_NAME_PREFIX_LIMIT,
+    DEFAULT_PAGE_LIMIT,
+    EXPORT_CHUNK_USERS,
+    HEADER_CACHE_CONTROL,
+    HEADER_ETAG,
+    MAX_NAME_PREFIX_LIMIT,
+    MAX_PAGE_LIMIT,
+    MEDIA_TYPE_JSON,
+    MEDIA_TYPE_NDJSON,
+)
+from app.core.etag import compute_etag, etag_matches
 from app.core.types import UserId
-from app.schemas.user import UserCreate, UserResponse
+from app.domain.user.entity import User
+from app.schemas.user import (
+    UserBatchGetRequest,
+    UserBatchResponse,
+    UserBulkCreateRequest,
+    UserCreate,
+    UserPageResponse,
+    UserResponse,
+    dump_user,
+    dump_user_page,
+    dump_users,
+)
 from app.usecase.user.user_service import UserService
 
 router = APIRouter()
 
 
+def _json_response(body: bytes, if_none_match: str | None = None) -> Response:
+    """シリアライズ済みの JSON をそのまま返す。
+
+    読み取り系は検証済みの User を schemas の dump_* で直接 JSON にするので、response_model による
+    再検証・再シリアライズを通さない。response_model は OpenAPI のスキーマとしてだけ使われる。
+    ETag はボディのハッシュで、If-None-Match が一致すればボディを付けずに 304 を返す。
+    """
+    etag = compute_etag(body)
+    headers = {HEADER_ETAG: etag}
+    if settings.http_cache_control:
+        headers[HEADER_CACHE_CONTROL] = settings.http_cache_control
+    if if_none_match is not None and etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type=MEDIA_TYPE_JSON, headers=headers)
+
+
 @router.post("", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def create_user(
+async def create_user(
     user: UserCreate,
     service: UserService = Depends(get_user_service),
 ) -> UserResponse:
-    return service.create_user(user)
+    return await service.create_user(user)
+
+
+@router.post("/bulk", response_model=list[UserResponse], status_code=status.HTTP_201_CREATED)
+async def bulk_create_users(
+    request: UserBulkCreateRequest,
+    service: UserService = Depends(get_user_service),
+) -> list[UserResponse]:
+    return await service.create_users(request.users)
+
+
+@router.post("/batch-get", response_model=UserBatchResponse)
+async def batch_get_users(
+    request: UserBatchGetRequest,
+    service: UserService = Depends(get_user_service),
+) -> UserBatchResponse:
+    return await service.get_users(request.user_ids)
 
 
 @router.get("/search", response_model=list[UserResponse])
-def search_users(
+async def search_users(
     name: str | None = Query(default=None),
     email: str | None = Query(default=None),
+    name_prefix: str | None = Query(default=None, min_length=1),
+    limit: int = Query(default=DEFAULT_NAME_PREFIX_LIMIT, ge=1, le=MAX_NAME_PREFIX_LIMIT),
+    fields: frozenset[str] | None = Depends(get_user_fields),
+    if_none_match: str | None = Header(default=None),
     service: UserService = Depends(get_user_service),
-) -> list[UserResponse]:
-    return service.search_users(name=name, email=email)
+) -> Response:
+    users = await service.search_users(name=name, email=email, name_prefix=name_prefix, limit=limit, fields=fields)
+    return _json_response(dump_users(users, fields), if_none_match)
+
+
+async def _ndjson_chunks(users: AsyncIterator[User]) -> AsyncIterator[bytes]:
+    """users を NDJSON にし、EXPORT_CHUNK_USERS 行ずつ 1 つのチャンクにまとめて返す。"""
+    lines: list[bytes] = []
+    async for user in users:
+        lines.append(dump_user(user))
+        if len(lines) >= EXPORT_CHUNK_USERS:
+            yield b"\n".join(lines) + b"\n"
+            lines.clear()
+    if lines:
+        yield b"\n".join(lines) + b"\n"
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_users(
+    service: UserService = Depends(get_user_service),
+) -> StreamingResponse:
+    return StreamingResponse(_ndjson_chunks(service.export_users()), media_type=MEDIA_TYPE_NDJSON)
 
 
 @router.get("/{user_id}", response_model=UserResponse)
-def get_user(
+async def get_user(
     user_id: UserId,
+    fields: frozenset[str] | None = Depends(get_user_fields),
+    if_none_match: str | None = Header(default=None),
     service: UserService = Depends(get_user_service),
-) -> UserResponse:
-    return service.get_user(user_id)
+) -> Response:
+    user = await service.get_user(user_id, fields=fields)
+    return _json_response(dump_user(user, fields), if_none_match)
 
 
-@router.get("", response_model=list[UserResponse])
-def list_users(
+@router.get("", response_model=UserPageResponse)
+async def list_users(
+    limit: int = Query(default=DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    cursor: str | None = Query(default=None),
+    fields: frozenset[str] | None = Depends(get_user_fields),
+    if_none_match: str | None = Header(default=None),
     service: UserService = Depends(get_user_service),
-) -> list[UserResponse]:
-    return service.list_users()
+) -> Response:
+    page = await service.list_users(limit=limit, cursor=cursor, fields=fields)
+    return _json_response(dump_user_page(page, fields), if_none_match)
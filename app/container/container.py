@@ -1,24 +1,67 @@
 from typing import TypeVar
 
-from injector import Binder, Injector, Module, singleton
+from injector import Binder, Injector, Module, provider, singleton
 
+from app.core.config import settings
 from app.domain.user.i_user_repository import IUserRepository
-from app.infrastructure.datasource.dynamodb import get_table
-from app.infrastructure.repository.user_dynamodb_repository import (
-    UserDynamoDBRepository,
-)
+from app.infrastructure.repository.cached_user_repository import CachedUserRepository
+from app.infrastructure.repository.coalescing_user_repository import CoalescingUserRepository
+from app.infrastructure.repository.in_memory_user_repository import InMemoryUserRepository
+from app.infrastructure.repository.instrumented_user_repository import InstrumentedUserRepository
+from app.usecase.user.query_cache import UserQueryCache
+from app.usecase.user.user_service import UserService
 
 T = TypeVar("T")
 
 
 class RepositoryModule(Module):
     def configure(self, binder: Binder) -> None:
-        table = get_table()
-        binder.bind(
-            IUserRepository,
-            to=UserDynamoDBRepository(table=table),
-            scope=singleton,
-        )
+        backend: IUserRepository
+        if settings.user_repository_backend == "memory":
+            backend = InMemoryUserRepository()
+        else:
+            # aiobotocore / boto3 の import は重いため、DynamoDB バックエンドを選んだときだけ読み込む
+            from app.infrastructure.datasource.dynamodb import dynamodb_client_manager
+            from app.infrastructure.repository.resilience import OperationGuard
+            from app.infrastructure.repository.user_dynamodb_repository import UserDynamoDBRepository
+
+            backend = UserDynamoDBRepository(
+                client_manager=dynamodb_client_manager,
+                table_name=settings.dynamodb_table_name,
+                scan_segments=settings.dynamodb_scan_segments,
+                scan_max_workers=settings.dynamodb_scan_max_workers,
+                guard=OperationGuard(
+                    failure_threshold=settings.dynamodb_circuit_failure_threshold,
+                    reset_timeout_seconds=settings.dynamodb_circuit_reset_seconds,
+                ),
+            )
+        repository: IUserRepository = InstrumentedUserRepository(inner=backend)
+        # キャッシュミスが同時に起きた場合もまとめられるよう、coalescing はキャッシュの内側に置く
+        if settings.request_coalescing_enabled:
+            repository = CoalescingUserRepository(inner=repository)
+        if settings.user_cache_enabled:
+            repository = CachedUserRepository(
+                inner=repository,
+                max_size=settings.user_cache_max_size,
+                ttl_seconds=settings.user_cache_ttl_seconds,
+            )
+        binder.bind(IUserRepository, to=repository, scope=singleton)
+
+
+class UsecaseModule(Module):
+    def __init__(self) -> None:
+        # 世代番号を全ての UserService で共有するため、キャッシュはインジェクタごとに 1 つだけ作る
+        self._query_cache: UserQueryCache | None = None
+        if settings.query_cache_enabled:
+            self._query_cache = UserQueryCache(
+                max_entries=settings.query_cache_max_entries,
+                max_users=settings.query_cache_max_users,
+                ttl_seconds=settings.query_cache_ttl_seconds,
+            )
+
+    @provider
+    def provide_user_service(self, user_repository: IUserRepository) -> UserService:
+        return UserService(user_repository, query_cache=self._query_cache)
 
 
 class DIContainer:
@@ -27,7 +70,7 @@ class DIContainer:
     @classmethod
     def get_injector(cls) -> Injector:
         if cls._injector is None:
-            cls._injector = Injector([RepositoryModule])
+            cls._injector = Injector([RepositoryModule, UsecaseModule])
         return cls._injector
 
     @classmethod
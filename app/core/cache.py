@@ -0,0 +1,97 @@
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    size: int
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    weight: int = 0
+
+
+class LRUTTLCache[K: Hashable, V]:
+    """件数上限付きの LRU キャッシュ。各エントリは ttl_seconds 経過で失効する。
+
+    weigher と max_weight を渡すと、weigher が返す重みの合計も max_weight 以下に保つ
+    (値の大きさがまちまちなエントリでメモリ使用量を抑えるため)。
+    イベントループ上から使う前提で、await を挟まない操作だけで構成しているためロックは持たない。
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+        max_weight: int | None = None,
+        weigher: Callable[[V], int] | None = None,
+    ) -> None:
+        self._max_size = max_size
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._max_weight = max_weight
+        self._weigher = weigher
+        self._weight = 0
+        self._entries: OrderedDict[K, tuple[float, V, int]] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, key: K) -> V | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+        expires_at, value, weight = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            self._weight -= weight
+            self._expirations += 1
+            self._misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        weight = self._weigher(value) if self._weigher is not None else 0
+        previous = self._entries.get(key)
+        if previous is not None:
+            self._weight -= previous[2]
+        self._entries[key] = (self._clock() + self._ttl_seconds, value, weight)
+        self._entries.move_to_end(key)
+        self._weight += weight
+        while len(self._entries) > self._max_size or (
+            self._max_weight is not None and self._weight > self._max_weight and self._entries
+        ):
+            _, (_, _, evicted_weight) = self._entries.popitem(last=False)
+            self._weight -= evicted_weight
+            self._evictions += 1
+
+    def delete(self, key: K) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._weight -= entry[2]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._weight = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            size=len(self._entries),
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            expirations=self._expirations,
+            weight=self._weight,
+        )
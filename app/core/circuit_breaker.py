@@ -0,0 +1,90 @@
+import time
+from collections.abc import Callable
+from enum import IntEnum
+
+
+class CircuitState(IntEnum):
+    """値はメトリクス (gauge) にそのまま出す。"""
+
+    CLOSED = 0
+    HALF_OPEN = 1
+    OPEN = 2
+
+
+class CircuitBreaker:
+    """連続した失敗が failure_threshold 回に達したら open にし、reset_timeout_seconds の間は呼び出しを拒否する。
+
+    経過後は half-open にして 1 つの trial だけを通し、成功すれば closed に戻し、失敗すれば再び open にする。
+    trial は try_acquire に渡す key で識別し、同じ key の呼び出し (1 回の検索が並行に投げる Query など) は
+    すべて通す。他の key の呼び出しは拒否する。イベントループ上から使う前提でロックは持たない。
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_timeout_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+        on_state_change: Callable[[CircuitState], None] | None = None,
+    ) -> None:
+        self._failure_threshold = failure_threshold
+        self._reset_timeout_seconds = reset_timeout_seconds
+        self._clock = clock
+        self._on_state_change = on_state_change
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial: object | None = None
+
+    @property
+    def state(self) -> CircuitState:
+        return self._state
+
+    def retry_after(self) -> float:
+        """open の間、次に試せるようになるまでの秒数。"""
+        if self._state is not CircuitState.OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self._reset_timeout_seconds - self._clock())
+
+    def try_acquire(self, key: object | None = None) -> bool:
+        """呼び出してよければ True。True を返したら record_success / record_failure / release のいずれかを呼ぶ。
+
+        key を省略すると呼び出しごとに別の trial として扱う。
+        """
+        if self._state is CircuitState.CLOSED:
+            return True
+        if self._state is CircuitState.OPEN:
+            if self.retry_after() > 0:
+                return False
+            self._transition(CircuitState.HALF_OPEN)
+        if self._trial is None:
+            self._trial = key if key is not None else object()
+            return True
+        return key is not None and key is self._trial
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._trial = None
+        if self._state is not CircuitState.CLOSED:
+            self._transition(CircuitState.CLOSED)
+
+    def record_failure(self) -> None:
+        if self._state is CircuitState.OPEN:
+            # open になる前に始まった呼び出しの失敗で、復旧を試すまでの時間を延ばさない
+            return
+        self._trial = None
+        self._failures += 1
+        if self._state is CircuitState.HALF_OPEN or self._failures >= self._failure_threshold:
+            self._opened_at = self._clock()
+            self._transition(CircuitState.OPEN)
+
+    def release(self, key: object | None = None) -> None:
+        """成否を判断できないまま終わった trial (キャンセルなど) の枠を返す。"""
+        if self._state is CircuitState.HALF_OPEN and (key is None or key is self._trial):
+            self._trial = None
+
+    def _transition(self, state: CircuitState) -> None:
+        if state is self._state:
+            return
+        self._state = state
+        if self._on_state_change is not None:
+            self._on_state_change(state)
@@ -1,13 +1,66 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings
 
 
 class Settings(BaseSettings):
+    user_repository_backend: Literal["dynamodb", "memory"] = "dynamodb"
+    # true なら DynamoDB の起動処理を待たずにリクエストを受け付け、完了するまで /ready は 503 を返す
+    fast_start_enabled: bool = False
+    # 起動処理 (DynamoDB の client 生成とテーブル確認) は失敗すると指数バックオフで再試行する。
+    # 試行回数を使い切ったら /ready に加えて /health も 503 を返し、オーケストレーターに再起動させる
+    bootstrap_max_attempts: int = 10
+    bootstrap_retry_base_delay_seconds: float = 0.5
+    bootstrap_retry_max_delay_seconds: float = 10.0
+
     dynamodb_endpoint: str = "http://localhost:8000"
     dynamodb_region: str = "us-east-1"
     dynamodb_table_name: str = "users"
+    dynamodb_scan_segments: int = 1
+    dynamodb_scan_max_workers: int = 8
+    # 接続プールはサーバーの同時リクエスト数に合わせる。超えた分は空き接続を待つ
+    dynamodb_max_pool_connections: int = 64
+    dynamodb_connect_timeout_seconds: float = 2.0
+    dynamodb_read_timeout_seconds: float = 10.0
+    # DynamoDB の再試行は botocore だけが行い、リポジトリ側では重ねない (重ねると 1 回の呼び出しが
+    # 試行回数の積だけ DynamoDB に届き、スロットリング中のテーブルにさらに負荷をかけるため)。
+    # adaptive は standard と同じ jitter 付きの指数バックオフに加え、スロットリングを受けると送信レートを絞る
+    dynamodb_retry_mode: Literal["legacy", "standard", "adaptive"] = "adaptive"
+    dynamodb_max_attempts: int = 3
+    dynamodb_keepalive_timeout_seconds: float = 30.0
+    # 操作ごとのサーキットブレーカー。連続した失敗がこの回数に達したら、reset 秒の間は 503 で即座に返す
+    dynamodb_circuit_failure_threshold: int = 5
+    dynamodb_circuit_reset_seconds: float = 10.0
+
+    request_coalescing_enabled: bool = False
+    search_strategy: Literal["filter", "intersect"] = "filter"
+
+    user_cache_enabled: bool = False
+    user_cache_max_size: int = 10_000
+    user_cache_ttl_seconds: float = 60.0
+
+    # 一覧・検索の結果を UserService でキャッシュする。このプロセスでの書き込みで即座に無効になる
+    query_cache_enabled: bool = False
+    query_cache_max_entries: int = 1_000
+    # 保持する User の件数の合計の上限。ページの大きさはまちまちなので、件数とは別にメモリ使用量を抑える
+    query_cache_max_users: int = 100_000
+    query_cache_ttl_seconds: float = 30.0
+
+    # 取得・一覧・検索のレスポンスに付ける Cache-Control。空文字なら付けない。
+    # 既定の no-cache は保存を許しつつ毎回 ETag での再検証を求める
+    http_cache_control: str = "no-cache"
+    # Accept-Encoding で圧縮を受け付けるクライアントには、この大きさ (バイト) 以上のレスポンスを圧縮して返す
+    compression_enabled: bool = True
+    compression_minimum_size: int = 1024
+    compression_gzip_level: int = 6
 
     log_level: str = "INFO"
     log_json_format: bool = False
+    log_action_sample_rate: float = 1.0
+    log_async_enabled: bool = False
+    log_queue_max_size: int = 10_000
+    log_queue_overflow: Literal["block", "drop"] = "block"
+    log_batch_size: int = 256
 
 
 settings = Settings()
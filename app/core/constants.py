@@ -1,10 +1,37 @@
 # HTTP Headers
 HEADER_REQUEST_ID = "X-Request-ID"
 HEADER_TRACE_ID = "X-Trace-ID"
+HEADER_ETAG = "ETag"
+HEADER_IF_NONE_MATCH = "If-None-Match"
+HEADER_CACHE_CONTROL = "Cache-Control"
+HEADER_ACCEPT_ENCODING = "Accept-Encoding"
+HEADER_CONTENT_ENCODING = "Content-Encoding"
+HEADER_CONTENT_LENGTH = "Content-Length"
+HEADER_CONTENT_TYPE = "Content-Type"
+HEADER_RETRY_AFTER = "Retry-After"
+
+# Media types
+MEDIA_TYPE_JSON = "application/json"
+MEDIA_TYPE_NDJSON = "application/x-ndjson"
+MEDIA_TYPE_PROMETHEUS = "text/plain; version=0.0.4; charset=utf-8"
+
+# Compression
+# 圧縮する Content-Type (パラメータを除いた部分の前方一致)。画像など圧縮済みの形式は対象外
+COMPRESSIBLE_MEDIA_TYPES = ("application/json", "application/x-ndjson", "text/")
+# 圧縮方式はこの順に優先する (同じ q 値のとき)。br / zstd は実行環境で使える場合だけ有効になる
+ENCODING_BROTLI = "br"
+ENCODING_ZSTD = "zstd"
+ENCODING_GZIP = "gzip"
+# br / zstd の圧縮レベル。どちらも速度寄りの既定値で、gzip の既定 (6) と同程度の CPU コストに収まる
+BROTLI_QUALITY = 4
+ZSTD_LEVEL = 3
 
 # Error response messages
 ERROR_USER_NOT_FOUND = "User not found"
 ERROR_INTERNAL_SERVER = "Internal server error"
+ERROR_INVALID_CURSOR = "Invalid cursor"
+ERROR_INVALID_FIELDS = "Invalid fields"
+ERROR_SERVICE_UNAVAILABLE = "Service temporarily unavailable"
 
 # Log event names
 LOG_ACTION_START = "action.start"
@@ -12,9 +39,64 @@ LOG_ACTION_SUCCESS = "action.success"
 LOG_ACTION_ERROR = "action.error"
 LOG_USER_NOT_FOUND = "user_not_found"
 LOG_REPOSITORY_ERROR = "repository_error"
+LOG_REPOSITORY_UNAVAILABLE = "repository_unavailable"
+LOG_PARTIAL_WRITE = "partial_write"
 LOG_APP_ERROR = "app_error"
+LOG_INVALID_CURSOR = "invalid_cursor"
+LOG_INVALID_FIELDS = "invalid_fields"
 LOG_REQUEST_COMPLETED = "request completed"
+LOG_BOOTSTRAP_COMPLETED = "bootstrap_completed"
+LOG_BOOTSTRAP_FAILED = "bootstrap_failed"
+LOG_BOOTSTRAP_RETRY = "bootstrap_retry"
 
 # Decorator internals
 REDACTED = "[REDACTED]"
 NS_PER_MS = 1_000_000
+
+# Pagination
+DEFAULT_PAGE_LIMIT = 100
+MAX_PAGE_LIMIT = 1000
+# エクスポートで 1 つのボディチャンクにまとめる行数。圧縮はチャンクごとに同期フラッシュするので、
+# 1 行ずつ送ると gzip の出力が 1.6 倍ほどに膨らむ
+EXPORT_CHUNK_USERS = 100
+
+# Batch requests
+MAX_BATCH_GET_IDS = 1000
+MAX_BULK_CREATE_USERS = 1000
+
+# Metrics
+METRIC_HTTP_REQUESTS_TOTAL = "http_requests_total"
+METRIC_HTTP_REQUEST_DURATION = "http_request_duration_seconds"
+METRIC_REPOSITORY_OPERATION_DURATION = "repository_operation_duration_seconds"
+METRIC_REPOSITORY_ERRORS_TOTAL = "repository_errors_total"
+METRIC_DYNAMODB_POOL_MAX_CONNECTIONS = "dynamodb_pool_max_connections"
+METRIC_DYNAMODB_POOL_IN_FLIGHT = "dynamodb_pool_in_flight"
+METRIC_DYNAMODB_POOL_PEAK_IN_FLIGHT = "dynamodb_pool_peak_in_flight"
+METRIC_DYNAMODB_POOL_SATURATED_TOTAL = "dynamodb_pool_saturated_total"
+METRIC_DYNAMODB_RETRIES_TOTAL = "dynamodb_retries_total"
+METRIC_DYNAMODB_CIRCUIT_STATE = "dynamodb_circuit_state"
+METRIC_DYNAMODB_CIRCUIT_REJECTIONS_TOTAL = "dynamodb_circuit_rejections_total"
+METRIC_USER_CACHE_SIZE = "user_cache_size"
+METRIC_USER_CACHE_HITS_TOTAL = "user_cache_hits_total"
+METRIC_USER_CACHE_MISSES_TOTAL = "user_cache_misses_total"
+METRIC_USER_CACHE_EVICTIONS_TOTAL = "user_cache_evictions_total"
+METRIC_USER_CACHE_EXPIRATIONS_TOTAL = "user_cache_expirations_total"
+METRIC_COALESCING_CALLS_TOTAL = "request_coalescing_calls_total"
+METRIC_COALESCING_EXECUTIONS_TOTAL = "request_coalescing_executions_total"
+METRIC_COALESCING_COLLAPSED_TOTAL = "request_coalescing_collapsed_total"
+METRIC_COALESCING_IN_FLIGHT = "request_coalescing_in_flight"
+METRIC_QUERY_CACHE_LOOKUPS_TOTAL = "query_cache_lookups_total"
+METRIC_QUERY_CACHE_INVALIDATIONS_TOTAL = "query_cache_invalidations_total"
+METRIC_ROUTE_UNMATCHED = "<unmatched>"
+METRIC_OUTCOME_SUCCESS = "success"
+METRIC_OUTCOME_ERROR = "error"
+METRIC_CACHE_HIT = "hit"
+METRIC_CACHE_MISS = "miss"
+DEFAULT_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Search
+# インデックスのある属性を絞り込みが強い順に並べる。email はほぼ一意なので、指定されていれば email-index を先に引く
+SEARCH_INDEX_PRIORITY = ("email", "name")
+LOG_SEARCH_PLAN = "search_plan"
+DEFAULT_NAME_PREFIX_LIMIT = 20
+MAX_NAME_PREFIX_LIMIT = 100
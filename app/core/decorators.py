@@ -1,12 +1,16 @@
 import functools
 import inspect
+import logging
+import random
 import time
-from collections.abc import Callable
+from collections.abc import AsyncIterator, Callable, Iterator
 from typing import Any
 
 import structlog
 from pydantic import BaseModel
+from structlog.typing import FilteringBoundLogger
 
+from app.core.config import settings
 from app.core.constants import (
     LOG_ACTION_ERROR,
     LOG_ACTION_START,
@@ -16,24 +20,53 @@ from app.core.constants import (
 )
 
 
-def _build_safe_args(
-    sig: inspect.Signature,
-    args: tuple[Any, ...],
-    kwargs: dict[str, Any],
-    exclude_args: frozenset[str],
-) -> dict[str, Any]:
-    bound = sig.bind(*args, **kwargs)
-    bound.apply_defaults()
+class _ArgPlan:
+    """デコレート時に signature から一度だけ作る、ログ用引数の組み立て計画。
+
+    呼び出しごとの sig.bind() / apply_defaults() を避け、位置引数名との zip と
+    デフォルト値の補完だけで bound.arguments 相当の dict を作る。
+    """
+
+    __slots__ = ("defaults", "exclude_args", "keyword_names", "positional_names", "var_keyword", "var_positional")
+
+    def __init__(self, sig: inspect.Signature, exclude_args: frozenset[str]) -> None:
+        params = list(sig.parameters.values())
+        self.positional_names = tuple(p.name for p in params if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD))
+        self.keyword_names = frozenset(p.name for p in params if p.kind in (p.POSITIONAL_OR_KEYWORD, p.KEYWORD_ONLY))
+        self.var_positional = next((p.name for p in params if p.kind is p.VAR_POSITIONAL), None)
+        self.var_keyword = next((p.name for p in params if p.kind is p.VAR_KEYWORD), None)
+        self.defaults = tuple((p.name, p.default) for p in params if p.default is not p.empty)
+        self.exclude_args = exclude_args
+
+
+def _safe_value(name: str, value: Any, exclude_args: frozenset[str]) -> Any:
+    if name in exclude_args:
+        return REDACTED
+    if isinstance(value, BaseModel):
+        return f"<{type(value).__name__}>"
+    return value
+
+
+def _build_safe_args(plan: _ArgPlan, args: tuple[Any, ...], kwargs: dict[str, Any]) -> dict[str, Any]:
+    exclude_args = plan.exclude_args
     safe: dict[str, Any] = {}
-    for name, value in bound.arguments.items():
-        if name == "self":
-            continue
-        if name in exclude_args:
-            safe[name] = REDACTED
-        elif isinstance(value, BaseModel):
-            safe[name] = f"<{type(value).__name__}>"
+    for name, value in zip(plan.positional_names, args, strict=False):
+        if name != "self":
+            safe[name] = _safe_value(name, value, exclude_args)
+    if plan.var_positional is not None:
+        name = plan.var_positional
+        safe[name] = _safe_value(name, args[len(plan.positional_names) :], exclude_args)
+    extra_kwargs: dict[str, Any] = {}
+    for name, value in kwargs.items():
+        if name in plan.keyword_names:
+            safe[name] = _safe_value(name, value, exclude_args)
         else:
-            safe[name] = value
+            extra_kwargs[name] = value
+    if plan.var_keyword is not None:
+        safe[plan.var_keyword] = _safe_value(plan.var_keyword, extra_kwargs, exclude_args)
+    for name, default in plan.defaults:
+        if name not in safe:
+            safe[name] = _safe_value(name, default, exclude_args)
     return safe
 
 
@@ -45,38 +78,113 @@ def _summarize_result(result: Any) -> dict[str, Any]:
     return {"result_type": type(result).__name__}
 
 
+def _elapsed_ms(start: int) -> float:
+    return round((time.perf_counter_ns() - start) / NS_PER_MS, 2)
+
+
 def log_action(
     *,
     action_name: str | None = None,
     exclude_args: frozenset[str] = frozenset(),
+    sample_rate: float | None = None,
 ) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """開始・成功・エラーを構造化ログに記録するデコレータ。
+
+    通常の関数・コルーチン関数・(async) ジェネレータ関数のいずれにも付けられる。
+    ジェネレータは呼び出し時点ではなく反復開始時に start を、使い切った時点で success を記録する。
+
+    INFO が無効なロガーでは引数の組み立てを含めて start / success を丸ごと省く。
+    sample_rate (省略時は settings.log_action_sample_rate) の割合の呼び出しだけ start / success を記録し、
+    error はサンプリングに関係なく常に記録する。
+    """
+    _sample_rate = settings.log_action_sample_rate if sample_rate is None else sample_rate
+
     def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
         _action = action_name or getattr(func, "__qualname__", str(func))
-        _logger = structlog.stdlib.get_logger(func.__module__)
-        _sig = inspect.signature(func)
+        _logger: FilteringBoundLogger = structlog.get_logger(func.__module__)
+        _plan = _ArgPlan(inspect.signature(func), exclude_args)
+
+        def log_start(args: tuple[Any, ...], kwargs: dict[str, Any]) -> bool:
+            """start を記録したら True を返す。False の呼び出しは success も記録しない。"""
+            if not _logger.is_enabled_for(logging.INFO):
+                return False
+            if _sample_rate < 1.0 and random.random() >= _sample_rate:
+                return False
+            _logger.info(LOG_ACTION_START, action=_action, **_build_safe_args(_plan, args, kwargs))
+            return True
+
+        def log_error(start: int, **extra: Any) -> None:
+            _logger.exception(LOG_ACTION_ERROR, action=_action, duration_ms=_elapsed_ms(start), **extra)
+
+        def log_success(start: int, **extra: Any) -> None:
+            _logger.info(LOG_ACTION_SUCCESS, action=_action, duration_ms=_elapsed_ms(start), **extra)
+
+        if inspect.isasyncgenfunction(func):
+
+            @functools.wraps(func)
+            async def async_generator_wrapper(*args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+                sampled = log_start(args, kwargs)
+                start = time.perf_counter_ns()
+                count = 0
+                try:
+                    async for item in func(*args, **kwargs):
+                        count += 1
+                        yield item
+                except Exception:
+                    log_error(start, result_count=count)
+                    raise
+                if sampled:
+                    log_success(start, result_count=count)
+
+            return async_generator_wrapper
+
+        if inspect.isgeneratorfunction(func):
+
+            @functools.wraps(func)
+            def generator_wrapper(*args: Any, **kwargs: Any) -> Iterator[Any]:
+                sampled = log_start(args, kwargs)
+                start = time.perf_counter_ns()
+                count = 0
+                try:
+                    for item in func(*args, **kwargs):
+                        count += 1
+                        yield item
+                except Exception:
+                    log_error(start, result_count=count)
+                    raise
+                if sampled:
+                    log_success(start, result_count=count)
+
+            return generator_wrapper
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                sampled = log_start(args, kwargs)
+                start = time.perf_counter_ns()
+                try:
+                    result = await func(*args, **kwargs)
+                except Exception:
+                    log_error(start)
+                    raise
+                if sampled:
+                    log_success(start, **_summarize_result(result))
+                return result
+
+            return async_wrapper
 
         @functools.wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
-            bound_args = _build_safe_args(_sig, args, kwargs, exclude_args)
-            _logger.info(LOG_ACTION_START, action=_action, **bound_args)
+            sampled = log_start(args, kwargs)
             start = time.perf_counter_ns()
             try:
                 result = func(*args, **kwargs)
             except Exception:
-                duration_ms = (time.perf_counter_ns() - start) / NS_PER_MS
-                _logger.exception(
-                    LOG_ACTION_ERROR,
-                    action=_action,
-                    duration_ms=round(duration_ms, 2),
-                )
+                log_error(start)
                 raise
-            duration_ms = (time.perf_counter_ns() - start) / NS_PER_MS
-            _logger.info(
-                LOG_ACTION_SUCCESS,
-                action=_action,
-                duration_ms=round(duration_ms, 2),
-                **_summarize_result(result),
-            )
+            if sampled:
+                log_success(start, **_summarize_result(result))
             return result
 
         return wrapper
@@ -0,0 +1,23 @@
+import hashlib
+
+_ETAG_DIGEST_SIZE = 16
+
+
+def compute_etag(body: bytes) -> str:
+    """レスポンスボディから強い ETag を作る。
+
+    body が 1 バイトでも違えば値が変わるので、fields の指定ごとに別の ETag になる。
+    """
+    return '"' + hashlib.blake2b(body, digest_size=_ETAG_DIGEST_SIZE).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match のいずれかが etag に一致するか。
+
+    If-None-Match は弱い比較 (W/ の有無を無視) で判定する (RFC 9110 13.1.2)。
+    """
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
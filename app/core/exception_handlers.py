@@ -1,3 +1,5 @@
+import math
+
 import structlog
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
@@ -5,12 +7,27 @@ from starlette import status
 
 from app.core.constants import (
     ERROR_INTERNAL_SERVER,
+    ERROR_INVALID_CURSOR,
+    ERROR_SERVICE_UNAVAILABLE,
     ERROR_USER_NOT_FOUND,
+    HEADER_RETRY_AFTER,
     LOG_APP_ERROR,
+    LOG_INVALID_CURSOR,
+    LOG_INVALID_FIELDS,
+    LOG_PARTIAL_WRITE,
     LOG_REPOSITORY_ERROR,
+    LOG_REPOSITORY_UNAVAILABLE,
     LOG_USER_NOT_FOUND,
 )
-from app.core.exceptions import AppError, RepositoryError, UserNotFoundError
+from app.core.exceptions import (
+    AppError,
+    InvalidCursorError,
+    InvalidFieldsError,
+    PartialWriteError,
+    RepositoryError,
+    RepositoryUnavailableError,
+    UserNotFoundError,
+)
 
 logger = structlog.stdlib.get_logger(__name__)
 
@@ -28,6 +45,30 @@ def register_exception_handlers(app: FastAPI) -> None:
             content={"detail": ERROR_USER_NOT_FOUND},
         )
 
+    @app.exception_handler(InvalidCursorError)
+    async def handle_invalid_cursor(request: Request, exc: InvalidCursorError) -> JSONResponse:
+        logger.warning(
+            LOG_INVALID_CURSOR,
+            cursor=exc.cursor,
+            path=request.url.path,
+        )
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"detail": ERROR_INVALID_CURSOR},
+        )
+
+    @app.exception_handler(InvalidFieldsError)
+    async def handle_invalid_fields(request: Request, exc: InvalidFieldsError) -> JSONResponse:
+        logger.warning(
+            LOG_INVALID_FIELDS,
+            unknown_fields=exc.unknown_fields,
+            path=request.url.path,
+        )
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"detail": exc.message},
+        )
+
     @app.exception_handler(RepositoryError)
     async def handle_repository_error(request: Request, exc: RepositoryError) -> JSONResponse:
         logger.error(
@@ -41,6 +82,36 @@ def register_exception_handlers(app: FastAPI) -> None:
             content={"detail": ERROR_INTERNAL_SERVER},
         )
 
+    @app.exception_handler(RepositoryUnavailableError)
+    async def handle_repository_unavailable(request: Request, exc: RepositoryUnavailableError) -> JSONResponse:
+        logger.warning(
+            LOG_REPOSITORY_UNAVAILABLE,
+            operation=exc.operation,
+            message=exc.message,
+            retry_after=exc.retry_after,
+            path=request.url.path,
+        )
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"detail": ERROR_SERVICE_UNAVAILABLE},
+            headers={HEADER_RETRY_AFTER: str(max(1, math.ceil(exc.retry_after)))},
+        )
+
+    @app.exception_handler(PartialWriteError)
+    async def handle_partial_write(request: Request, exc: PartialWriteError) -> JSONResponse:
+        logger.error(
+            LOG_PARTIAL_WRITE,
+            operation=exc.operation,
+            message=exc.message,
+            written_count=len(exc.written_ids),
+            path=request.url.path,
+        )
+        # 作成済みの ID を返し、クライアントが残りだけを送り直せるようにする
+        return JSONResponse(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            content={"detail": ERROR_INTERNAL_SERVER, "written_user_ids": exc.written_ids},
+        )
+
     @app.exception_handler(AppError)
     async def handle_app_error(request: Request, exc: AppError) -> JSONResponse:
         logger.error(
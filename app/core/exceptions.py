@@ -1,4 +1,4 @@
-from app.core.constants import ERROR_USER_NOT_FOUND
+from app.core.constants import ERROR_INVALID_CURSOR, ERROR_INVALID_FIELDS, ERROR_USER_NOT_FOUND
 from app.core.types import UserId
 
 
@@ -18,3 +18,34 @@ class RepositoryError(AppError):
     def __init__(self, message: str, operation: str) -> None:
         self.operation = operation
         super().__init__(message)
+
+
+class RepositoryUnavailableError(RepositoryError):
+    """永続化層が過負荷・不調のため、retry_after 秒待ってから再試行してほしいことを表す。"""
+
+    def __init__(self, message: str, operation: str, retry_after: float) -> None:
+        self.retry_after = retry_after
+        super().__init__(message=message, operation=operation)
+
+
+class PartialWriteError(RepositoryError):
+    """一括書き込みが途中で失敗したことを表す。written_ids は書き込みが確定した ID。
+
+    失敗した時点で実行中だった書き込みは、反映されたかどうか分からないので written_ids に含めない。
+    """
+
+    def __init__(self, message: str, operation: str, written_ids: list[UserId]) -> None:
+        self.written_ids = written_ids
+        super().__init__(message=message, operation=operation)
+
+
+class InvalidCursorError(AppError):
+    def __init__(self, cursor: str) -> None:
+        self.cursor = cursor
+        super().__init__(f"{ERROR_INVALID_CURSOR}: {cursor}")
+
+
+class InvalidFieldsError(AppError):
+    def __init__(self, unknown_fields: list[str]) -> None:
+        self.unknown_fields = unknown_fields
+        super().__init__(f"{ERROR_INVALID_FIELDS}: {', '.join(unknown_fields)}")
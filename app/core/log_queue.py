@@ -0,0 +1,176 @@
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+from dataclasses import dataclass
+from typing import Literal, TextIO
+
+import structlog
+
+type OverflowPolicy = Literal["block", "drop"]
+
+_STOP = object()
+
+
+@dataclass(frozen=True)
+class LogQueueStats:
+    queued: int
+    written: int
+    batches: int
+    dropped: int
+
+
+class _EnqueueOnlyHandler(logging.handlers.QueueHandler):
+    """レコードを整形せずにキューへ積むだけのハンドラ。
+
+    標準の QueueHandler.prepare() は呼び出し元のスレッドで format() してしまうため、
+    レンダリングをワーカースレッドに回せるよう最小限の処理に差し替える。
+    """
+
+    def __init__(self, pipeline: "QueueLogPipeline") -> None:
+        super().__init__(pipeline._queue)
+        self._pipeline = pipeline
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # structlog 由来のレコードは msg が event dict で、contextvars も呼び出し元で取り込み済み。
+        # それ以外 (uvicorn 等) は args が後から変更されても影響しないよう、ここでメッセージを確定させておく
+        if not isinstance(record.msg, dict):
+            if record.args:
+                record.msg = record.getMessage()
+                record.args = None
+            # ワーカースレッドの merge_contextvars では trace_id などが取れないので、呼び出し元のスレッドで
+            # レコードの属性として写しておく。ExtraAdder が event dict に入れる
+            for key, value in structlog.contextvars.get_contextvars().items():
+                record.__dict__.setdefault(key, value)
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        self._pipeline._put(record)
+
+
+class QueueLogPipeline:
+    """ログレコードを有界キューに積み、バックグラウンドスレッドでまとめて整形・書き出す。
+
+    リクエスト処理側のコストはキューへの put だけになる。キューが満杯のときは
+    overflow="block" なら空くまで待ち、"drop" なら破棄して dropped を加算する。
+    """
+
+    def __init__(
+        self,
+        formatter: logging.Formatter,
+        stream: TextIO | None = None,
+        max_size: int = 10_000,
+        batch_size: int = 256,
+        overflow: OverflowPolicy = "block",
+    ) -> None:
+        self._formatter = formatter
+        self._stream = stream if stream is not None else sys.stderr
+        self._queue: queue.Queue[logging.LogRecord | object] = queue.Queue(maxsize=max_size)
+        self._batch_size = batch_size
+        self._overflow = overflow
+        self._written = 0
+        self._batches = 0
+        self._dropped = 0
+        self._drop_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._stopped = False
+        self._write_lock = threading.Lock()
+        self.handler: logging.Handler = _EnqueueOnlyHandler(self)
+
+    @property
+    def formatter(self) -> logging.Formatter:
+        return self._formatter
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        """キューに残っているレコードを書き切ってからワーカーを止める。
+
+        止めた後に届いたレコードは、誰も取り出さないキューに積まずに呼び出し元のスレッドで書き出す。
+        """
+        if self._thread is None:
+            return
+        self._stopped = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+        # _stopped を見る前に積まれ、_STOP の後ろに残ったレコードを書き切る
+        self._write(self._drain())
+
+    @property
+    def stats(self) -> LogQueueStats:
+        return LogQueueStats(
+            queued=self._queue.qsize(),
+            written=self._written,
+            batches=self._batches,
+            dropped=self._dropped,
+        )
+
+    def _put(self, record: logging.LogRecord) -> None:
+        if self._stopped:
+            self._write([record])
+            return
+        if self._overflow == "block":
+            self._queue.put(record)
+            return
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            with self._drop_lock:
+                self._dropped += 1
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            while len(batch) < self._batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            records: list[logging.LogRecord] = []
+            for item in batch:
+                if item is _STOP:
+                    stopping = True
+                else:
+                    records.append(item)  # ty: ignore[invalid-argument-type]
+            if records:
+                self._write(records)
+
+    def _drain(self) -> list[logging.LogRecord]:
+        records: list[logging.LogRecord] = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return records
+            if item is not _STOP:
+                records.append(item)  # ty: ignore[invalid-argument-type]
+
+    def _write(self, records: list[logging.LogRecord]) -> None:
+        # 停止後は呼び出し元の各スレッドから書くので、ワーカーと同じくバッチ単位で直列化する
+        with self._write_lock:
+            self._write_locked(records)
+
+    def _write_locked(self, records: list[logging.LogRecord]) -> None:
+        lines: list[str] = []
+        for record in records:
+            try:
+                lines.append(self._formatter.format(record))
+            except Exception:
+                self.handler.handleError(record)
+        if not lines:
+            return
+        try:
+            self._stream.write("\n".join(lines) + "\n")
+            self._stream.flush()
+        except Exception:
+            self.handler.handleError(records[-1])
+            return
+        self._written += len(lines)
+        self._batches += 1
@@ -1,9 +1,14 @@
 import logging
+from typing import Any
 
+import orjson
 import structlog
 from structlog.types import EventDict, Processor
 
 from app.core.config import settings
+from app.core.log_queue import OverflowPolicy, QueueLogPipeline
+
+_pipeline: QueueLogPipeline | None = None
 
 
 def drop_color_message_key(_: object, __: str, event_dict: EventDict) -> EventDict:
@@ -12,10 +17,22 @@ def drop_color_message_key(_: object, __: str, event_dict: EventDict) -> EventDi
     return event_dict
 
 
+def _orjson_dumps(obj: Any, default: Any = None, **_: Any) -> str:
+    """JSONRenderer 用の orjson シリアライザ。ProcessorFormatter は str を返す必要があるので decode する。"""
+    return orjson.dumps(obj, default=default).decode()
+
+
 def setup_logging(
     json_logs: bool = settings.log_json_format,
     log_level: str = settings.log_level,
+    async_logs: bool = settings.log_async_enabled,
+    queue_max_size: int = settings.log_queue_max_size,
+    queue_overflow: OverflowPolicy = settings.log_queue_overflow,
+    batch_size: int = settings.log_batch_size,
 ) -> None:
+    global _pipeline
+    shutdown_logging()
+
     timestamper = structlog.processors.TimeStamper(fmt="iso")
 
     shared_processors: list[Processor] = [
@@ -38,12 +55,14 @@ def setup_logging(
             structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
         ],
         logger_factory=structlog.stdlib.LoggerFactory(),
+        # 無効なレベルのメソッドを何もしない関数に差し替え、processor チェーンを通す前に捨てる
+        wrapper_class=structlog.make_filtering_bound_logger(logging.getLevelNamesMapping()[log_level.upper()]),
         cache_logger_on_first_use=True,
     )
 
     log_renderer: structlog.types.Processor
     if json_logs:
-        log_renderer = structlog.processors.JSONRenderer()
+        log_renderer = structlog.processors.JSONRenderer(serializer=_orjson_dumps)
     else:
         log_renderer = structlog.dev.ConsoleRenderer()
 
@@ -55,8 +74,19 @@ def setup_logging(
         ],
     )
 
-    handler = logging.StreamHandler()
-    handler.setFormatter(formatter)
+    handler: logging.Handler
+    if async_logs:
+        _pipeline = QueueLogPipeline(
+            formatter,
+            max_size=queue_max_size,
+            batch_size=batch_size,
+            overflow=queue_overflow,
+        )
+        _pipeline.start()
+        handler = _pipeline.handler
+    else:
+        handler = logging.StreamHandler()
+        handler.setFormatter(formatter)
     root_logger = logging.getLogger()
     root_logger.handlers.clear()
     root_logger.addHandler(handler)
@@ -68,3 +98,25 @@ def setup_logging(
 
     logging.getLogger("uvicorn.access").handlers.clear()
     logging.getLogger("uvicorn.access").propagate = False
+
+
+def shutdown_logging() -> None:
+    """非同期ログを有効にしている場合、キューに残ったログを書き切ってからワーカーを止める。
+
+    ルートロガーのハンドラは先に同じ formatter の StreamHandler に戻す。停止後のログ
+    (uvicorn の "Application shutdown complete." など) も同期で書き出される。
+    """
+    global _pipeline
+    if _pipeline is None:
+        return
+    handler = logging.StreamHandler()
+    handler.setFormatter(_pipeline.formatter)
+    root_logger = logging.getLogger()
+    root_logger.removeHandler(_pipeline.handler)
+    root_logger.addHandler(handler)
+    _pipeline.stop()
+    _pipeline = None
+
+
+def get_log_pipeline() -> QueueLogPipeline | None:
+    return _pipeline
@@ -0,0 +1,255 @@
+import bisect
+import math
+from collections.abc import Callable, Iterable
+from typing import Literal
+
+from app.core.constants import (
+    DEFAULT_LATENCY_BUCKETS,
+    METRIC_DYNAMODB_CIRCUIT_REJECTIONS_TOTAL,
+    METRIC_DYNAMODB_CIRCUIT_STATE,
+    METRIC_DYNAMODB_RETRIES_TOTAL,
+    METRIC_HTTP_REQUEST_DURATION,
+    METRIC_HTTP_REQUESTS_TOTAL,
+    METRIC_QUERY_CACHE_INVALIDATIONS_TOTAL,
+    METRIC_QUERY_CACHE_LOOKUPS_TOTAL,
+    METRIC_REPOSITORY_ERRORS_TOTAL,
+    METRIC_REPOSITORY_OPERATION_DURATION,
+)
+
+type LabelValues = tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return "+Inf" if value == math.inf else repr(float(value))
+
+
+class Counter:
+    """ラベルの組み合わせごとに単調増加する値を持つ。"""
+
+    def __init__(self, name: str, documentation: str, label_names: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1.0) -> None:
+        self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def value(self, *label_values: str) -> float:
+        return self._values.get(label_values, 0.0)
+
+    def collect(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} counter"
+        for label_values, value in list(self._values.items()):
+            yield f"{self.name}{_format_labels(self.label_names, label_values)} {_format_value(value)}"
+
+
+class Gauge:
+    """ラベルの組み合わせごとに、最後に set された値を持つ。"""
+
+    def __init__(self, name: str, documentation: str, label_names: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self._values: dict[LabelValues, float] = {}
+
+    def set(self, value: float, *label_values: str) -> None:
+        self._values[label_values] = value
+
+    def value(self, *label_values: str) -> float:
+        return self._values.get(label_values, 0.0)
+
+    def collect(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} gauge"
+        for label_values, value in list(self._values.items()):
+            yield f"{self.name}{_format_labels(self.label_names, label_values)} {_format_value(value)}"
+
+
+class _HistogramSeries:
+    __slots__ = ("bucket_counts", "count", "sum")
+
+    def __init__(self, size: int) -> None:
+        self.bucket_counts = [0] * size
+        self.count = 0
+        self.sum = 0.0
+
+
+class Histogram:
+    """ラベルの組み合わせごとに、上限付きバケットの度数と合計・件数を持つ。
+
+    observe はバケット位置の二分探索と整数の加算だけで済ませ、累積値への変換は出力時に行う。
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self._upper_bounds = (*sorted(buckets), math.inf)
+        self._series: dict[LabelValues, _HistogramSeries] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        series = self._series.get(label_values)
+        if series is None:
+            series = self._series.setdefault(label_values, _HistogramSeries(len(self._upper_bounds)))
+        series.bucket_counts[bisect.bisect_left(self._upper_bounds, value)] += 1
+        series.count += 1
+        series.sum += value
+
+    def count(self, *label_values: str) -> int:
+        series = self._series.get(label_values)
+        return series.count if series is not None else 0
+
+    def collect(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        for label_values, series in list(self._series.items()):
+            cumulative = 0
+            for upper_bound, bucket_count in zip(self._upper_bounds, series.bucket_counts, strict=True):
+                cumulative += bucket_count
+                le = f'le="{_format_value(upper_bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.label_names, label_values, le)} {cumulative}"
+            labels = _format_labels(self.label_names, label_values)
+            yield f"{self.name}_sum{labels} {_format_value(series.sum)}"
+            yield f"{self.name}_count{labels} {series.count}"
+
+
+class CallbackMetric:
+    """出力時に function を呼んで値を読む。
+
+    値を持つ側 (stats など) が別にある場合に使い、記録側の処理を増やさない。
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        metric_type: Literal["counter", "gauge"],
+        function: Callable[[], float],
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.metric_type = metric_type
+        self._function = function
+
+    def value(self) -> float:
+        return self._function()
+
+    def collect(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.metric_type}"
+        yield f"{self.name} {_format_value(self._function())}"
+
+
+class MetricsRegistry:
+    """プロセス内のメトリクスを保持し、Prometheus のテキスト形式で出力する。
+
+    記録はイベントループ上からのみ行う前提で、dict と整数の更新だけで構成しロックは取らない。
+    """
+
+    def __init__(self) -> None:
+        self._metrics: list[Counter | Gauge | Histogram | CallbackMetric] = []
+
+    def counter(self, name: str, documentation: str, label_names: tuple[str, ...] = ()) -> Counter:
+        metric = Counter(name, documentation, label_names)
+        self._metrics.append(metric)
+        return metric
+
+    def gauge(self, name: str, documentation: str, label_names: tuple[str, ...] = ()) -> Gauge:
+        metric = Gauge(name, documentation, label_names)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        label_names: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        metric = Histogram(name, documentation, label_names, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def callback(
+        self,
+        name: str,
+        documentation: str,
+        metric_type: Literal["counter", "gauge"],
+        function: Callable[[], float],
+    ) -> CallbackMetric:
+        metric = CallbackMetric(name, documentation, metric_type, function)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+http_requests_total = registry.counter(
+    METRIC_HTTP_REQUESTS_TOTAL,
+    "Total HTTP requests.",
+    ("method", "route", "status"),
+)
+http_request_duration_seconds = registry.histogram(
+    METRIC_HTTP_REQUEST_DURATION,
+    "HTTP request latency in seconds.",
+    ("method", "route", "status"),
+)
+repository_operation_duration_seconds = registry.histogram(
+    METRIC_REPOSITORY_OPERATION_DURATION,
+    "Repository operation latency in seconds.",
+    ("operation", "outcome"),
+)
+repository_errors_total = registry.counter(
+    METRIC_REPOSITORY_ERRORS_TOTAL,
+    "Total RepositoryError raised, by operation.",
+    ("operation",),
+)
+dynamodb_retries_total = registry.counter(
+    METRIC_DYNAMODB_RETRIES_TOTAL,
+    "Total retries botocore made for DynamoDB calls, by operation.",
+    ("operation",),
+)
+dynamodb_circuit_state = registry.gauge(
+    METRIC_DYNAMODB_CIRCUIT_STATE,
+    "DynamoDB circuit breaker state by operation (0=closed, 1=half_open, 2=open).",
+    ("operation",),
+)
+dynamodb_circuit_rejections_total = registry.counter(
+    METRIC_DYNAMODB_CIRCUIT_REJECTIONS_TOTAL,
+    "Total DynamoDB calls rejected by an open circuit breaker, by operation.",
+    ("operation",),
+)
+query_cache_lookups_total = registry.counter(
+    METRIC_QUERY_CACHE_LOOKUPS_TOTAL,
+    "Total list/search query cache lookups, by query and result (hit or miss).",
+    ("query", "result"),
+)
+query_cache_invalidations_total = registry.counter(
+    METRIC_QUERY_CACHE_INVALIDATIONS_TOTAL,
+    "Total query cache generation bumps caused by writes.",
+)
@@ -0,0 +1,54 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class SingleFlightStats:
+    calls: int
+    executions: int
+    collapsed: int
+    in_flight: int
+
+
+class SingleFlight[K: Hashable, V]:
+    """同じキーの呼び出しが実行中なら、新たに実行せずその結果 (または例外) を共有する。
+
+    実行は呼び出し元とは独立したタスクで行い asyncio.shield 越しに待つため、
+    先頭の呼び出し元がキャンセルされても後続の待ち手には結果が届く。
+    """
+
+    def __init__(self) -> None:
+        self._in_flight: dict[K, asyncio.Task[V]] = {}
+        self._calls = 0
+        self._executions = 0
+        self._collapsed = 0
+
+    async def do(self, key: K, fn: Callable[[], Awaitable[V]]) -> V:
+        self._calls += 1
+        task = self._in_flight.get(key)
+        if task is not None:
+            self._collapsed += 1
+            return await asyncio.shield(task)
+
+        async def run() -> V:
+            return await fn()
+
+        task = asyncio.get_running_loop().create_task(run())
+        self._in_flight[key] = task
+        self._executions += 1
+        task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: K, task: asyncio.Task[V]) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+
+    @property
+    def stats(self) -> SingleFlightStats:
+        return SingleFlightStats(
+            calls=self._calls,
+            executions=self._executions,
+            collapsed=self._collapsed,
+            in_flight=len(self._in_flight),
+        )
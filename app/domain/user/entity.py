@@ -1,7 +1,8 @@
 import uuid
 from datetime import UTC, datetime
+from typing import Any
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, TypeAdapter
 
 from app.core.types import UserId
 
@@ -30,3 +31,43 @@ class User(BaseModel):
             address=address,
             created_at=datetime.now(UTC).isoformat(),
         )
+
+    @classmethod
+    def from_projection(cls, data: dict[str, Any]) -> "User":
+        """一部の属性だけを読んだ結果から組み立てる。読んだ属性だけを検証し、読んでいない属性は参照できない。"""
+        return cls.model_construct(
+            **{
+                name: _FIELD_ADAPTERS[name].validate_python(value)
+                for name, value in data.items()
+                if name in _FIELD_ADAPTERS
+            }
+        )
+
+
+_FIELD_ADAPTERS: dict[str, TypeAdapter[Any]] = {
+    name: TypeAdapter(field.annotation) for name, field in User.model_fields.items()
+}
+
+
+class UserPage(BaseModel):
+    items: list[User]
+    next_cursor: str | None = None
+
+
+class SearchCondition(BaseModel, frozen=True):
+    """属性の完全一致条件。attribute は User のフィールド名。"""
+
+    attribute: str
+    value: str
+
+
+class UserSearchPlan(BaseModel, frozen=True):
+    """検索の実行計画。
+
+    index_conditions はインデックスで引くキー条件。複数ある場合は各インデックスを並行に引き、
+    user_id で積集合を取る。filter_conditions はインデックスの結果に対して絞り込む残りの条件
+    (DynamoDB では FilterExpression に押し下げる)。
+    """
+
+    index_conditions: tuple[SearchCondition, ...] = Field(min_length=1)
+    filter_conditions: tuple[SearchCondition, ...] = ()
@@ -1,26 +1,67 @@
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
 
 from app.core.types import UserId
-from app.domain.user.entity import User
+from app.domain.user.entity import User, UserPage, UserSearchPlan
 
 
 class IUserRepository(ABC):
     @abstractmethod
-    def save(self, user: User) -> None:
+    async def save(self, user: User) -> None:
         raise NotImplementedError
 
     @abstractmethod
-    def find_by_id(self, user_id: UserId) -> User | None:
+    async def save_many(self, users: list[User]) -> None:
         raise NotImplementedError
 
     @abstractmethod
-    def find_all(self) -> list[User]:
+    async def find_by_id(self, user_id: UserId, fields: frozenset[str] | None = None) -> User | None:
+        """fields を指定すると少なくともその属性を持つ User を返す。
+
+        それ以外の属性は読まない (User.from_projection で組み立てる) ことがあるので、呼び出し側は
+        fields に含めた属性だけを参照する。一覧・検索系の fields も同じ意味を持つ。
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def find_by_ids(self, user_ids: list[UserId]) -> list[User]:
+        """見つかったユーザーだけを順不同で返す。存在しない ID はエラーにせず結果から除く。"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def find_all(self, fields: frozenset[str] | None = None) -> list[User]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def iter_all(self) -> AsyncIterator[User]:
+        """全件を一括で保持せずに順次返す。エクスポートやウォームアップなど全件読み出し用。
+
+        実装は async ジェネレータ (async def + yield) として書く。
+        """
         raise NotImplementedError
 
     @abstractmethod
-    def search_by_name(self, name: str) -> list[User]:
+    async def find_page(self, limit: int, cursor: str | None = None, fields: frozenset[str] | None = None) -> UserPage:
+        """最大 limit 件を返す。cursor は前ページの next_cursor をそのまま渡す不透明な文字列。"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def search_by_name(self, name: str) -> list[User]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def search_by_email(self, email: str) -> list[User]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def search_by_name_prefix(self, prefix: str, limit: int, fields: frozenset[str] | None = None) -> list[User]:
+        """正規化した name が prefix で始まるユーザーを、正規化した name の昇順で最大 limit 件返す。
+
+        大文字・小文字や全角・半角の違いは区別しない。読み取り量は limit 件で頭打ちになる。
+        """
         raise NotImplementedError
 
     @abstractmethod
-    def search_by_email(self, email: str) -> list[User]:
+    async def search(self, plan: UserSearchPlan, fields: frozenset[str] | None = None) -> list[User]:
+        """plan.index_conditions の各インデックスを引いて積集合を取り、filter_conditions を全て満たすものだけを返す。"""
         raise NotImplementedError
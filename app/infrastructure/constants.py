@@ -1,12 +1,37 @@
 # DynamoDB index names
 INDEX_NAME = "name-index"
 INDEX_EMAIL = "email-index"
+INDEX_NAME_PREFIX = "name-prefix-index"
 
 # DynamoDB attribute names
 ATTR_USER_ID = "user_id"
 ATTR_NAME = "name"
 ATTR_EMAIL = "email"
+# name-prefix-index 用の派生属性。正規化した name の先頭 1 文字をパーティション、全体をソートキーにする
+ATTR_NAME_PREFIX_BUCKET = "name_prefix_bucket"
+ATTR_NAME_NORMALIZED = "name_normalized"
+
+# 属性名 → その属性をキーに持つ GSI
+INDEX_BY_ATTRIBUTE = {ATTR_NAME: INDEX_NAME, ATTR_EMAIL: INDEX_EMAIL}
 
 # DynamoDB provisioned throughput
 DEFAULT_READ_CAPACITY = 5
 DEFAULT_WRITE_CAPACITY = 5
+
+# DynamoDB parallel scan
+PARALLEL_SCAN_BUFFER_PAGES = 16
+
+# DynamoDB batch operations
+BATCH_GET_MAX_KEYS = 100
+BATCH_WRITE_MAX_ITEMS = 25
+BATCH_MAX_RETRIES = 5
+BATCH_RETRY_BASE_DELAY_SECONDS = 0.05
+
+# DynamoDB throttling / degradation
+THROTTLING_ERROR_CODES = frozenset(
+    {"ProvisionedThroughputExceededException", "ThrottlingException", "RequestLimitExceeded"}
+)
+# スロットリング以外で DynamoDB 側の不調を示すエラー。これとスロットリング、接続エラーだけをブレーカーの失敗に数える
+SERVER_ERROR_CODES = frozenset({"InternalServerError", "ServiceUnavailable"})
+# botocore の再試行を使い切ったスロットリングを 503 で返すときの Retry-After
+THROTTLE_RETRY_AFTER_SECONDS = 1.0
@@ -0,0 +1,64 @@
+"""既存の users 項目に name-prefix-index 用の派生属性を付け直す。
+
+name-prefix-index を後から追加したテーブルでは、それより前に保存した項目に name_prefix_bucket /
+name_normalized がなく、name_prefix の検索に出てこない。GSI の追加 (起動時の ensure_users_table) の後に
+一度だけ実行する。何度実行しても結果は同じ:
+
+    uv run python -m app.infrastructure.datasource.backfill
+"""
+
+from typing import Any
+
+from botocore.exceptions import ClientError
+
+from app.infrastructure.constants import ATTR_NAME, ATTR_NAME_NORMALIZED, ATTR_NAME_PREFIX_BUCKET, ATTR_USER_ID
+from app.infrastructure.datasource.dynamodb import get_table
+from app.infrastructure.repository.search import name_prefix_attributes
+
+
+def backfill_name_prefix_attributes(table: Any | None = None) -> int:
+    """派生属性がない、または name と食い違う項目を更新し、更新した件数を返す。
+
+    読み取りは user_id / name / name_normalized だけを射影した Scan で行う。更新は項目が残っている場合に
+    限り (Scan の後に消された項目を作り直さない)、派生属性だけを SET する。
+    """
+    table = table if table is not None else get_table()
+    scan_kwargs: dict[str, Any] = {
+        "ProjectionExpression": "#id, #name, #normalized",
+        "ExpressionAttributeNames": {"#id": ATTR_USER_ID, "#name": ATTR_NAME, "#normalized": ATTR_NAME_NORMALIZED},
+    }
+    updated = 0
+    while True:
+        response = table.scan(**scan_kwargs)
+        for item in response["Items"]:
+            attributes = name_prefix_attributes(item.get(ATTR_NAME, ""))
+            if not attributes or item.get(ATTR_NAME_NORMALIZED) == attributes[ATTR_NAME_NORMALIZED]:
+                continue
+            try:
+                table.update_item(
+                    Key={ATTR_USER_ID: item[ATTR_USER_ID]},
+                    UpdateExpression="SET #bucket = :bucket, #normalized = :normalized",
+                    ConditionExpression="attribute_exists(#id)",
+                    ExpressionAttributeNames={
+                        "#id": ATTR_USER_ID,
+                        "#bucket": ATTR_NAME_PREFIX_BUCKET,
+                        "#normalized": ATTR_NAME_NORMALIZED,
+                    },
+                    ExpressionAttributeValues={
+                        ":bucket": attributes[ATTR_NAME_PREFIX_BUCKET],
+                        ":normalized": attributes[ATTR_NAME_NORMALIZED],
+                    },
+                )
+            except ClientError as err:
+                if err.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                    raise
+                continue
+            updated += 1
+        last_key = response.get("LastEvaluatedKey")
+        if not last_key:
+            return updated
+        scan_kwargs["ExclusiveStartKey"] = last_key
+
+
+if __name__ == "__main__":
+    print(f"backfilled {backfill_name_prefix_attributes()} items")
@@ -0,0 +1,65 @@
+"""DynamoDB バックエンドの起動・停止処理。
+
+このモジュール自体は aiobotocore / boto3 を import せず、必要になった時点で読み込む。
+app.main の import を軽く保ち、プロセスが早くリクエストを受け付けられるようにするため。
+"""
+
+import asyncio
+import time
+from types import ModuleType
+
+import structlog
+
+from app.core.constants import LOG_BOOTSTRAP_COMPLETED, LOG_BOOTSTRAP_FAILED, LOG_BOOTSTRAP_RETRY, NS_PER_MS
+
+logger = structlog.stdlib.get_logger()
+
+
+def _import_dynamodb() -> ModuleType:
+    # 最初のリクエストの DI 解決でイベントループ上の import が走らないよう、リポジトリも読み込んでおく
+    import app.infrastructure.repository.user_dynamodb_repository  # noqa: F401
+    from app.infrastructure.datasource import dynamodb
+
+    return dynamodb
+
+
+async def bootstrap_dynamodb() -> None:
+    """DynamoDB 関連モジュールの import、client の生成、users テーブルの確認を行う。
+
+    import はワーカースレッドで行い、サービスモデルの読み込みは client 生成時に AioConfig の
+    warm_up_loader_caches でスレッドに逃がすため、実行中もイベントループは止まらない。
+    """
+    start = time.perf_counter_ns()
+    try:
+        dynamodb = await asyncio.to_thread(_import_dynamodb)
+        client = await dynamodb.dynamodb_client_manager.get_client()
+        await dynamodb.ensure_users_table(client)
+    except Exception:
+        logger.exception(LOG_BOOTSTRAP_FAILED)
+        raise
+    logger.info(LOG_BOOTSTRAP_COMPLETED, duration_ms=round((time.perf_counter_ns() - start) / NS_PER_MS, 2))
+
+
+async def bootstrap_dynamodb_with_retry(max_attempts: int, base_delay: float, max_delay: float) -> None:
+    """bootstrap_dynamodb を成功するまで最大 max_attempts 回試す。
+
+    DynamoDB (Local) の起動がプロセスより遅れた場合などの一時的な失敗で、プロセスが準備未完了のまま
+    残らないようにする。待ち時間は base_delay から倍々に増やし、max_delay で頭打ちにする。
+    使い切ったら最後の例外を送出する。
+    """
+    for attempt in range(max_attempts):
+        try:
+            await bootstrap_dynamodb()
+            return
+        except Exception:
+            if attempt + 1 >= max_attempts:
+                raise
+        delay = min(max_delay, base_delay * (2**attempt))
+        logger.warning(LOG_BOOTSTRAP_RETRY, attempt=attempt + 1, max_attempts=max_attempts, delay_seconds=delay)
+        await asyncio.sleep(delay)
+
+
+async def shutdown_dynamodb() -> None:
+    from app.infrastructure.datasource.dynamodb import dynamodb_client_manager
+
+    await dynamodb_client_manager.close()
@@ -1,20 +1,40 @@
-from typing import Any
+import asyncio
+from contextlib import AsyncExitStack
+from dataclasses import dataclass
+from typing import Any, Literal
 
-import boto3
+from aiobotocore.config import AioConfig
+from aiobotocore.httpsession import AIOHTTPSession
+from aiobotocore.session import get_session
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+from botocore.exceptions import ClientError
 
 from app.core.config import settings
+from app.core.constants import (
+    METRIC_DYNAMODB_POOL_IN_FLIGHT,
+    METRIC_DYNAMODB_POOL_MAX_CONNECTIONS,
+    METRIC_DYNAMODB_POOL_PEAK_IN_FLIGHT,
+    METRIC_DYNAMODB_POOL_SATURATED_TOTAL,
+)
+from app.core.metrics import registry
 from app.infrastructure.constants import (
     ATTR_EMAIL,
     ATTR_NAME,
+    ATTR_NAME_NORMALIZED,
+    ATTR_NAME_PREFIX_BUCKET,
     ATTR_USER_ID,
     DEFAULT_READ_CAPACITY,
     DEFAULT_WRITE_CAPACITY,
     INDEX_EMAIL,
     INDEX_NAME,
+    INDEX_NAME_PREFIX,
 )
 
 
 def get_dynamodb_resource() -> Any:
+    # resource はテストとスクリプトでしか使わないので、boto3 のリソース定義の読み込みは呼ばれるまで遅らせる
+    import boto3
+
     return boto3.resource(
         "dynamodb",
         endpoint_url=settings.dynamodb_endpoint,
@@ -29,23 +49,189 @@ def get_table() -> Any:
     return dynamodb.Table(settings.dynamodb_table_name)
 
 
-def create_users_table() -> Any:
-    dynamodb = get_dynamodb_resource()
-    existing_tables = dynamodb.meta.client.list_tables()["TableNames"]
-    if settings.dynamodb_table_name in existing_tables:
-        return dynamodb.Table(settings.dynamodb_table_name)
+_serializer = TypeSerializer()
+_deserializer = TypeDeserializer()
+
+
+def serialize_item(item: dict[str, Any]) -> dict[str, Any]:
+    """Python の値を低レベル API の AttributeValue 形式 ({"S": ...} 等) に変換する。"""
+    return {key: _serializer.serialize(value) for key, value in item.items()}
+
+
+def deserialize_item(item: dict[str, Any]) -> dict[str, Any]:
+    """serialize_item の逆変換。数値は boto3 の resource と同じく Decimal で返る。"""
+    return {key: _deserializer.deserialize(value) for key, value in item.items()}
+
+
+@dataclass(frozen=True)
+class ClientPoolStats:
+    max_connections: int
+    # 送信中のリクエスト数。接続の空きを待っているものも含むので、max_connections を超えうる
+    in_flight: int
+    peak_in_flight: int
+    requests: int
+    # 送信を始めた時点で接続が全て使用中で、空きを待ったリクエストの数
+    saturated: int
+
+
+class _PoolCounter:
+    """HTTP リクエストの同時送信数を数える。イベントループ上からのみ更新するのでロックは持たない。"""
+
+    def __init__(self, max_connections: int) -> None:
+        self.max_connections = max_connections
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.requests = 0
+        self.saturated = 0
+
+    def start(self) -> None:
+        if self.in_flight >= self.max_connections:
+            self.saturated += 1
+        self.in_flight += 1
+        self.requests += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def finish(self) -> None:
+        self.in_flight -= 1
+
+    def snapshot(self) -> ClientPoolStats:
+        return ClientPoolStats(
+            max_connections=self.max_connections,
+            in_flight=self.in_flight,
+            peak_in_flight=self.peak_in_flight,
+            requests=self.requests,
+            saturated=self.saturated,
+        )
+
+
+def _counting_session_cls(counter: _PoolCounter) -> type[AIOHTTPSession]:
+    """送信ごとに counter を更新する aiohttp セッションクラスを作る。AioConfig の http_session_cls に渡す。"""
+
+    class CountingAIOHTTPSession(AIOHTTPSession):
+        async def send(self, request: Any) -> Any:
+            counter.start()
+            try:
+                return await super().send(request)
+            finally:
+                counter.finish()
+
+    return CountingAIOHTTPSession
+
+
+class DynamoDBClientManager:
+    """aiobotocore の DynamoDB client をイベントループ単位で 1 つだけ生成して使い回す。
+
+    aiobotocore の client は生成したイベントループ (aiohttp セッション) に紐づくため、
+    ループが変わった場合 (テストで TestClient を作り直した場合など) は作り直す。
+    client は keep-alive の接続プール (上限 max_pool_connections) を持ち、タイムアウトと
+    リトライは Settings の値で設定する。プールの使用状況は stats で読める。
+    """
+
+    def __init__(
+        self,
+        max_pool_connections: int = settings.dynamodb_max_pool_connections,
+        connect_timeout: float = settings.dynamodb_connect_timeout_seconds,
+        read_timeout: float = settings.dynamodb_read_timeout_seconds,
+        retry_mode: Literal["legacy", "standard", "adaptive"] = settings.dynamodb_retry_mode,
+        max_attempts: int = settings.dynamodb_max_attempts,
+        keepalive_timeout: float = settings.dynamodb_keepalive_timeout_seconds,
+    ) -> None:
+        self._session = get_session()
+        self._pool = _PoolCounter(max_pool_connections)
+        self._config = AioConfig(
+            max_pool_connections=max_pool_connections,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+            retries={"mode": retry_mode, "max_attempts": max_attempts},
+            connector_args={"keepalive_timeout": keepalive_timeout},
+            http_session_cls=_counting_session_cls(self._pool),
+            # サービスモデル (JSON) の読み込みを client 生成時にワーカースレッドで済ませ、イベントループを止めない
+            warm_up_loader_caches=True,
+        )
+        self._client: Any = None
+        self._exit_stack: AsyncExitStack | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lock: asyncio.Lock | None = None
+
+    async def get_client(self) -> Any:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._lock is None:
+            self._loop = loop
+            self._lock = asyncio.Lock()
+            self._client = None
+            self._exit_stack = None
+        if self._client is None:
+            async with self._lock:
+                if self._client is None:
+                    exit_stack = AsyncExitStack()
+                    self._client = await exit_stack.enter_async_context(
+                        self._session.create_client(
+                            "dynamodb",
+                            endpoint_url=settings.dynamodb_endpoint,
+                            region_name=settings.dynamodb_region,
+                            aws_access_key_id="dummy",
+                            aws_secret_access_key="dummy",
+                            config=self._config,
+                        )
+                    )
+                    self._exit_stack = exit_stack
+        return self._client
+
+    @property
+    def stats(self) -> ClientPoolStats:
+        return self._pool.snapshot()
+
+    async def close(self) -> None:
+        exit_stack = self._exit_stack
+        self._client = None
+        self._exit_stack = None
+        if exit_stack is not None:
+            await exit_stack.aclose()
+
+
+dynamodb_client_manager = DynamoDBClientManager()
 
-    table = dynamodb.create_table(
-        TableName=settings.dynamodb_table_name,
-        KeySchema=[
+registry.callback(
+    METRIC_DYNAMODB_POOL_MAX_CONNECTIONS,
+    "Connection pool size of the DynamoDB client.",
+    "gauge",
+    lambda: dynamodb_client_manager.stats.max_connections,
+)
+registry.callback(
+    METRIC_DYNAMODB_POOL_IN_FLIGHT,
+    "DynamoDB HTTP requests currently in flight.",
+    "gauge",
+    lambda: dynamodb_client_manager.stats.in_flight,
+)
+registry.callback(
+    METRIC_DYNAMODB_POOL_PEAK_IN_FLIGHT,
+    "Peak concurrent DynamoDB HTTP requests since startup.",
+    "gauge",
+    lambda: dynamodb_client_manager.stats.peak_in_flight,
+)
+registry.callback(
+    METRIC_DYNAMODB_POOL_SATURATED_TOTAL,
+    "DynamoDB HTTP requests that started while every pooled connection was in use.",
+    "counter",
+    lambda: dynamodb_client_manager.stats.saturated,
+)
+
+
+def _users_table_definition() -> dict[str, Any]:
+    """users テーブルの CreateTable パラメータ。boto3 の resource と低レベル client の両方にそのまま渡せる。"""
+    return {
+        "TableName": settings.dynamodb_table_name,
+        "KeySchema": [
             {"AttributeName": ATTR_USER_ID, "KeyType": "HASH"},
         ],
-        AttributeDefinitions=[
+        "AttributeDefinitions": [
             {"AttributeName": ATTR_USER_ID, "AttributeType": "S"},
             {"AttributeName": ATTR_NAME, "AttributeType": "S"},
             {"AttributeName": ATTR_EMAIL, "AttributeType": "S"},
+            {"AttributeName": ATTR_NAME_PREFIX_BUCKET, "AttributeType": "S"},
+            {"AttributeName": ATTR_NAME_NORMALIZED, "AttributeType": "S"},
         ],
-        GlobalSecondaryIndexes=[
+        "GlobalSecondaryIndexes": [
             {
                 "IndexName": INDEX_NAME,
                 "KeySchema": [
@@ -68,12 +254,113 @@ def create_users_table() -> Any:
                     "WriteCapacityUnits": DEFAULT_WRITE_CAPACITY,
                 },
             },
+            {
+                "IndexName": INDEX_NAME_PREFIX,
+                "KeySchema": [
+                    {"AttributeName": ATTR_NAME_PREFIX_BUCKET, "KeyType": "HASH"},
+                    {"AttributeName": ATTR_NAME_NORMALIZED, "KeyType": "RANGE"},
+                ],
+                "Projection": {"ProjectionType": "ALL"},
+                "ProvisionedThroughput": {
+                    "ReadCapacityUnits": DEFAULT_READ_CAPACITY,
+                    "WriteCapacityUnits": DEFAULT_WRITE_CAPACITY,
+                },
+            },
         ],
-        BillingMode="PROVISIONED",
-        ProvisionedThroughput={
+        "BillingMode": "PROVISIONED",
+        "ProvisionedThroughput": {
             "ReadCapacityUnits": DEFAULT_READ_CAPACITY,
             "WriteCapacityUnits": DEFAULT_WRITE_CAPACITY,
         },
-    )
+    }
+
+
+def _missing_index_updates(table: dict[str, Any]) -> list[dict[str, Any]]:
+    """DescribeTable の Table と定義を比べ、足りない GSI を追加する UpdateTable パラメータを返す。
+
+    後から追加した GSI (name-prefix-index など) を既存テーブルにも作るため。UpdateTable は 1 回に
+    GSI を 1 つしか作れないので、足りない GSI ごとに 1 つずつ返す。オンデマンド課金のテーブルには
+    ProvisionedThroughput を付けない。
+    """
+    definition = _users_table_definition()
+    existing = {index["IndexName"] for index in table.get("GlobalSecondaryIndexes", [])}
+    on_demand = table.get("BillingModeSummary", {}).get("BillingMode") == "PAY_PER_REQUEST"
+    attributes = {attribute["AttributeName"]: attribute for attribute in definition["AttributeDefinitions"]}
+    updates: list[dict[str, Any]] = []
+    for index in definition["GlobalSecondaryIndexes"]:
+        if index["IndexName"] in existing:
+            continue
+        create = dict(index)
+        if on_demand:
+            del create["ProvisionedThroughput"]
+        updates.append(
+            {
+                "TableName": definition["TableName"],
+                "AttributeDefinitions": [attributes[key["AttributeName"]] for key in index["KeySchema"]],
+                "GlobalSecondaryIndexUpdates": [{"Create": create}],
+            }
+        )
+    return updates
+
+
+def _is_update_in_progress(err: ClientError) -> bool:
+    # 別の GSI の作成中や、別のプロセスが同じ GSI を追加している最中の UpdateTable はこれらで失敗する
+    return err.response["Error"]["Code"] in ("ResourceInUseException", "LimitExceededException")
+
+
+def create_users_table() -> Any:
+    """users テーブルがなければ作って返す。既存かどうかは DescribeTable で 1 テーブルだけを確認する。
+
+    既存のテーブルに足りない GSI があれば UpdateTable で追加する。追加した GSI の構築 (既存項目の
+    バックフィル) は DynamoDB 側で非同期に進むので、完了は待たない。
+    """
+    dynamodb = get_dynamodb_resource()
+    table = dynamodb.Table(settings.dynamodb_table_name)
+    try:
+        table.load()
+    except ClientError as err:
+        if err.response["Error"]["Code"] != "ResourceNotFoundException":
+            raise
+    else:
+        for update in _missing_index_updates(table.meta.data):
+            try:
+                dynamodb.meta.client.update_table(**update)
+            except ClientError as err:
+                if not _is_update_in_progress(err):
+                    raise
+                # 残りは次の起動で追加する
+                break
+        return table
+    try:
+        table = dynamodb.create_table(**_users_table_definition())
+    except ClientError as err:
+        # 別のプロセスが同時に作成している場合は、その完了を待つ
+        if err.response["Error"]["Code"] != "ResourceInUseException":
+            raise
     table.wait_until_exists()
     return table
+
+
+async def ensure_users_table(client: Any) -> None:
+    """create_users_table の非同期版。aiobotocore の client で確認・作成し、イベントループを止めない。"""
+    table_name = settings.dynamodb_table_name
+    try:
+        description = await client.describe_table(TableName=table_name)
+    except ClientError as err:
+        if err.response["Error"]["Code"] != "ResourceNotFoundException":
+            raise
+    else:
+        for update in _missing_index_updates(description["Table"]):
+            try:
+                await client.update_table(**update)
+            except ClientError as err:
+                if not _is_update_in_progress(err):
+                    raise
+                break
+        return
+    try:
+        await client.create_table(**_users_table_definition())
+    except ClientError as err:
+        if err.response["Error"]["Code"] != "ResourceInUseException":
+            raise
+    await client.get_waiter("table_exists").wait(TableName=table_name)
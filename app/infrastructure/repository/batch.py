@@ -0,0 +1,71 @@
+import asyncio
+import random
+from collections.abc import Awaitable, Callable, Coroutine, Iterable, Iterator, Sequence
+from typing import Any
+
+from app.core.exceptions import RepositoryError
+from app.infrastructure.constants import BATCH_MAX_RETRIES, BATCH_RETRY_BASE_DELAY_SECONDS
+
+
+class UnprocessedItemsError(RepositoryError):
+    """再送回数を使い切っても Unprocessed* が残ったことを表す。unprocessed は最後に残ったリクエスト。"""
+
+    def __init__(self, message: str, operation: str, unprocessed: dict[str, Any]) -> None:
+        self.unprocessed = unprocessed
+        super().__init__(message=message, operation=operation)
+
+
+def chunked[T](items: Sequence[T], size: int) -> Iterator[Sequence[T]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+async def run_concurrently[T](coros: Iterable[Coroutine[Any, Any, T]]) -> list[T]:
+    """coros を並行に実行し、結果を渡した順に返す。
+
+    どれかが失敗した時点で残りをキャンセルし (asyncio.TaskGroup)、最初の例外を ExceptionGroup で包まずに
+    送出する。失敗したリクエストの裏で兄弟のチャンクが DynamoDB への再送を続けないようにするため。
+    """
+    failure: Exception | None = None
+    try:
+        async with asyncio.TaskGroup() as group:
+            tasks = [group.create_task(coro) for coro in coros]
+    except ExceptionGroup as failures:
+        failure = failures.exceptions[0]
+    # except の外で送出し、元の例外の __cause__ (RepositoryUnavailableError の ClientError など) を保つ
+    if failure is not None:
+        raise failure
+    return [task.result() for task in tasks]
+
+
+def backoff_delay(attempt: int, base_delay: float = BATCH_RETRY_BASE_DELAY_SECONDS) -> float:
+    """指数バックオフ + full jitter。attempt は 0 始まり。"""
+    return random.uniform(0, base_delay * (2**attempt))
+
+
+async def call_with_unprocessed_retry(
+    call: Callable[[dict[str, Any]], Awaitable[dict[str, Any]]],
+    request_items: dict[str, Any],
+    unprocessed_key: str,
+    operation: str,
+    max_retries: int = BATCH_MAX_RETRIES,
+) -> list[dict[str, Any]]:
+    """BatchGetItem / BatchWriteItem を呼び、Unprocessed* が空になるまでバックオフしながら再送する。
+
+    各呼び出しのレスポンスを順に返す。再送回数を使い切っても残った場合は UnprocessedItemsError にする。
+    """
+    responses: list[dict[str, Any]] = []
+    pending = request_items
+    for attempt in range(max_retries + 1):
+        response = await call(pending)
+        responses.append(response)
+        pending = response.get(unprocessed_key) or {}
+        if not pending:
+            return responses
+        if attempt < max_retries:
+            await asyncio.sleep(backoff_delay(attempt))
+    raise UnprocessedItemsError(
+        message=f"{unprocessed_key} remained after {max_retries} retries",
+        operation=operation,
+        unprocessed=pending,
+    )
@@ -0,0 +1,126 @@
+import weakref
+from collections.abc import AsyncIterator, Callable
+
+from app.core.cache import CacheStats, LRUTTLCache
+from app.core.constants import (
+    METRIC_USER_CACHE_EVICTIONS_TOTAL,
+    METRIC_USER_CACHE_EXPIRATIONS_TOTAL,
+    METRIC_USER_CACHE_HITS_TOTAL,
+    METRIC_USER_CACHE_MISSES_TOTAL,
+    METRIC_USER_CACHE_SIZE,
+)
+from app.core.metrics import registry
+from app.core.types import UserId
+from app.domain.user.entity import User, UserPage, UserSearchPlan
+from app.domain.user.i_user_repository import IUserRepository
+
+
+class CachedUserRepository(IUserRepository):
+    """find_by_id をプロセス内 LRU/TTL キャッシュから返すリードスルーのデコレータ。
+
+    save は委譲先へ書き込んだ後にキャッシュを最新の値で更新する (write-through)。
+    fields 付きの find_by_id はキャッシュにあればそれを返し、なければ委譲するだけでキャッシュには入れない
+    (一部の属性しか持たない User をキャッシュしないため)。一覧・検索系はキャッシュせずにそのまま委譲する。
+    """
+
+    def __init__(self, inner: IUserRepository, max_size: int, ttl_seconds: float) -> None:
+        self._inner = inner
+        self._cache: LRUTTLCache[UserId, User] = LRUTTLCache(max_size=max_size, ttl_seconds=ttl_seconds)
+        _instances.add(self)
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._cache.stats
+
+    async def save(self, user: User) -> None:
+        try:
+            await self._inner.save(user)
+        except Exception:
+            # 書き込み結果が不明なので古い値を返さないよう捨てておく
+            self._cache.delete(user.user_id)
+            raise
+        self._cache.set(user.user_id, user)
+
+    async def save_many(self, users: list[User]) -> None:
+        try:
+            await self._inner.save_many(users)
+        except Exception:
+            for user in users:
+                self._cache.delete(user.user_id)
+            raise
+        for user in users:
+            self._cache.set(user.user_id, user)
+
+    async def find_by_id(self, user_id: UserId, fields: frozenset[str] | None = None) -> User | None:
+        cached = self._cache.get(user_id)
+        if cached is not None:
+            return cached
+        if fields is not None:
+            return await self._inner.find_by_id(user_id, fields=fields)
+        user = await self._inner.find_by_id(user_id)
+        if user is not None:
+            self._cache.set(user_id, user)
+        return user
+
+    async def find_by_ids(self, user_ids: list[UserId]) -> list[User]:
+        found: list[User] = []
+        missing: list[UserId] = []
+        for user_id in dict.fromkeys(user_ids):
+            cached = self._cache.get(user_id)
+            if cached is None:
+                missing.append(user_id)
+            else:
+                found.append(cached)
+        if missing:
+            fetched = await self._inner.find_by_ids(missing)
+            for user in fetched:
+                self._cache.set(user.user_id, user)
+            found.extend(fetched)
+        return found
+
+    async def find_all(self, fields: frozenset[str] | None = None) -> list[User]:
+        return await self._inner.find_all(fields=fields)
+
+    def iter_all(self) -> AsyncIterator[User]:
+        return self._inner.iter_all()
+
+    async def find_page(self, limit: int, cursor: str | None = None, fields: frozenset[str] | None = None) -> UserPage:
+        return await self._inner.find_page(limit=limit, cursor=cursor, fields=fields)
+
+    async def search_by_name(self, name: str) -> list[User]:
+        return await self._inner.search_by_name(name)
+
+    async def search_by_email(self, email: str) -> list[User]:
+        return await self._inner.search_by_email(email)
+
+    async def search_by_name_prefix(self, prefix: str, limit: int, fields: frozenset[str] | None = None) -> list[User]:
+        return await self._inner.search_by_name_prefix(prefix, limit, fields=fields)
+
+    async def search(self, plan: UserSearchPlan, fields: frozenset[str] | None = None) -> list[User]:
+        return await self._inner.search(plan, fields=fields)
+
+
+# /metrics のコールバックから読むため、生きているインスタンスを弱参照で持つ。
+# 通常はコンテナが作る 1 つだけで、DIContainer.reset で作り直された古いものは GC とともに外れる
+_instances: weakref.WeakSet[CachedUserRepository] = weakref.WeakSet()
+
+
+def _total(read: Callable[[CacheStats], int]) -> Callable[[], float]:
+    return lambda: sum(read(repository.stats) for repository in list(_instances))
+
+
+registry.callback(METRIC_USER_CACHE_SIZE, "Entries in the find_by_id user cache.", "gauge", _total(lambda s: s.size))
+registry.callback(METRIC_USER_CACHE_HITS_TOTAL, "User cache hits.", "counter", _total(lambda s: s.hits))
+registry.callback(METRIC_USER_CACHE_MISSES_TOTAL, "User cache misses.", "counter", _total(lambda s: s.misses))
+registry.callback(
+    METRIC_USER_CACHE_EVICTIONS_TOTAL,
+    "User cache entries evicted by the size limit.",
+    "counter",
+    _total(lambda s: s.evictions),
+)
+registry.callback(
+    METRIC_USER_CACHE_EXPIRATIONS_TOTAL,
+    "User cache entries dropped after their TTL.",
+    "counter",
+    _total(lambda s: s.expirations),
+)
@@ -0,0 +1,114 @@
+import weakref
+from collections.abc import AsyncIterator, Callable, Hashable
+
+from app.core.constants import (
+    METRIC_COALESCING_CALLS_TOTAL,
+    METRIC_COALESCING_COLLAPSED_TOTAL,
+    METRIC_COALESCING_EXECUTIONS_TOTAL,
+    METRIC_COALESCING_IN_FLIGHT,
+)
+from app.core.metrics import registry
+from app.core.singleflight import SingleFlight, SingleFlightStats
+from app.core.types import UserId
+from app.domain.user.entity import User, UserPage, UserSearchPlan
+from app.domain.user.i_user_repository import IUserRepository
+
+
+class CoalescingUserRepository(IUserRepository):
+    """同時に発生した同一の読み取り (同じ ID・同じ条件の検索) を 1 回の DynamoDB 呼び出しにまとめる。
+
+    キャッシュ失効直後やデプロイ直後に同じキーへ読み取りが殺到した場合でも、
+    委譲先に届くのはキーごとに 1 件だけになる。読み取る属性 (fields) が違う呼び出しは別のキーとして扱う。
+    書き込みと一覧系はそのまま委譲する。
+    """
+
+    def __init__(self, inner: IUserRepository) -> None:
+        self._inner = inner
+        self._find_by_id_flight: SingleFlight[tuple[UserId, frozenset[str] | None], User | None] = SingleFlight()
+        self._search_flight: SingleFlight[tuple[Hashable, ...], list[User]] = SingleFlight()
+        _instances.add(self)
+
+    @property
+    def stats(self) -> dict[str, SingleFlightStats]:
+        return {
+            "find_by_id": self._find_by_id_flight.stats,
+            "search": self._search_flight.stats,
+        }
+
+    async def save(self, user: User) -> None:
+        await self._inner.save(user)
+
+    async def save_many(self, users: list[User]) -> None:
+        await self._inner.save_many(users)
+
+    async def find_by_id(self, user_id: UserId, fields: frozenset[str] | None = None) -> User | None:
+        return await self._find_by_id_flight.do(
+            (user_id, fields), lambda: self._inner.find_by_id(user_id, fields=fields)
+        )
+
+    async def find_by_ids(self, user_ids: list[UserId]) -> list[User]:
+        return await self._inner.find_by_ids(user_ids)
+
+    async def find_all(self, fields: frozenset[str] | None = None) -> list[User]:
+        return await self._inner.find_all(fields=fields)
+
+    def iter_all(self) -> AsyncIterator[User]:
+        return self._inner.iter_all()
+
+    async def find_page(self, limit: int, cursor: str | None = None, fields: frozenset[str] | None = None) -> UserPage:
+        return await self._inner.find_page(limit=limit, cursor=cursor, fields=fields)
+
+    async def search_by_name(self, name: str) -> list[User]:
+        # 結果のリストは待ち手ごとにコピーし、呼び出し側での変更が他のリクエストに漏れないようにする
+        users = await self._search_flight.do(("name", name), lambda: self._inner.search_by_name(name))
+        return list(users)
+
+    async def search_by_email(self, email: str) -> list[User]:
+        users = await self._search_flight.do(("email", email), lambda: self._inner.search_by_email(email))
+        return list(users)
+
+    async def search_by_name_prefix(self, prefix: str, limit: int, fields: frozenset[str] | None = None) -> list[User]:
+        # 入力補完は同じ prefix へのリクエストが集中しやすいのでまとめる
+        users = await self._search_flight.do(
+            ("name_prefix", prefix, limit, fields),
+            lambda: self._inner.search_by_name_prefix(prefix, limit, fields=fields),
+        )
+        return list(users)
+
+    async def search(self, plan: UserSearchPlan, fields: frozenset[str] | None = None) -> list[User]:
+        users = await self._search_flight.do(("plan", plan, fields), lambda: self._inner.search(plan, fields=fields))
+        return list(users)
+
+
+# /metrics のコールバックから読むため、生きているインスタンスを弱参照で持つ (CachedUserRepository と同じ)
+_instances: weakref.WeakSet[CoalescingUserRepository] = weakref.WeakSet()
+
+
+def _total(read: Callable[[SingleFlightStats], int]) -> Callable[[], float]:
+    return lambda: sum(read(stats) for repository in list(_instances) for stats in repository.stats.values())
+
+
+registry.callback(
+    METRIC_COALESCING_CALLS_TOTAL,
+    "Reads that went through request coalescing (find_by_id and search).",
+    "counter",
+    _total(lambda s: s.calls),
+)
+registry.callback(
+    METRIC_COALESCING_EXECUTIONS_TOTAL,
+    "Coalesced reads actually sent to the inner repository.",
+    "counter",
+    _total(lambda s: s.executions),
+)
+registry.callback(
+    METRIC_COALESCING_COLLAPSED_TOTAL,
+    "Reads that shared the result of an in-flight identical read.",
+    "counter",
+    _total(lambda s: s.collapsed),
+)
+registry.callback(
+    METRIC_COALESCING_IN_FLIGHT,
+    "Distinct coalesced reads currently in flight.",
+    "gauge",
+    _total(lambda s: s.in_flight),
+)
@@ -0,0 +1,24 @@
+import base64
+import binascii
+import json
+from typing import Any
+
+from app.core.exceptions import InvalidCursorError
+
+
+def encode_cursor(last_evaluated_key: dict[str, Any]) -> str:
+    """DynamoDB の LastEvaluatedKey をクライアントに渡す不透明な文字列へ変換する。"""
+    raw = json.dumps(last_evaluated_key, separators=(",", ":"), sort_keys=True, default=str)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict[str, Any]:
+    """encode_cursor の逆変換。壊れた cursor は InvalidCursorError にする。"""
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        key = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as err:
+        raise InvalidCursorError(cursor) from err
+    if not isinstance(key, dict) or not key:
+        raise InvalidCursorError(cursor)
+    return key
@@ -0,0 +1,146 @@
+import bisect
+import threading
+from collections.abc import AsyncIterator
+
+from app.core.exceptions import InvalidCursorError, RepositoryError
+from app.core.types import UserId
+from app.domain.user.entity import User, UserPage, UserSearchPlan
+from app.domain.user.i_user_repository import IUserRepository
+from app.infrastructure.constants import ATTR_USER_ID
+from app.infrastructure.repository.cursor import decode_cursor, encode_cursor
+from app.infrastructure.repository.search import intersect_by_user_id, normalize_name
+
+
+class InMemoryUserRepository(IUserRepository):
+    """プロセス内の dict に User を保持する IUserRepository 実装。
+
+    name-index / email-index に相当するハッシュインデックスを持ち、検索は O(該当件数) で返す。
+    name の前方一致検索は正規化した name のソート済みリストを二分探索する。
+    書き込みはロックで直列化し、インデックスのバケットは tuple を丸ごと差し替える (copy-on-write)。
+    読み取りは GIL 下でアトミックな dict / list の単発操作だけで組み立てるためロックを取らない。
+    読み取り系の fields は無視する。保持している User をそのまま返すのが最も安いため。
+    """
+
+    def __init__(self, users: list[User] | None = None) -> None:
+        self._write_lock = threading.Lock()
+        self._users: dict[UserId, User] = {}
+        # find_page 用に user_id の昇順を保つ。DynamoDB の Scan と同様、順序自体に意味はない
+        self._sorted_ids: list[UserId] = []
+        self._by_name: dict[str, tuple[UserId, ...]] = {}
+        self._by_email: dict[str, tuple[UserId, ...]] = {}
+        # 前方一致検索用に (正規化した name, user_id) を昇順に保つ
+        self._name_keys: list[tuple[str, UserId]] = []
+        for user in users or []:
+            self._put(user)
+
+    async def save(self, user: User) -> None:
+        self._put(user)
+
+    async def save_many(self, users: list[User]) -> None:
+        for user in users:
+            self._put(user)
+
+    async def find_by_id(self, user_id: UserId, fields: frozenset[str] | None = None) -> User | None:
+        return self._users.get(user_id)
+
+    async def find_by_ids(self, user_ids: list[UserId]) -> list[User]:
+        users = self._users
+        return [users[user_id] for user_id in dict.fromkeys(user_ids) if user_id in users]
+
+    async def find_all(self, fields: frozenset[str] | None = None) -> list[User]:
+        return list(self._users.values())
+
+    async def iter_all(self) -> AsyncIterator[User]:
+        for user in list(self._users.values()):
+            yield user
+
+    async def find_page(self, limit: int, cursor: str | None = None, fields: frozenset[str] | None = None) -> UserPage:
+        start = 0
+        if cursor:
+            start_key = decode_cursor(cursor)
+            if set(start_key) != {ATTR_USER_ID} or not isinstance(start_key[ATTR_USER_ID], str):
+                raise InvalidCursorError(cursor)
+            start = bisect.bisect_right(self._sorted_ids, start_key[ATTR_USER_ID])
+        page_ids = self._sorted_ids[start : start + limit + 1]
+        has_more = len(page_ids) > limit
+        page_ids = page_ids[:limit]
+        users = self._users
+        return UserPage(
+            items=[users[user_id] for user_id in page_ids if user_id in users],
+            next_cursor=encode_cursor({ATTR_USER_ID: page_ids[-1]}) if has_more else None,
+        )
+
+    async def search_by_name(self, name: str) -> list[User]:
+        users = self._users
+        # バケットの読み取り後に書き換えられた User を除くため、属性を再確認する
+        return [user for user_id in self._by_name.get(name, ()) if (user := users.get(user_id)) and user.name == name]
+
+    async def search_by_email(self, email: str) -> list[User]:
+        users = self._users
+        return [
+            user for user_id in self._by_email.get(email, ()) if (user := users.get(user_id)) and user.email == email
+        ]
+
+    async def search_by_name_prefix(self, prefix: str, limit: int, fields: frozenset[str] | None = None) -> list[User]:
+        normalized = normalize_name(prefix)
+        if not normalized:
+            return []
+        start = bisect.bisect_left(self._name_keys, (normalized,))
+        users = self._users
+        result: list[User] = []
+        for name_key, user_id in self._name_keys[start : start + limit]:
+            if not name_key.startswith(normalized):
+                break
+            user = users.get(user_id)
+            if user is not None and normalize_name(user.name) == name_key:
+                result.append(user)
+        return result
+
+    async def search(self, plan: UserSearchPlan, fields: frozenset[str] | None = None) -> list[User]:
+        results: list[list[User]] = []
+        for condition in plan.index_conditions:
+            if condition.attribute == "name":
+                results.append(await self.search_by_name(condition.value))
+            elif condition.attribute == "email":
+                results.append(await self.search_by_email(condition.value))
+            else:
+                raise RepositoryError(message=f"No index for attribute: {condition.attribute}", operation="search")
+        candidates = intersect_by_user_id(results)
+        return [
+            user
+            for user in candidates
+            if all(getattr(user, f.attribute, None) == f.value for f in plan.filter_conditions)
+        ]
+
+    def _put(self, user: User) -> None:
+        with self._write_lock:
+            previous = self._users.get(user.user_id)
+            if previous is None:
+                bisect.insort(self._sorted_ids, user.user_id)
+            else:
+                if previous.name != user.name:
+                    _remove_from_bucket(self._by_name, previous.name, user.user_id)
+                    old_key = (normalize_name(previous.name), user.user_id)
+                    index = bisect.bisect_left(self._name_keys, old_key)
+                    if index < len(self._name_keys) and self._name_keys[index] == old_key:
+                        del self._name_keys[index]
+                if previous.email != user.email:
+                    _remove_from_bucket(self._by_email, previous.email, user.user_id)
+            if previous is None or previous.name != user.name:
+                _add_to_bucket(self._by_name, user.name, user.user_id)
+                bisect.insort(self._name_keys, (normalize_name(user.name), user.user_id))
+            if previous is None or previous.email != user.email:
+                _add_to_bucket(self._by_email, user.email, user.user_id)
+            self._users[user.user_id] = user
+
+
+def _add_to_bucket(index: dict[str, tuple[UserId, ...]], key: str, user_id: UserId) -> None:
+    index[key] = (*index.get(key, ()), user_id)
+
+
+def _remove_from_bucket(index: dict[str, tuple[UserId, ...]], key: str, user_id: UserId) -> None:
+    remaining = tuple(uid for uid in index.get(key, ()) if uid != user_id)
+    if remaining:
+        index[key] = remaining
+    else:
+        index.pop(key, None)
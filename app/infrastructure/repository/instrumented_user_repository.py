@@ -0,0 +1,87 @@
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+
+from app.core.constants import METRIC_OUTCOME_ERROR, METRIC_OUTCOME_SUCCESS
+from app.core.exceptions import RepositoryError
+from app.core.metrics import repository_errors_total, repository_operation_duration_seconds
+from app.core.types import UserId
+from app.domain.user.entity import User, UserPage, UserSearchPlan
+from app.domain.user.i_user_repository import IUserRepository
+
+
+class InstrumentedUserRepository(IUserRepository):
+    """委譲先の各操作のレイテンシを操作名・成否別のヒストグラムに記録する。
+
+    RepositoryError は例外側の operation をラベルにし、repository_errors_total にも加算する。
+    """
+
+    def __init__(self, inner: IUserRepository) -> None:
+        self._inner = inner
+
+    async def _observe[T](self, operation: str, call: Callable[[], Awaitable[T]]) -> T:
+        start = time.perf_counter()
+        outcome = METRIC_OUTCOME_ERROR
+        try:
+            result = await call()
+            outcome = METRIC_OUTCOME_SUCCESS
+            return result
+        except RepositoryError as e:
+            operation = e.operation
+            repository_errors_total.inc(operation)
+            raise
+        finally:
+            repository_operation_duration_seconds.observe(time.perf_counter() - start, operation, outcome)
+
+    async def save(self, user: User) -> None:
+        await self._observe("save", lambda: self._inner.save(user))
+
+    async def save_many(self, users: list[User]) -> None:
+        await self._observe("save_many", lambda: self._inner.save_many(users))
+
+    async def find_by_id(self, user_id: UserId, fields: frozenset[str] | None = None) -> User | None:
+        return await self._observe("find_by_id", lambda: self._inner.find_by_id(user_id, fields=fields))
+
+    async def find_by_ids(self, user_ids: list[UserId]) -> list[User]:
+        return await self._observe("find_by_ids", lambda: self._inner.find_by_ids(user_ids))
+
+    async def find_all(self, fields: frozenset[str] | None = None) -> list[User]:
+        return await self._observe("find_all", lambda: self._inner.find_all(fields=fields))
+
+    async def iter_all(self) -> AsyncIterator[User]:
+        # ストリームは読み切るまでの全体をひとつの操作として計測する
+        start = time.perf_counter()
+        outcome = METRIC_OUTCOME_ERROR
+        operation = "iter_all"
+        try:
+            async for user in self._inner.iter_all():
+                yield user
+            outcome = METRIC_OUTCOME_SUCCESS
+        except GeneratorExit:
+            # 呼び出し側が途中で読むのをやめただけなので失敗としては数えない
+            outcome = METRIC_OUTCOME_SUCCESS
+            raise
+        except RepositoryError as e:
+            operation = e.operation
+            repository_errors_total.inc(operation)
+            raise
+        finally:
+            repository_operation_duration_seconds.observe(time.perf_counter() - start, operation, outcome)
+
+    async def find_page(self, limit: int, cursor: str | None = None, fields: frozenset[str] | None = None) -> UserPage:
+        return await self._observe(
+            "find_page", lambda: self._inner.find_page(limit=limit, cursor=cursor, fields=fields)
+        )
+
+    async def search_by_name(self, name: str) -> list[User]:
+        return await self._observe("search_by_name", lambda: self._inner.search_by_name(name))
+
+    async def search_by_email(self, email: str) -> list[User]:
+        return await self._observe("search_by_email", lambda: self._inner.search_by_email(email))
+
+    async def search_by_name_prefix(self, prefix: str, limit: int, fields: frozenset[str] | None = None) -> list[User]:
+        return await self._observe(
+            "search_by_name_prefix", lambda: self._inner.search_by_name_prefix(prefix, limit, fields=fields)
+        )
+
+    async def search(self, plan: UserSearchPlan, fields: frozenset[str] | None = None) -> list[User]:
+        return await self._observe("search", lambda: self._inner.search(plan, fields=fields))
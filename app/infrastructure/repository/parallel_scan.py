@@ -0,0 +1,82 @@
+import asyncio
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import Any
+
+from app.core.exceptions import RepositoryError
+from app.infrastructure.constants import PARALLEL_SCAN_BUFFER_PAGES
+
+
+@dataclass(frozen=True)
+class _SegmentDone:
+    segment: int
+
+
+@dataclass(frozen=True)
+class _SegmentFailed:
+    segment: int
+    error: Exception
+
+
+async def parallel_scan(
+    client: Any,
+    table_name: str,
+    total_segments: int,
+    max_workers: int,
+    buffer_pages: int = PARALLEL_SCAN_BUFFER_PAGES,
+    scan_kwargs: dict[str, Any] | None = None,
+) -> AsyncIterator[dict[str, Any]]:
+    """Segment/TotalSegments でテーブルを分割し、各セグメントを並列に Scan して結果をストリームで返す。
+
+    同時に Scan するセグメント数は max_workers で制限する。各ワーカーはページ単位で有界キューに積み、
+    呼び出し側はキューから取り出した順に item (AttributeValue 形式) を受け取る。
+    いずれかのセグメントが失敗した時点で残りを止め、RepositoryError を送出する。
+    失敗自体が RepositoryError (ブレーカーの RepositoryUnavailableError など) ならそのまま送出する。
+    scan_kwargs (ProjectionExpression など) は各セグメントの Scan にそのまま渡す。
+    """
+    pages: asyncio.Queue[list[dict[str, Any]] | _SegmentDone | _SegmentFailed] = asyncio.Queue(maxsize=buffer_pages)
+    semaphore = asyncio.Semaphore(max(1, max_workers))
+
+    async def scan_segment(segment: int) -> None:
+        segment_kwargs: dict[str, Any] = {
+            **(scan_kwargs or {}),
+            "TableName": table_name,
+            "Segment": segment,
+            "TotalSegments": total_segments,
+        }
+        async with semaphore:
+            try:
+                while True:
+                    response = await client.scan(**segment_kwargs)
+                    await pages.put(response["Items"])
+                    last_key = response.get("LastEvaluatedKey")
+                    if not last_key:
+                        break
+                    segment_kwargs["ExclusiveStartKey"] = last_key
+            except Exception as err:
+                # ClientError / BotoCoreError 以外でも終了通知を送らないと消費側が待ち続けるため、同じ経路で伝える
+                await pages.put(_SegmentFailed(segment=segment, error=err))
+                return
+        await pages.put(_SegmentDone(segment=segment))
+
+    workers = [asyncio.create_task(scan_segment(segment)) for segment in range(total_segments)]
+    try:
+        remaining = total_segments
+        while remaining:
+            message = await pages.get()
+            if isinstance(message, _SegmentDone):
+                remaining -= 1
+            elif isinstance(message, _SegmentFailed):
+                if isinstance(message.error, RepositoryError):
+                    raise message.error
+                raise RepositoryError(
+                    message=f"Failed to scan segment {message.segment}/{total_segments}: {message.error}",
+                    operation="parallel_scan",
+                ) from message.error
+            else:
+                for item in message:
+                    yield item
+    finally:
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
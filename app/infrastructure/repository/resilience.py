@@ -0,0 +1,133 @@
+import time
+from collections.abc import Awaitable, Callable, Mapping
+from typing import Any
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+from app.core.circuit_breaker import CircuitBreaker, CircuitState
+from app.core.exceptions import RepositoryUnavailableError
+from app.core.metrics import dynamodb_circuit_rejections_total, dynamodb_circuit_state, dynamodb_retries_total
+from app.infrastructure.constants import SERVER_ERROR_CODES, THROTTLE_RETRY_AFTER_SECONDS, THROTTLING_ERROR_CODES
+
+
+def _error_code(err: BaseException) -> str | None:
+    if isinstance(err, ClientError):
+        return err.response.get("Error", {}).get("Code")
+    return None
+
+
+def is_throttling(err: BaseException) -> bool:
+    return _error_code(err) in THROTTLING_ERROR_CODES
+
+
+def is_degraded(err: BaseException) -> bool:
+    """DynamoDB 側の不調を示すエラーか。ValidationException などリクエスト自体の誤りは含めない。"""
+    if isinstance(err, BotoCoreError):
+        return True
+    code = _error_code(err)
+    return code in THROTTLING_ERROR_CODES or code in SERVER_ERROR_CODES
+
+
+def _count_retries(operation: str, response: Any) -> None:
+    # botocore が再試行した回数はレスポンス (エラー時は ClientError.response) の RetryAttempts に入る
+    if not isinstance(response, Mapping):
+        return
+    metadata: Mapping[str, Any] = response.get("ResponseMetadata") or {}
+    attempts = metadata.get("RetryAttempts", 0)
+    if attempts:
+        dynamodb_retries_total.inc(operation, amount=attempts)
+
+
+class OperationGuard:
+    """DynamoDB の呼び出しを操作ごとのサーキットブレーカーで包む。
+
+    再試行はここでは行わず、client の botocore (DYNAMODB_RETRY_MODE / DYNAMODB_MAX_ATTEMPTS) に任せる。
+    botocore が再試行を使い切ったスロットリングは RepositoryUnavailableError (503) にする。
+    不調を示すエラーが続いた操作はブレーカーが open になり、reset_timeout_seconds の間は
+    DynamoDB を呼ばずに RepositoryUnavailableError を返す。
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout_seconds: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._failure_threshold = failure_threshold
+        self._reset_timeout_seconds = reset_timeout_seconds
+        self._clock = clock
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def breaker(self, operation: str) -> CircuitBreaker:
+        breaker = self._breakers.get(operation)
+        if breaker is None:
+
+            def on_state_change(state: CircuitState) -> None:
+                dynamodb_circuit_state.set(state, operation)
+
+            breaker = CircuitBreaker(
+                failure_threshold=self._failure_threshold,
+                reset_timeout_seconds=self._reset_timeout_seconds,
+                clock=self._clock,
+                on_state_change=on_state_change,
+            )
+            self._breakers[operation] = breaker
+            dynamodb_circuit_state.set(breaker.state, operation)
+        return breaker
+
+    async def call[T](self, operation: str, fn: Callable[[], Awaitable[T]], key: object | None = None) -> T:
+        """fn を呼ぶ。key が同じ呼び出しは half-open の間も同じ trial として通す。"""
+        breaker = self.breaker(operation)
+        if not breaker.try_acquire(key):
+            dynamodb_circuit_rejections_total.inc(operation)
+            raise RepositoryUnavailableError(
+                message="Circuit breaker is open",
+                operation=operation,
+                retry_after=breaker.retry_after() or self._reset_timeout_seconds,
+            )
+        try:
+            result = await fn()
+        except ClientError as err:
+            _count_retries(operation, err.response)
+            if not is_degraded(err):
+                breaker.record_success()
+                raise
+            breaker.record_failure()
+            if is_throttling(err):
+                raise RepositoryUnavailableError(
+                    message=f"Throttled: {err}",
+                    operation=operation,
+                    retry_after=THROTTLE_RETRY_AFTER_SECONDS,
+                ) from err
+            raise
+        except BotoCoreError:
+            breaker.record_failure()
+            raise
+        except BaseException:
+            # キャンセルなど DynamoDB の状態と関係なく終わった場合は、成否に数えず half-open の枠だけ返す
+            breaker.release(key)
+            raise
+        breaker.record_success()
+        _count_retries(operation, result)
+        return result
+
+
+class GuardedClient:
+    """低レベル client のメソッド呼び出しを OperationGuard.call に通す薄いラッパー。
+
+    リポジトリの各メソッドは、この client を自分の操作名で 1 回の呼び出しにつき 1 つ作って使う。
+    この client 経由の呼び出し (並行する Query やバッチのチャンク) は half-open で 1 つの trial として扱う。
+    """
+
+    def __init__(self, client: Any, guard: OperationGuard, operation: str) -> None:
+        self._client = client
+        self._guard = guard
+        self._operation = operation
+
+    def __getattr__(self, name: str) -> Any:
+        method = getattr(self._client, name)
+
+        async def guarded(**kwargs: Any) -> Any:
+            return await self._guard.call(self._operation, lambda: method(**kwargs), key=self)
+
+        return guarded
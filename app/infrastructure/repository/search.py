@@ -0,0 +1,29 @@
+import unicodedata
+from typing import Any
+
+from app.domain.user.entity import User
+from app.infrastructure.constants import ATTR_NAME_NORMALIZED, ATTR_NAME_PREFIX_BUCKET
+
+
+def intersect_by_user_id(results: list[list[User]]) -> list[User]:
+    """複数のインデックス検索結果のうち、全てに含まれる User を先頭の結果の順で返す。"""
+    if not results:
+        return []
+    first, *rest = results
+    common = {user.user_id for user in first}
+    for users in rest:
+        common &= {user.user_id for user in users}
+    return [user for user in first if user.user_id in common]
+
+
+def normalize_name(name: str) -> str:
+    """前方一致検索用に name を正規化する。全角・半角や大文字・小文字の違いを吸収する。"""
+    return unicodedata.normalize("NFKC", name).casefold()
+
+
+def name_prefix_attributes(name: str) -> dict[str, Any]:
+    """name-prefix-index のキーになる派生属性を返す。正規化後に空になる name には付けない (インデックスに載せない)。"""
+    normalized = normalize_name(name)
+    if not normalized:
+        return {}
+    return {ATTR_NAME_PREFIX_BUCKET: normalized[0], ATTR_NAME_NORMALIZED: normalized}
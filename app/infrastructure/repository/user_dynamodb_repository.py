@@ -1,70 +1,346 @@
+from collections.abc import AsyncIterator, Sequence
 from typing import Any
 
-from boto3.dynamodb.conditions import Key
 from botocore.exceptions import BotoCoreError, ClientError
 
 from app.core.decorators import log_action
-from app.core.exceptions import RepositoryError
+from app.core.exceptions import InvalidCursorError, PartialWriteError, RepositoryError
 from app.core.types import UserId
-from app.domain.user.entity import User
+from app.domain.user.entity import SearchCondition, User, UserPage, UserSearchPlan
 from app.domain.user.i_user_repository import IUserRepository
-from app.infrastructure.constants import ATTR_USER_ID, INDEX_EMAIL, INDEX_NAME
+from app.infrastructure.constants import (
+    ATTR_EMAIL,
+    ATTR_NAME,
+    ATTR_NAME_NORMALIZED,
+    ATTR_NAME_PREFIX_BUCKET,
+    ATTR_USER_ID,
+    BATCH_GET_MAX_KEYS,
+    BATCH_WRITE_MAX_ITEMS,
+    INDEX_BY_ATTRIBUTE,
+    INDEX_EMAIL,
+    INDEX_NAME,
+    INDEX_NAME_PREFIX,
+)
+from app.infrastructure.datasource.dynamodb import DynamoDBClientManager, deserialize_item, serialize_item
+from app.infrastructure.repository.batch import (
+    UnprocessedItemsError,
+    call_with_unprocessed_retry,
+    chunked,
+    run_concurrently,
+)
+from app.infrastructure.repository.cursor import decode_cursor, encode_cursor
+from app.infrastructure.repository.parallel_scan import parallel_scan
+from app.infrastructure.repository.resilience import GuardedClient, OperationGuard
+from app.infrastructure.repository.search import intersect_by_user_id, name_prefix_attributes, normalize_name
 
 
 class UserDynamoDBRepository(IUserRepository):
-    def __init__(self, table: Any) -> None:
-        self._table = table
+    def __init__(
+        self,
+        client_manager: DynamoDBClientManager,
+        table_name: str,
+        scan_segments: int = 1,
+        scan_max_workers: int = 1,
+        guard: OperationGuard | None = None,
+    ) -> None:
+        self._client_manager = client_manager
+        self._table_name = table_name
+        self._scan_segments = scan_segments
+        self._scan_max_workers = scan_max_workers
+        self._guard = guard if guard is not None else OperationGuard()
 
     @log_action()
-    def save(self, user: User) -> None:
+    async def save(self, user: User) -> None:
         try:
-            self._table.put_item(Item=user.model_dump())
+            client = await self._client("save")
+            await client.put_item(TableName=self._table_name, Item=self._to_item(user))
         except (ClientError, BotoCoreError) as err:
             raise RepositoryError(message=f"Failed to save user: {err}", operation="save") from err
 
     @log_action()
-    def find_by_id(self, user_id: UserId) -> User | None:
+    async def save_many(self, users: list[User]) -> None:
+        """users を BatchWriteItem で書き込む。
+
+        チャンクが 1 つでも失敗したら残りのチャンクを止める。その時点で書き込みが確定した User があれば
+        PartialWriteError (written_ids 付き) を、なければ元のエラーを RepositoryError として送出する。
+        """
+        if not users:
+            return
+        written: list[UserId] = []
+        try:
+            client = await self._client("save_many")
+
+            async def batch_write(request_items: dict[str, Any]) -> dict[str, Any]:
+                return await client.batch_write_item(RequestItems=request_items)
+
+            async def write_chunk(chunk: Sequence[User]) -> None:
+                try:
+                    await call_with_unprocessed_retry(
+                        call=batch_write,
+                        request_items={
+                            self._table_name: [{"PutRequest": {"Item": self._to_item(user)}} for user in chunk]
+                        },
+                        unprocessed_key="UnprocessedItems",
+                        operation="save_many",
+                    )
+                except UnprocessedItemsError as err:
+                    unprocessed = {
+                        deserialize_item(request["PutRequest"]["Item"])[ATTR_USER_ID]
+                        for request in err.unprocessed.get(self._table_name, [])
+                    }
+                    written.extend(user.user_id for user in chunk if user.user_id not in unprocessed)
+                    raise
+                written.extend(user.user_id for user in chunk)
+
+            # BatchWriteItem は 1 回 25 件までなので分割し、チャンク同士は並行に投げる
+            await run_concurrently(write_chunk(chunk) for chunk in chunked(users, BATCH_WRITE_MAX_ITEMS))
+        except (RepositoryError, ClientError, BotoCoreError) as err:
+            if written:
+                raise PartialWriteError(
+                    message=f"Saved {len(written)} of {len(users)} users before failing: {err}",
+                    operation="save_many",
+                    written_ids=written,
+                ) from err
+            if isinstance(err, RepositoryError):
+                raise
+            raise RepositoryError(message=f"Failed to save users: {err}", operation="save_many") from err
+
+    @log_action()
+    async def find_by_id(self, user_id: UserId, fields: frozenset[str] | None = None) -> User | None:
+        get_kwargs: dict[str, Any] = {
+            "TableName": self._table_name,
+            "Key": serialize_item({ATTR_USER_ID: user_id}),
+        }
+        self._apply_projection(get_kwargs, fields)
         try:
-            response = self._table.get_item(Key={ATTR_USER_ID: user_id})
+            client = await self._client("find_by_id")
+            response = await client.get_item(**get_kwargs)
         except (ClientError, BotoCoreError) as err:
             raise RepositoryError(message=f"Failed to find user: {err}", operation="find_by_id") from err
         item = response.get("Item")
         if not item:
             return None
-        return User(**item)
+        return self._to_user(item, fields)
 
     @log_action()
-    def find_all(self) -> list[User]:
+    async def find_by_ids(self, user_ids: list[UserId]) -> list[User]:
+        unique_ids = list(dict.fromkeys(user_ids))
+        if not unique_ids:
+            return []
         try:
-            response = self._table.scan()
+            client = await self._client("find_by_ids")
+
+            async def batch_get(request_items: dict[str, Any]) -> dict[str, Any]:
+                return await client.batch_get_item(RequestItems=request_items)
+
+            # BatchGetItem は 1 回 100 キーまでなので分割し、チャンク同士は並行に投げる
+            chunk_responses = await run_concurrently(
+                call_with_unprocessed_retry(
+                    call=batch_get,
+                    request_items={self._table_name: {"Keys": [serialize_item({ATTR_USER_ID: uid}) for uid in chunk]}},
+                    unprocessed_key="UnprocessedKeys",
+                    operation="find_by_ids",
+                )
+                for chunk in chunked(unique_ids, BATCH_GET_MAX_KEYS)
+            )
         except (ClientError, BotoCoreError) as err:
-            raise RepositoryError(message=f"Failed to list users: {err}", operation="find_all") from err
-        return [User(**item) for item in response["Items"]]
+            raise RepositoryError(message=f"Failed to batch get users: {err}", operation="find_by_ids") from err
+        return [
+            User(**deserialize_item(item))
+            for responses in chunk_responses
+            for response in responses
+            for item in response.get("Responses", {}).get(self._table_name, [])
+        ]
 
     @log_action()
-    def search_by_name(self, name: str) -> list[User]:
+    async def find_all(self, fields: frozenset[str] | None = None) -> list[User]:
+        return [user async for user in self._iter_users(fields)]
+
+    async def iter_all(self) -> AsyncIterator[User]:
+        """テーブル全件をストリームで返す。scan_segments > 1 なら並列セグメント Scan を使う。"""
+        async for user in self._iter_users():
+            yield user
+
+    async def _iter_users(self, fields: frozenset[str] | None = None) -> AsyncIterator[User]:
+        projection: dict[str, Any] = {}
+        self._apply_projection(projection, fields)
+        if self._scan_segments > 1:
+            client = await self._client("find_all")
+            async for item in parallel_scan(
+                client=client,
+                table_name=self._table_name,
+                total_segments=self._scan_segments,
+                max_workers=self._scan_max_workers,
+                scan_kwargs=projection,
+            ):
+                yield self._to_user(item, fields)
+            return
+
+        scan_kwargs: dict[str, Any] = {"TableName": self._table_name, **projection}
+        while True:
+            try:
+                client = await self._client("find_all")
+                response = await client.scan(**scan_kwargs)
+            except (ClientError, BotoCoreError) as err:
+                raise RepositoryError(message=f"Failed to list users: {err}", operation="find_all") from err
+            for item in response["Items"]:
+                yield self._to_user(item, fields)
+            last_key = response.get("LastEvaluatedKey")
+            if not last_key:
+                return
+            scan_kwargs["ExclusiveStartKey"] = last_key
+
+    @log_action()
+    async def find_page(self, limit: int, cursor: str | None = None, fields: frozenset[str] | None = None) -> UserPage:
+        scan_kwargs: dict[str, Any] = {"TableName": self._table_name, "Limit": limit}
+        self._apply_projection(scan_kwargs, fields)
+        if cursor:
+            start_key = decode_cursor(cursor)
+            if set(start_key) != {ATTR_USER_ID} or not isinstance(start_key[ATTR_USER_ID], str):
+                raise InvalidCursorError(cursor)
+            scan_kwargs["ExclusiveStartKey"] = serialize_item(start_key)
         try:
-            response = self._table.query(
-                IndexName=INDEX_NAME,
-                KeyConditionExpression=Key("name").eq(name),
-            )
+            client = await self._client("find_page")
+            response = await client.scan(**scan_kwargs)
+        except (ClientError, BotoCoreError) as err:
+            raise RepositoryError(message=f"Failed to list users: {err}", operation="find_page") from err
+        last_key = response.get("LastEvaluatedKey")
+        return UserPage(
+            items=[self._to_user(item, fields) for item in response["Items"]],
+            next_cursor=encode_cursor(deserialize_item(last_key)) if last_key else None,
+        )
+
+    @log_action()
+    async def search_by_name(self, name: str) -> list[User]:
+        try:
+            client = await self._client("search_by_name")
+            items = await self._query_index(client, INDEX_NAME, ATTR_NAME, name)
         except (ClientError, BotoCoreError) as err:
             raise RepositoryError(
                 message=f"Failed to search by name: {err}",
                 operation="search_by_name",
             ) from err
-        return [User(**item) for item in response["Items"]]
+        return [User(**deserialize_item(item)) for item in items]
 
     @log_action()
-    def search_by_email(self, email: str) -> list[User]:
+    async def search_by_email(self, email: str) -> list[User]:
         try:
-            response = self._table.query(
-                IndexName=INDEX_EMAIL,
-                KeyConditionExpression=Key("email").eq(email),
-            )
+            client = await self._client("search_by_email")
+            items = await self._query_index(client, INDEX_EMAIL, ATTR_EMAIL, email)
         except (ClientError, BotoCoreError) as err:
             raise RepositoryError(
                 message=f"Failed to search by email: {err}",
                 operation="search_by_email",
             ) from err
-        return [User(**item) for item in response["Items"]]
+        return [User(**deserialize_item(item)) for item in items]
+
+    @log_action()
+    async def search_by_name_prefix(self, prefix: str, limit: int, fields: frozenset[str] | None = None) -> list[User]:
+        normalized = normalize_name(prefix)
+        if not normalized:
+            return []
+        query_kwargs: dict[str, Any] = {
+            "TableName": self._table_name,
+            "IndexName": INDEX_NAME_PREFIX,
+            "KeyConditionExpression": "#bucket = :bucket AND begins_with(#normalized, :prefix)",
+            "ExpressionAttributeNames": {"#bucket": ATTR_NAME_PREFIX_BUCKET, "#normalized": ATTR_NAME_NORMALIZED},
+            "ExpressionAttributeValues": {":bucket": {"S": normalized[0]}, ":prefix": {"S": normalized}},
+            # Limit で読み取り件数そのものを抑えるので、続きのページは読まない
+            "Limit": limit,
+        }
+        self._apply_projection(query_kwargs, fields)
+        try:
+            client = await self._client("search_by_name_prefix")
+            response = await client.query(**query_kwargs)
+        except (ClientError, BotoCoreError) as err:
+            raise RepositoryError(
+                message=f"Failed to search by name prefix: {err}",
+                operation="search_by_name_prefix",
+            ) from err
+        return [self._to_user(item, fields) for item in response["Items"]]
+
+    @log_action()
+    async def search(self, plan: UserSearchPlan, fields: frozenset[str] | None = None) -> list[User]:
+        for condition in plan.index_conditions:
+            if condition.attribute not in INDEX_BY_ATTRIBUTE:
+                raise RepositoryError(message=f"No index for attribute: {condition.attribute}", operation="search")
+        try:
+            # 並行に引く Query が half-open で 1 つの trial として扱われるよう、client は 1 つを共有する
+            client = await self._client("search")
+            # 複数のインデックスは並行に引くので、待ち時間は各クエリの合計ではなく最大になる
+            results = await run_concurrently(
+                self._query_index(
+                    client,
+                    INDEX_BY_ATTRIBUTE[condition.attribute],
+                    condition.attribute,
+                    condition.value,
+                    plan.filter_conditions,
+                    fields,
+                )
+                for condition in plan.index_conditions
+            )
+        except (ClientError, BotoCoreError) as err:
+            raise RepositoryError(message=f"Failed to search users: {err}", operation="search") from err
+        return intersect_by_user_id([[self._to_user(item, fields) for item in items] for items in results])
+
+    async def _client(self, operation: str) -> GuardedClient:
+        """operation のブレーカーとスロットリングの再試行を通す client を返す。"""
+        return GuardedClient(await self._client_manager.get_client(), self._guard, operation)
+
+    @staticmethod
+    def _to_item(user: User) -> dict[str, Any]:
+        """User を DynamoDB の項目に変換する。name-prefix-index 用の派生属性もここで付ける。"""
+        return serialize_item({**user.model_dump(), **name_prefix_attributes(user.name)})
+
+    @staticmethod
+    def _apply_projection(request: dict[str, Any], fields: frozenset[str] | None) -> None:
+        """fields を ProjectionExpression として request に足す。user_id は結果の突き合わせに使うので常に読む。"""
+        if fields is None:
+            return
+        names: dict[str, str] = request.setdefault("ExpressionAttributeNames", {})
+        placeholders: list[str] = []
+        for i, field in enumerate(sorted(fields | {ATTR_USER_ID})):
+            names[f"#p{i}"] = field
+            placeholders.append(f"#p{i}")
+        request["ProjectionExpression"] = ", ".join(placeholders)
+
+    @staticmethod
+    def _to_user(item: dict[str, Any], fields: frozenset[str] | None) -> User:
+        data = deserialize_item(item)
+        return User(**data) if fields is None else User.from_projection(data)
+
+    async def _query_index(
+        self,
+        client: GuardedClient,
+        index_name: str,
+        attribute: str,
+        value: str,
+        filters: tuple[SearchCondition, ...] = (),
+        fields: frozenset[str] | None = None,
+    ) -> list[dict[str, Any]]:
+        # name は DynamoDB の予約語なので属性名は ExpressionAttributeNames 経由で渡す
+        query_kwargs: dict[str, Any] = {
+            "TableName": self._table_name,
+            "IndexName": index_name,
+            "KeyConditionExpression": "#key = :value",
+            "ExpressionAttributeNames": {"#key": attribute},
+            "ExpressionAttributeValues": {":value": {"S": value}},
+        }
+        if filters:
+            # インデックスで引いた後の絞り込みは DynamoDB 側で行い、条件に合わない項目を転送させない
+            for i, condition in enumerate(filters):
+                query_kwargs["ExpressionAttributeNames"][f"#f{i}"] = condition.attribute
+                query_kwargs["ExpressionAttributeValues"][f":f{i}"] = {"S": condition.value}
+            query_kwargs["FilterExpression"] = " AND ".join(f"#f{i} = :f{i}" for i in range(len(filters)))
+        # FilterExpression は射影前の項目に対して評価されるので、絞り込む属性を fields に含める必要はない
+        self._apply_projection(query_kwargs, fields)
+
+        items: list[dict[str, Any]] = []
+        while True:
+            response = await client.query(**query_kwargs)
+            items.extend(response["Items"])
+            # FilterExpression は 1 ページ分を読んだ後に適用されるので、空のページでも続きがありうる
+            last_key = response.get("LastEvaluatedKey")
+            if not last_key:
+                return items
+            query_kwargs["ExclusiveStartKey"] = last_key
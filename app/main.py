@@ -1,25 +1,70 @@
+import asyncio
+import contextlib
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 from app.api.v1.router import v1_router
+from app.core.config import settings
+from app.core.constants import MEDIA_TYPE_PROMETHEUS
 from app.core.exception_handlers import register_exception_handlers
-from app.core.logger import setup_logging
-from app.infrastructure.datasource.dynamodb import create_users_table
+from app.core.logger import setup_logging, shutdown_logging
+from app.core.metrics import registry
+from app.infrastructure.datasource.bootstrap import bootstrap_dynamodb_with_retry, shutdown_dynamodb
+from app.middleware.compression_middleware import CompressionMiddleware
 from app.middleware.logging_middleware import LoggingMiddleware
+from app.middleware.metrics_middleware import MetricsMiddleware
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     setup_logging()
-    create_users_table()
+    bootstrap: asyncio.Task[None] | None = None
+    if settings.user_repository_backend == "dynamodb":
+        startup = bootstrap_dynamodb_with_retry(
+            max_attempts=settings.bootstrap_max_attempts,
+            base_delay=settings.bootstrap_retry_base_delay_seconds,
+            max_delay=settings.bootstrap_retry_max_delay_seconds,
+        )
+        if settings.fast_start_enabled:
+            # 起動処理の完了を待たずにリクエストを受け付ける。完了までは /ready が 503 を返す
+            bootstrap = asyncio.create_task(startup)
+        else:
+            await startup
+    app.state.bootstrap = bootstrap
     yield
+    if bootstrap is not None:
+        bootstrap.cancel()
+        with contextlib.suppress(asyncio.CancelledError, Exception):
+            await bootstrap
+    if settings.user_repository_backend == "dynamodb":
+        await shutdown_dynamodb()
+    shutdown_logging()
+
+
+def _readiness(bootstrap: asyncio.Task[None] | None) -> str:
+    if bootstrap is None:
+        return "ready"
+    if not bootstrap.done():
+        return "starting"
+    if bootstrap.cancelled() or bootstrap.exception() is not None:
+        return "failed"
+    return "ready"
 
 
 def create_app() -> FastAPI:
     app = FastAPI(title="User API", lifespan=lifespan)
+    if settings.compression_enabled:
+        # メトリクスのレイテンシに圧縮の時間も含めるため、最も内側に置く
+        app.add_middleware(
+            CompressionMiddleware,  # type: ignore[arg-type]
+            minimum_size=settings.compression_minimum_size,
+            gzip_level=settings.compression_gzip_level,
+        )
+    app.add_middleware(MetricsMiddleware)  # type: ignore[arg-type]
     app.add_middleware(LoggingMiddleware)  # type: ignore[arg-type]
     app.add_middleware(
         CORSMiddleware,  # ty: ignore[invalid-argument-type]
@@ -32,8 +77,22 @@ def create_app() -> FastAPI:
     app.include_router(v1_router)
 
     @app.get("/health")
-    def health() -> dict[str, str]:
-        return {"status": "ok"}
+    async def health(request: Request) -> JSONResponse:
+        # 起動処理が再試行を使い切った場合だけ生存確認も失敗させ、オーケストレーターにプロセスを再起動させる
+        if _readiness(getattr(request.app.state, "bootstrap", None)) == "failed":
+            return JSONResponse({"status": "failed"}, status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+        return JSONResponse({"status": "ok"})
+
+    @app.get("/ready")
+    async def ready(request: Request) -> JSONResponse:
+        # /health はプロセスの生存だけを返し、依存先の準備ができたかはこちらで返す
+        readiness = _readiness(getattr(request.app.state, "bootstrap", None))
+        status_code = status.HTTP_200_OK if readiness == "ready" else status.HTTP_503_SERVICE_UNAVAILABLE
+        return JSONResponse({"status": readiness}, status_code=status_code)
+
+    @app.get("/metrics", response_class=PlainTextResponse)
+    async def metrics() -> PlainTextResponse:
+        return PlainTextResponse(registry.render(), media_type=MEDIA_TYPE_PROMETHEUS)
 
     return app
 
@@ -0,0 +1,237 @@
+import functools
+import importlib
+import zlib
+from collections.abc import Callable
+from types import ModuleType
+from typing import Protocol
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.constants import (
+    BROTLI_QUALITY,
+    COMPRESSIBLE_MEDIA_TYPES,
+    ENCODING_BROTLI,
+    ENCODING_GZIP,
+    ENCODING_ZSTD,
+    HEADER_ACCEPT_ENCODING,
+    HEADER_CONTENT_ENCODING,
+    HEADER_CONTENT_LENGTH,
+    HEADER_CONTENT_TYPE,
+    HEADER_ETAG,
+    ZSTD_LEVEL,
+)
+
+# zlib で gzip 形式 (ヘッダーとトレーラー付き) を出すための wbits
+_GZIP_WBITS = 16 + zlib.MAX_WBITS
+_NOT_MODIFIED = 304
+_NO_BODY_STATUSES = frozenset({204, _NOT_MODIFIED})
+
+
+class _Encoder(Protocol):
+    def compress(self, data: bytes, finish: bool) -> bytes: ...
+
+
+class _GzipEncoder:
+    def __init__(self, level: int) -> None:
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, _GZIP_WBITS)
+
+    def compress(self, data: bytes, finish: bool) -> bytes:
+        # 途中のチャンクは Z_SYNC_FLUSH で区切り、ストリーミングでもクライアントがすぐに伸長できるようにする
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_FINISH if finish else zlib.Z_SYNC_FLUSH)
+
+
+class _BrotliEncoder:
+    def __init__(self, module: ModuleType) -> None:
+        self._compressor = module.Compressor(quality=BROTLI_QUALITY)
+
+    def compress(self, data: bytes, finish: bool) -> bytes:
+        return self._compressor.process(data) + (self._compressor.finish() if finish else self._compressor.flush())
+
+
+class _ZstdEncoder:
+    def __init__(self, module: ModuleType) -> None:
+        self._module = module
+        self._compressor = module.ZstdCompressor(level=ZSTD_LEVEL)
+
+    def compress(self, data: bytes, finish: bool) -> bytes:
+        compressor_type = self._module.ZstdCompressor
+        return self._compressor.compress(data, compressor_type.FLUSH_FRAME if finish else compressor_type.FLUSH_BLOCK)
+
+
+def _import_optional(name: str) -> ModuleType | None:
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+def available_encoders(gzip_level: int) -> dict[str, Callable[[], _Encoder]]:
+    """この実行環境で使える圧縮方式を優先順に返す。
+
+    gzip は常に使える。br は brotli パッケージ、zstd は Python 3.14 以降の compression.zstd があれば有効になる。
+    """
+    encoders: dict[str, Callable[[], _Encoder]] = {}
+    brotli = _import_optional("brotli")
+    if brotli is not None:
+        encoders[ENCODING_BROTLI] = lambda: _BrotliEncoder(brotli)
+    zstd = _import_optional("compression.zstd")
+    if zstd is not None:
+        encoders[ENCODING_ZSTD] = lambda: _ZstdEncoder(zstd)
+    encoders[ENCODING_GZIP] = lambda: _GzipEncoder(gzip_level)
+    return encoders
+
+
+@functools.lru_cache(maxsize=64)
+def select_encoding(accept_encoding: str, available: tuple[str, ...]) -> str | None:
+    """Accept-Encoding から q 値が最も高い圧縮方式を選ぶ。同じ q 値なら available の順を優先する。
+
+    q=0 の方式は使わない。* は明示されていない方式すべてに当たる。クライアントが送る値の種類は
+    限られるので、結果をキャッシュしてリクエストごとの解析を省く。
+    """
+    preferences: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        preferences[coding] = quality
+    wildcard = preferences.get("*", 0.0)
+    selected: str | None = None
+    selected_quality = 0.0
+    for coding in available:
+        quality = preferences.get(coding, wildcard)
+        if quality > selected_quality:
+            selected, selected_quality = coding, quality
+    return selected
+
+
+def _weaken_etag(headers: MutableHeaders) -> None:
+    etag = headers.get(HEADER_ETAG)
+    if etag is not None and not etag.startswith("W/"):
+        headers[HEADER_ETAG] = "W/" + etag
+
+
+class _CompressingSend:
+    """レスポンスを必要に応じて圧縮しながら send に流す。
+
+    ボディが minimum_size に達するまではバッファし、達しないまま終われば圧縮せずに返す。
+    達した後はチャンクごとに圧縮して送るので、StreamingResponse もバッファせずに流れる。
+
+    圧縮対象の種類のレスポンスと 304 には、圧縮したかどうかに関わらず Vary: Accept-Encoding を付ける。
+    圧縮方式が決まったリクエストでは ETag も常に弱くする。同じリクエストに対する 200 と 304 が
+    同じ ETag と Vary を持つので (RFC 9110 15.4.5)、共有キャッシュが再検証で validator を取り違えない。
+    """
+
+    def __init__(
+        self,
+        send: Send,
+        encoding: str | None,
+        encoder_factory: Callable[[], _Encoder] | None,
+        minimum_size: int,
+    ) -> None:
+        self._send = send
+        self._encoding = encoding
+        self._encoder_factory = encoder_factory
+        self._minimum_size = minimum_size
+        self._start: Message | None = None
+        self._passthrough = False
+        self._buffer: list[bytes] = []
+        self._buffered = 0
+        self._encoder: _Encoder | None = None
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self._start = message
+            headers = MutableHeaders(scope=message)
+            status = message["status"]
+            negotiable = HEADER_CONTENT_ENCODING not in headers and (
+                status == _NOT_MODIFIED or headers.get(HEADER_CONTENT_TYPE, "").startswith(COMPRESSIBLE_MEDIA_TYPES)
+            )
+            if negotiable:
+                headers.add_vary_header(HEADER_ACCEPT_ENCODING)
+                if self._encoding is not None:
+                    # 圧縮後のバイト列は元の ETag が指す表現と異なるので弱い ETag にする。
+                    # If-None-Match は弱い比較なので、クライアントが送り返せばそのまま 304 になる
+                    _weaken_etag(headers)
+            self._passthrough = not negotiable or status in _NO_BODY_STATUSES or self._encoding is None
+            if self._passthrough:
+                await self._send(message)
+            return
+        if self._passthrough or message["type"] != "http.response.body":
+            await self._send(message)
+            return
+        start, encoding, encoder_factory = self._start, self._encoding, self._encoder_factory
+        if start is None or encoding is None or encoder_factory is None:
+            # 開始メッセージより前のボディは ASGI 上ありえないが、来た場合は手を加えずに流す
+            await self._send(message)
+            return
+
+        body: bytes = message.get("body", b"")
+        more_body: bool = message.get("more_body", False)
+        if self._encoder is not None:
+            # 空のチャンクを圧縮すると同期フラッシュの数バイトだけが増えるので、途中の空チャンクは送らない
+            if body or not more_body:
+                await self._send(
+                    {
+                        "type": "http.response.body",
+                        "body": self._encoder.compress(body, finish=not more_body),
+                        "more_body": more_body,
+                    }
+                )
+            return
+
+        self._buffer.append(body)
+        self._buffered += len(body)
+        if more_body and self._buffered < self._minimum_size:
+            return
+        buffered = b"".join(self._buffer)
+        self._buffer.clear()
+        if not more_body and self._buffered < self._minimum_size:
+            await self._send(start)
+            await self._send({"type": "http.response.body", "body": buffered, "more_body": False})
+            return
+
+        self._encoder = encoder_factory()
+        compressed = self._encoder.compress(buffered, finish=not more_body)
+        headers = MutableHeaders(scope=start)
+        headers[HEADER_CONTENT_ENCODING] = encoding
+        if more_body:
+            del headers[HEADER_CONTENT_LENGTH]
+        else:
+            headers[HEADER_CONTENT_LENGTH] = str(len(compressed))
+        await self._send(start)
+        await self._send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+
+
+class CompressionMiddleware:
+    """Accept-Encoding に応じて、JSON / NDJSON / テキストのレスポンスを gzip などで圧縮する。
+
+    minimum_size 未満のボディ (/health や単一ユーザーなど) は圧縮しない。圧縮のコストに対して
+    転送量の削減がほとんどないため。LoggingMiddleware と同じく素の ASGI ミドルウェアで、
+    ストリーミングレスポンスはチャンクごとに圧縮して流す。
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6) -> None:
+        self.app = app
+        self._minimum_size = minimum_size
+        self._encoders = available_encoders(gzip_level)
+        self._available = tuple(self._encoders)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        accept_encoding = Headers(scope=scope).get(HEADER_ACCEPT_ENCODING)
+        encoding = select_encoding(accept_encoding, self._available) if accept_encoding else None
+        # 圧縮しない場合も Vary を付けるために send を包む
+        encoder_factory = self._encoders[encoding] if encoding is not None else None
+        await self.app(scope, receive, _CompressingSend(send, encoding, encoder_factory, self._minimum_size))
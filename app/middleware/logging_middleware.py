@@ -2,9 +2,8 @@ import time
 import uuid
 
 import structlog
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.constants import (
     HEADER_REQUEST_ID,
@@ -16,26 +15,45 @@ from app.core.constants import (
 logger = structlog.stdlib.get_logger()
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+class LoggingMiddleware:
+    """trace_id 等を contextvars にバインドし、リクエスト完了ログと X-Trace-ID ヘッダーを付与する。
+
+    BaseHTTPMiddleware を使わない素の ASGI ミドルウェアなので、リクエストごとのタスク生成や
+    レスポンスボディの中継が発生せず、StreamingResponse もそのまま流れる。
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         structlog.contextvars.clear_contextvars()
 
-        trace_id = request.headers.get(HEADER_REQUEST_ID, str(uuid.uuid4()))
+        trace_id = Headers(scope=scope).get(HEADER_REQUEST_ID) or str(uuid.uuid4())
         structlog.contextvars.bind_contextvars(
             trace_id=trace_id,
-            method=request.method,
-            path=str(request.url.path),
+            method=scope["method"],
+            path=scope["path"],
         )
 
+        status_code = 0
+
+        async def send_with_trace_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message)[HEADER_TRACE_ID] = trace_id
+            await send(message)
+
         start = time.perf_counter_ns()
-        response = await call_next(request)
+        await self.app(scope, receive, send_with_trace_id)
         duration_ms = (time.perf_counter_ns() - start) / NS_PER_MS
 
         logger.info(
             LOG_REQUEST_COMPLETED,
-            status_code=response.status_code,
+            status_code=status_code,
             duration_ms=round(duration_ms, 2),
         )
-
-        response.headers[HEADER_TRACE_ID] = trace_id
-        return response
@@ -0,0 +1,47 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.constants import METRIC_ROUTE_UNMATCHED
+from app.core.metrics import http_request_duration_seconds, http_requests_total
+
+
+def _route_template(scope: Scope) -> str:
+    # include_router したルートは prefix なしの APIRoute のまま scope["route"] に入るため、
+    # prefix 込みのテンプレートを持つ effective_route_context を優先する
+    context = scope.get("fastapi", {}).get("effective_route_context")
+    route = context if context is not None else scope.get("route")
+    return getattr(route, "path_format", None) or METRIC_ROUTE_UNMATCHED
+
+
+class MetricsMiddleware:
+    """リクエスト数とレイテンシをルートテンプレート・ステータスコード別に記録する。
+
+    ルートはルーターが scope に設定したルートの path_format を使うため、
+    /users/{user_id} のようなパスパラメータ単位で系列が増えることはない。
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            duration = time.perf_counter() - start
+            labels = (scope["method"], _route_template(scope), str(status_code))
+            http_requests_total.inc(*labels)
+            http_request_duration_seconds.observe(duration, *labels)
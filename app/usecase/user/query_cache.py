@@ -0,0 +1,74 @@
+import time
+from collections.abc import Awaitable, Callable, Hashable
+
+from app.core.cache import CacheStats, LRUTTLCache
+from app.core.constants import METRIC_CACHE_HIT, METRIC_CACHE_MISS
+from app.core.metrics import query_cache_invalidations_total, query_cache_lookups_total
+from app.domain.user.entity import User, UserPage
+
+type QueryKey = tuple[Hashable, ...]
+
+
+def _count_users(value: UserPage | list[User]) -> int:
+    # 空の結果も 1 件分として数え、件数上限とは別に重みが 0 のエントリが溜まらないようにする
+    return max(1, len(value.items) if isinstance(value, UserPage) else len(value))
+
+
+class UserQueryCache:
+    """一覧・検索の結果を、正規化したクエリと世代番号をキーにして保持する。
+
+    書き込みのたびに invalidate で世代を 1 つ進めるだけで、それ以前のエントリは二度と引かれなくなる (O(1))。
+    古い世代のエントリは LRU / TTL で追い出されるのを待つ。保持量は件数 (max_entries) と
+    User の件数の合計 (max_users) の両方で抑える。
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_users: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._generation = 0
+        self._cache: LRUTTLCache[QueryKey, UserPage | list[User]] = LRUTTLCache(
+            max_size=max_entries,
+            ttl_seconds=ttl_seconds,
+            clock=clock,
+            max_weight=max_users,
+            weigher=_count_users,
+        )
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._cache.stats
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        query_cache_invalidations_total.inc()
+
+    async def page(self, key: QueryKey, load: Callable[[], Awaitable[UserPage]]) -> UserPage:
+        cache_key = (self._generation, "page", *key)
+        cached = self._cache.get(cache_key)
+        if isinstance(cached, UserPage):
+            query_cache_lookups_total.inc("page", METRIC_CACHE_HIT)
+            return cached
+        query_cache_lookups_total.inc("page", METRIC_CACHE_MISS)
+        # 読み取り中に書き込みがあれば世代が進むので、読む前の世代のキーで保存して古い結果が残らないようにする
+        page = await load()
+        self._cache.set(cache_key, page)
+        return page
+
+    async def users(self, key: QueryKey, load: Callable[[], Awaitable[list[User]]]) -> list[User]:
+        cache_key = (self._generation, "search", *key)
+        cached = self._cache.get(cache_key)
+        if isinstance(cached, list):
+            query_cache_lookups_total.inc("search", METRIC_CACHE_HIT)
+            return cached
+        query_cache_lookups_total.inc("search", METRIC_CACHE_MISS)
+        users = await load()
+        self._cache.set(cache_key, users)
+        return users
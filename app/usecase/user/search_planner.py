@@ -0,0 +1,35 @@
+from typing import Literal
+
+from app.core.config import settings
+from app.core.constants import SEARCH_INDEX_PRIORITY
+from app.domain.user.entity import SearchCondition, UserSearchPlan
+
+type SearchStrategy = Literal["filter", "intersect"]
+
+
+def plan_user_search(
+    name: str | None,
+    email: str | None,
+    strategy: SearchStrategy = settings.search_strategy,
+) -> UserSearchPlan | None:
+    """検索条件から実行計画を作る。条件が一つもなければ None を返す (全件取得)。
+
+    strategy="filter" は最も絞り込みが強い条件だけをインデックスで引き、残りをフィルタ条件にする。
+    strategy="intersect" はインデックスのある条件を全て並行に引き、user_id で積集合を取る。
+    """
+    conditions = {
+        attribute: SearchCondition(attribute=attribute, value=value)
+        for attribute, value in (("name", name), ("email", email))
+        if value
+    }
+    if not conditions:
+        return None
+    indexed = [conditions.pop(attribute) for attribute in SEARCH_INDEX_PRIORITY if attribute in conditions]
+    if strategy == "filter":
+        indexed, remaining = indexed[:1], indexed[1:]
+    else:
+        remaining = []
+    return UserSearchPlan(
+        index_conditions=tuple(indexed),
+        filter_conditions=(*remaining, *conditions.values()),
+    )
@@ -1,50 +1,144 @@
+from collections.abc import AsyncIterator
+
+import structlog
 from injector import inject
 
+from app.core.constants import DEFAULT_NAME_PREFIX_LIMIT, LOG_SEARCH_PLAN
 from app.core.decorators import log_action
 from app.core.exceptions import UserNotFoundError
 from app.core.types import UserId
-from app.domain.user.entity import User
+from app.domain.user.entity import User, UserPage
 from app.domain.user.i_user_repository import IUserRepository
-from app.schemas.user import UserCreate, UserResponse
+from app.schemas.user import UserBatchResponse, UserCreate, UserResponse
+from app.usecase.user.query_cache import UserQueryCache
+from app.usecase.user.search_planner import plan_user_search
+
+logger = structlog.stdlib.get_logger(__name__)
 
 
 class UserService:
     @inject
-    def __init__(self, user_repository: IUserRepository) -> None:
+    def __init__(self, user_repository: IUserRepository, query_cache: UserQueryCache | None = None) -> None:
         self._user_repository = user_repository
+        self._query_cache = query_cache
 
     @log_action()
-    def create_user(self, user_create: UserCreate) -> UserResponse:
+    async def create_user(self, user_create: UserCreate) -> UserResponse:
         user = User.create(
             name=user_create.name,
             email=user_create.email,
             age=user_create.age,
             address=user_create.address,
         )
-        self._user_repository.save(user)
+        try:
+            await self._user_repository.save(user)
+        finally:
+            # 失敗しても書き込まれた可能性があるので無効にする。保存より前に進めると、その間の読み取りが
+            # 新しい世代に古い結果を残してしまう
+            self._invalidate_queries()
         return UserResponse.from_entity(user)
 
     @log_action()
-    def get_user(self, user_id: UserId) -> UserResponse:
-        user = self._user_repository.find_by_id(user_id)
+    async def create_users(self, user_creates: list[UserCreate]) -> list[UserResponse]:
+        users = [
+            User.create(
+                name=user_create.name,
+                email=user_create.email,
+                age=user_create.age,
+                address=user_create.address,
+            )
+            for user_create in user_creates
+        ]
+        try:
+            await self._user_repository.save_many(users)
+        finally:
+            self._invalidate_queries()
+        return [UserResponse.from_entity(user) for user in users]
+
+    @log_action()
+    async def get_user(self, user_id: UserId, fields: frozenset[str] | None = None) -> User:
+        """読み取り系はリポジトリで検証済みの User をそのまま返し、レスポンスへの変換は API 層で行う。
+
+        fields を指定すると、リポジトリはその属性だけを読み出す。一覧・検索も同じ。
+        """
+        user = await self._user_repository.find_by_id(user_id, fields=fields)
         if user is None:
             raise UserNotFoundError(user_id)
-        return UserResponse.from_entity(user)
+        return user
 
     @log_action()
-    def list_users(self) -> list[UserResponse]:
-        users = self._user_repository.find_all()
-        return [UserResponse.from_entity(user) for user in users]
+    async def get_users(self, user_ids: list[UserId]) -> UserBatchResponse:
+        """入力順を保ったまま返し、見つからなかった ID は missing に入れる。重複 ID は 1 件にまとめる。"""
+        unique_ids = list(dict.fromkeys(user_ids))
+        users = {user.user_id: user for user in await self._user_repository.find_by_ids(unique_ids)}
+        return UserBatchResponse(
+            items=[UserResponse.from_entity(users[user_id]) for user_id in unique_ids if user_id in users],
+            missing=[user_id for user_id in unique_ids if user_id not in users],
+        )
+
+    @log_action()
+    async def list_users(self, limit: int, cursor: str | None = None, fields: frozenset[str] | None = None) -> UserPage:
+        """query_cache があれば (limit, cursor, fields) ごとの結果をそこから返す。検索も同じ。"""
+
+        async def load() -> UserPage:
+            return await self._user_repository.find_page(limit=limit, cursor=cursor, fields=fields)
+
+        if self._query_cache is None:
+            return await load()
+        return await self._query_cache.page((limit, cursor, fields), load)
+
+    @log_action()
+    async def export_users(self) -> AsyncIterator[User]:
+        """全ユーザーを iter_all() から 1 件ずつ返す。全件をメモリに溜めない。"""
+        async for user in self._user_repository.iter_all():
+            yield user
 
     @log_action()
-    def search_users(self, name: str | None, email: str | None) -> list[UserResponse]:
-        if name and email:
-            users = self._user_repository.search_by_name(name)
-            users = [u for u in users if u.email == email]
-        elif name:
-            users = self._user_repository.search_by_name(name)
-        elif email:
-            users = self._user_repository.search_by_email(email)
+    async def search_users(
+        self,
+        name: str | None,
+        email: str | None,
+        name_prefix: str | None = None,
+        limit: int = DEFAULT_NAME_PREFIX_LIMIT,
+        fields: frozenset[str] | None = None,
+    ) -> list[User]:
+        """name_prefix を指定すると前方一致で最大 limit 件を引き、name / email はその結果への絞り込みになる。"""
+
+        async def load() -> list[User]:
+            return await self._search_users(name, email, name_prefix, limit, fields)
+
+        if self._query_cache is None:
+            return await load()
+        # limit が結果に効くのは前方一致のときだけなので、それ以外では同じキーにまとめる
+        key = (name, email, name_prefix, limit if name_prefix else None, fields)
+        return await self._query_cache.users(key, load)
+
+    async def _search_users(
+        self,
+        name: str | None,
+        email: str | None,
+        name_prefix: str | None,
+        limit: int,
+        fields: frozenset[str] | None,
+    ) -> list[User]:
+        plan = plan_user_search(name=name, email=email)
+        if name_prefix:
+            conditions = () if plan is None else (*plan.index_conditions, *plan.filter_conditions)
+            # 絞り込みはここで行うので、条件の属性も読み出す対象に含める
+            read_fields = None if fields is None else fields | {c.attribute for c in conditions}
+            users = await self._user_repository.search_by_name_prefix(name_prefix, limit, fields=read_fields)
+            users = [u for u in users if all(getattr(u, c.attribute) == c.value for c in conditions)]
+        elif plan is None:
+            users = await self._user_repository.find_all(fields=fields)
         else:
-            users = self._user_repository.find_all()
-        return [UserResponse.from_entity(user) for user in users]
+            logger.debug(
+                LOG_SEARCH_PLAN,
+                indexes=[condition.attribute for condition in plan.index_conditions],
+                filters=[condition.attribute for condition in plan.filter_conditions],
+            )
+            users = await self._user_repository.search(plan, fields=fields)
+        return users
+
+    def _invalidate_queries(self) -> None:
+        if self._query_cache is not None:
+            self._query_cache.invalidate()
@@ -0,0 +1,56 @@
+"""@log_action の 1 呼び出しあたりのオーバーヘッドを計測する。
+
+uv run python -m benchmarks.bench_log_action
+"""
+
+import logging
+import time
+from collections.abc import Callable
+
+import structlog
+
+from app.core.decorators import log_action
+
+ITERATIONS = 200_000
+
+
+def _configure(level: int) -> None:
+    # 出力先の I/O を除いた、デコレータ自身のコストだけを測る
+    structlog.configure(
+        processors=[structlog.processors.TimeStamper(fmt="iso"), structlog.processors.KeyValueRenderer()],
+        wrapper_class=structlog.make_filtering_bound_logger(level),
+        logger_factory=structlog.ReturnLoggerFactory(),
+        cache_logger_on_first_use=True,
+    )
+
+
+def _measure(fn: Callable[[str, int], int]) -> float:
+    start = time.perf_counter_ns()
+    for i in range(ITERATIONS):
+        fn("alice", i)
+    return (time.perf_counter_ns() - start) / ITERATIONS
+
+
+def _target(name: str, value: int) -> int:
+    return value
+
+
+def main() -> None:
+    # ロガーは初回使用時にキャッシュされるので、設定を切り替えるたびにデコレートし直す
+    cases: list[tuple[str, int, Callable[[], Callable[[str, int], int]]]] = [
+        ("plain", logging.INFO, lambda: _target),
+        ("log_action (INFO)", logging.INFO, lambda: log_action(action_name="bench")(_target)),
+        ("log_action (WARNING, 無効レベル)", logging.WARNING, lambda: log_action(action_name="bench")(_target)),
+        (
+            "log_action (INFO, sample_rate=0.01)",
+            logging.INFO,
+            lambda: log_action(action_name="bench", sample_rate=0.01)(_target),
+        ),
+    ]
+    for label, level, factory in cases:
+        _configure(level)
+        print(f"{label:<40} {_measure(factory()):>10.1f} ns/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""同期 StreamHandler と非同期キューパイプラインで、ログ 1 行あたりの呼び出し側コストを比べる。
+
+uv run python -m benchmarks.bench_log_pipeline 2> /dev/null
+"""
+
+import logging
+import sys
+import time
+
+import structlog
+
+from app.core.logger import get_log_pipeline, setup_logging, shutdown_logging
+
+ITERATIONS = 50_000
+
+
+def _measure(async_logs: bool) -> tuple[float, float]:
+    setup_logging(json_logs=True, log_level="INFO", async_logs=async_logs)
+    logger = structlog.stdlib.get_logger("bench")
+    latencies: list[int] = []
+    for i in range(ITERATIONS):
+        start = time.perf_counter_ns()
+        logger.info("bench_event", index=i, user_id="u-1")
+        latencies.append(time.perf_counter_ns() - start)
+    pipeline = get_log_pipeline()
+    dropped = pipeline.stats.dropped if pipeline is not None else 0
+    shutdown_logging()
+    latencies.sort()
+    if dropped:
+        print(f"dropped={dropped}", file=sys.stderr)
+    return sum(latencies) / len(latencies), latencies[int(len(latencies) * 0.99)]
+
+
+def main() -> None:
+    # ログ本体は stderr に出るので、結果は stdout 側に書く
+    for label, async_logs in [("sync StreamHandler", False), ("async queue pipeline", True)]:
+        mean, p99 = _measure(async_logs)
+        print(f"{label:<24} mean={mean / 1000:>8.2f} us  p99={p99 / 1000:>8.2f} us", file=sys.__stdout__)
+    logging.shutdown()
+
+
+if __name__ == "__main__":
+    main()
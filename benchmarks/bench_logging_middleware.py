@@ -0,0 +1,83 @@
+"""BaseHTTPMiddleware 版と素の ASGI 版 LoggingMiddleware のスループットを比べる。
+
+ミドルウェアのコストだけを見るため、DynamoDB を使わない固定レスポンスのルートを
+/health と /users/{user_id} に置き、httpx の ASGITransport 経由で直接叩く。
+
+    uv run python -m benchmarks.bench_logging_middleware
+"""
+
+import asyncio
+import time
+import uuid
+
+import httpx
+import structlog
+from fastapi import FastAPI
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.core.constants import HEADER_REQUEST_ID, HEADER_TRACE_ID, LOG_REQUEST_COMPLETED, NS_PER_MS
+from app.middleware.logging_middleware import LoggingMiddleware
+
+REQUESTS = 5_000
+
+logger = structlog.stdlib.get_logger()
+
+
+class BaseHTTPLoggingMiddleware(BaseHTTPMiddleware):
+    """置き換え前の実装 (比較用)。"""
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        structlog.contextvars.clear_contextvars()
+        trace_id = request.headers.get(HEADER_REQUEST_ID, str(uuid.uuid4()))
+        structlog.contextvars.bind_contextvars(trace_id=trace_id, method=request.method, path=str(request.url.path))
+        start = time.perf_counter_ns()
+        response = await call_next(request)
+        duration_ms = (time.perf_counter_ns() - start) / NS_PER_MS
+        logger.info(LOG_REQUEST_COMPLETED, status_code=response.status_code, duration_ms=round(duration_ms, 2))
+        response.headers[HEADER_TRACE_ID] = trace_id
+        return response
+
+
+def _build_app(middleware: type) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(middleware)
+
+    @app.get("/health")
+    async def health() -> dict[str, str]:
+        return {"status": "ok"}
+
+    @app.get("/users/{user_id}")
+    async def get_user(user_id: str) -> dict[str, str]:
+        return {"user_id": user_id, "name": "Alice", "email": "alice@example.com", "created_at": "2026-01-01T00:00:00"}
+
+    return app
+
+
+async def _throughput(app: FastAPI, path: str) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(100):
+            await client.get(path)
+        start = time.perf_counter()
+        for _ in range(REQUESTS):
+            await client.get(path)
+        return REQUESTS / (time.perf_counter() - start)
+
+
+async def main() -> None:
+    # ログ出力自体のコストは除き、ミドルウェアの差だけを見る
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(0),
+        logger_factory=structlog.ReturnLoggerFactory(),
+        processors=[structlog.contextvars.merge_contextvars, structlog.processors.KeyValueRenderer()],
+    )
+    for path in ["/health", "/users/u-1"]:
+        for label, middleware in [("BaseHTTPMiddleware", BaseHTTPLoggingMiddleware), ("pure ASGI", LoggingMiddleware)]:
+            rps = await _throughput(_build_app(middleware), path)
+            print(f"{path:<12} {label:<20} {rps:>10.0f} req/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
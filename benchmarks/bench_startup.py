@@ -0,0 +1,94 @@
+"""プロセス起動から app.main の import 完了、リクエスト受付開始 (serving)、/ready 相当 (ready)、
+最初の GET /users/{user_id} の完了 (first request) までの時間を測る。
+
+uv run python -m benchmarks.bench_startup 2> /dev/null
+
+毎回新しいインタプリタを起動するため、import のキャッシュを含まない起動時間になる。
+DynamoDB バックエンドの計測には DYNAMODB_ENDPOINT の先 (moto など) が必要。
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+from app.core.constants import NS_PER_MS
+
+_SPAWNED_AT_ENV = "BENCH_STARTUP_SPAWNED_AT_NS"
+COLUMNS = ("import_ms", "serving_ms", "ready_ms", "first_request_ms")
+VARIANTS = [
+    ("memory", {"USER_REPOSITORY_BACKEND": "memory"}),
+    ("dynamodb", {"USER_REPOSITORY_BACKEND": "dynamodb", "FAST_START_ENABLED": "false"}),
+    ("dynamodb fast start", {"USER_REPOSITORY_BACKEND": "dynamodb", "FAST_START_ENABLED": "true"}),
+]
+
+
+async def _child() -> None:
+    # 時刻の起点は親プロセスが fork する直前。インタプリタ自体の起動時間も含める
+    spawned_at = int(os.environ[_SPAWNED_AT_ENV])
+    from app.main import app
+
+    imported = time.time_ns()
+    async with app.router.lifespan_context(app):
+        serving = time.time_ns()
+        bootstrap = app.state.bootstrap
+        if bootstrap is not None:
+            await bootstrap
+        ready = time.time_ns()
+        # 遅延していた client 生成などが最初のリクエストに回っていないかも見る
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            await client.get("/users/bench-startup")
+        first_request = time.time_ns()
+    print(
+        json.dumps(
+            {
+                "import_ms": (imported - spawned_at) / NS_PER_MS,
+                "serving_ms": (serving - spawned_at) / NS_PER_MS,
+                "ready_ms": (ready - spawned_at) / NS_PER_MS,
+                "first_request_ms": (first_request - spawned_at) / NS_PER_MS,
+            }
+        )
+    )
+
+
+def _measure(env: dict[str, str], rounds: int) -> dict[str, list[float]]:
+    samples: dict[str, list[float]] = {key: [] for key in COLUMNS}
+    for _ in range(rounds):
+        child_env = {**os.environ, **env, _SPAWNED_AT_ENV: str(time.time_ns())}
+        completed = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_startup", "--child"],
+            env=child_env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        for key, value in json.loads(completed.stdout.strip().splitlines()[-1]).items():
+            samples[key].append(value)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    options = parser.parse_args()
+
+    if options.child:
+        asyncio.run(_child())
+        return
+    print(f"{'variant':<24} {'import':>10} {'serving':>10} {'ready':>10} {'first req':>10}  (median ms)")
+    for label, env in VARIANTS:
+        samples = _measure(env, options.rounds)
+        medians = [statistics.median(samples[key]) for key in COLUMNS]
+        print(f"{label:<24} " + " ".join(f"{median:>10.1f}" for median in medians))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""ベンチマークの計測・JSON 出力・比較の共通処理。"""
+
+import json
+import platform
+import statistics
+import subprocess
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+
+@dataclass(frozen=True)
+class BenchResult:
+    name: str
+    rounds: int
+    ops_per_round: int
+    mean_ns: float
+    median_ns: float
+    min_ns: float
+    p99_ns: float
+
+
+def _summarize(name: str, per_op_ns: list[float], ops_per_round: int) -> BenchResult:
+    ordered = sorted(per_op_ns)
+    return BenchResult(
+        name=name,
+        rounds=len(ordered),
+        ops_per_round=ops_per_round,
+        mean_ns=round(statistics.fmean(ordered), 1),
+        median_ns=round(statistics.median(ordered), 1),
+        min_ns=round(ordered[0], 1),
+        p99_ns=round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))], 1),
+    )
+
+
+def bench(name: str, fn: Callable[[], Any], ops_per_round: int = 1_000, rounds: int = 50) -> BenchResult:
+    """fn を ops_per_round 回ずつ rounds 回計測し、1 回あたりの ns を集計する。
+
+    1 回ごとに時刻を取ると計測自体のコストが混ざるため、ラウンド単位で測って割る。
+    """
+    for _ in range(ops_per_round):
+        fn()
+    per_op_ns: list[float] = []
+    for _ in range(rounds):
+        start = time.perf_counter_ns()
+        for _ in range(ops_per_round):
+            fn()
+        per_op_ns.append((time.perf_counter_ns() - start) / ops_per_round)
+    return _summarize(name, per_op_ns, ops_per_round)
+
+
+async def abench(
+    name: str, fn: Callable[[], Awaitable[Any]], ops_per_round: int = 100, rounds: int = 30
+) -> BenchResult:
+    """bench のコルーチン版。"""
+    for _ in range(ops_per_round):
+        await fn()
+    per_op_ns: list[float] = []
+    for _ in range(rounds):
+        start = time.perf_counter_ns()
+        for _ in range(ops_per_round):
+            await fn()
+        per_op_ns.append((time.perf_counter_ns() - start) / ops_per_round)
+    return _summarize(name, per_op_ns, ops_per_round)
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_results(results: list[BenchResult], path: Path) -> None:
+    payload = {
+        "metadata": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": datetime.now(UTC).isoformat(),
+        },
+        "results": [asdict(result) for result in results],
+    }
+    path.write_text(json.dumps(payload, indent=2, ensure_ascii=False) + "\n")
+
+
+def format_results(results: list[BenchResult], baseline_path: Path | None = None) -> str:
+    """結果を表にする。baseline_path を渡すと median の増減率を並べる。"""
+    baseline: dict[str, float] = {}
+    if baseline_path is not None:
+        for entry in json.loads(baseline_path.read_text())["results"]:
+            baseline[entry["name"]] = entry["median_ns"]
+
+    lines = [f"{'benchmark':<40} {'median':>12} {'p99':>12}" + (f" {'vs base':>9}" if baseline else "")]
+    for result in results:
+        line = f"{result.name:<40} {result.median_ns:>9.1f} ns {result.p99_ns:>9.1f} ns"
+        if result.name in baseline and baseline[result.name] > 0:
+            change = (result.median_ns - baseline[result.name]) / baseline[result.name] * 100
+            line += f" {change:>+8.1f}%"
+        lines.append(line)
+    return "\n".join(lines)
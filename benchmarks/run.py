@@ -0,0 +1,178 @@
+"""リクエスト経路のホットスポットを個別に計測し、結果を JSON に書き出す。
+
+    uv run python -m benchmarks.run --output bench.json
+    uv run python -m benchmarks.run --output bench-new.json --baseline bench.json
+
+--baseline を渡すとコミット間で median を比較した表を出す。
+"""
+
+import argparse
+import asyncio
+import inspect
+import logging
+from pathlib import Path
+
+import httpx
+import structlog
+from fastapi.routing import APIRoute, serialize_response
+
+from app.api.dependencies import get_user_service
+from app.api.v1.endpoints import users as users_endpoints
+from app.container.container import DIContainer
+from app.core.constants import HEADER_ACCEPT_ENCODING, HEADER_ETAG, HEADER_IF_NONE_MATCH
+from app.core.decorators import _ArgPlan, _build_safe_args, log_action
+from app.core.types import UserId
+from app.domain.user.entity import User, UserPage
+from app.infrastructure.repository.in_memory_user_repository import InMemoryUserRepository
+from app.main import create_app
+from app.schemas.user import UserPageResponse, UserResponse, dump_user, dump_user_page
+from app.usecase.user.query_cache import UserQueryCache
+from app.usecase.user.user_service import UserService
+from benchmarks.harness import BenchResult, abench, bench, format_results, write_results
+
+USER_ITEM = {
+    "user_id": "bench-user",
+    "name": "Alice",
+    "email": "alice@example.com",
+    "age": 30,
+    "address": "Tokyo",
+    "created_at": "2026-01-01T00:00:00+00:00",
+}
+PAGE_SIZE = 100
+
+
+def _configure_logging() -> None:
+    # 出力先の I/O は除き、ログ呼び出し自体のコストだけを含める
+    structlog.configure(
+        processors=[
+            structlog.contextvars.merge_contextvars,
+            structlog.processors.TimeStamper(fmt="iso"),
+            structlog.processors.KeyValueRenderer(),
+        ],
+        wrapper_class=structlog.make_filtering_bound_logger(logging.INFO),
+        logger_factory=structlog.ReturnLoggerFactory(),
+        cache_logger_on_first_use=True,
+    )
+
+
+def _target(user_id: str, limit: int = 10) -> int:
+    return limit
+
+
+def bench_log_action() -> list[BenchResult]:
+    decorated = log_action()(_target)
+    plan = _ArgPlan(inspect.signature(_target), frozenset())
+    args = ("bench-user",)
+    kwargs = {"limit": 5}
+    return [
+        bench("plain_call", lambda: _target("bench-user", limit=5), ops_per_round=10_000),
+        bench("log_action_wrapper", lambda: decorated("bench-user", limit=5)),
+        bench("build_safe_args", lambda: _build_safe_args(plan, args, kwargs), ops_per_round=10_000),
+    ]
+
+
+def _response_field(path: str) -> object:
+    route = next(
+        r for r in users_endpoints.router.routes if isinstance(r, APIRoute) and r.path == path and "GET" in r.methods
+    )
+    return route.response_field
+
+
+def bench_models() -> list[BenchResult]:
+    user = User(**USER_ITEM)
+    page = UserPage(items=[User(**{**USER_ITEM, "user_id": f"bench-user-{i}"}) for i in range(PAGE_SIZE)])
+    user_field = _response_field("/{user_id}")
+    page_field = _response_field("")
+
+    async def serialize() -> object:
+        # UserResponse に詰め替えて response_model で検証し直し、JSON バイト列にする (FastAPI の既定の経路)
+        return await serialize_response(
+            field=user_field, response_content=UserResponse.from_entity(user), dump_json=True
+        )
+
+    async def serialize_page() -> object:
+        response = UserPageResponse(items=[UserResponse.from_entity(u) for u in page.items])
+        return await serialize_response(field=page_field, response_content=response, dump_json=True)
+
+    return [
+        bench("user_hydration", lambda: User(**USER_ITEM), ops_per_round=5_000),
+        bench("user_response_from_entity", lambda: UserResponse.from_entity(user), ops_per_round=5_000),
+        asyncio.run(abench("from_entity_and_response_model", serialize, ops_per_round=1_000)),
+        bench("dump_user", lambda: dump_user(user), ops_per_round=5_000),
+        asyncio.run(abench("page_from_entity_and_response_model", serialize_page)),
+        bench("dump_user_page", lambda: dump_user_page(page)),
+    ]
+
+
+def bench_query_cache() -> list[BenchResult]:
+    users = [User(**{**USER_ITEM, "user_id": f"bench-user-{i}"}) for i in range(PAGE_SIZE)]
+    repository = InMemoryUserRepository(users)
+    plain = UserService(repository)
+    cached = UserService(repository, query_cache=UserQueryCache(max_entries=100, max_users=10_000, ttl_seconds=60))
+
+    async def run() -> list[BenchResult]:
+        return [
+            await abench("service_list_users", lambda: plain.list_users(limit=PAGE_SIZE)),
+            await abench("service_list_users_query_cache_hit", lambda: cached.list_users(limit=PAGE_SIZE)),
+        ]
+
+    return asyncio.run(run())
+
+
+def bench_container() -> list[BenchResult]:
+    DIContainer.reset()
+    DIContainer.resolve(UserService)
+    return [bench("di_resolve_user_service", lambda: DIContainer.resolve(UserService))]
+
+
+async def bench_asgi() -> list[BenchResult]:
+    app = create_app()
+    users = [User(**USER_ITEM), *(User(**{**USER_ITEM, "user_id": f"bench-user-{i}"}) for i in range(PAGE_SIZE - 1))]
+    service = UserService(InMemoryUserRepository(users))
+
+    async def get_service() -> UserService:
+        return service
+
+    app.dependency_overrides[get_user_service] = get_service
+    transport = httpx.ASGITransport(app=app)
+    # 圧縮なしの往復を基準にし、圧縮ありは別のベンチマークで測る
+    identity = {HEADER_ACCEPT_ENCODING: "identity"}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=identity) as client:
+        user_id = UserId(USER_ITEM["user_id"])
+        etag = (await client.get(f"/users/{user_id}")).headers[HEADER_ETAG]
+        return [
+            await abench("asgi_health", lambda: client.get("/health")),
+            await abench("asgi_get_user", lambda: client.get(f"/users/{user_id}")),
+            await abench(
+                "asgi_get_user_not_modified",
+                lambda: client.get(f"/users/{user_id}", headers={HEADER_IF_NONE_MATCH: etag}),
+            ),
+            await abench("asgi_list_users", lambda: client.get("/users", params={"limit": PAGE_SIZE})),
+            await abench(
+                "asgi_list_users_gzip",
+                lambda: client.get("/users", params={"limit": PAGE_SIZE}, headers={HEADER_ACCEPT_ENCODING: "gzip"}),
+            ),
+        ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", type=Path, help="結果を書き出す JSON ファイル")
+    parser.add_argument("--baseline", type=Path, help="比較対象の JSON ファイル")
+    options = parser.parse_args()
+
+    _configure_logging()
+    results = [
+        *bench_log_action(),
+        *bench_models(),
+        *bench_query_cache(),
+        *bench_container(),
+        *asyncio.run(bench_asgi()),
+    ]
+    print(format_results(results, options.baseline))
+    if options.output is not None:
+        write_results(results, options.output)
+
+
+if __name__ == "__main__":
+    main()
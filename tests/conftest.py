@@ -1,6 +1,7 @@
 import pytest
 from fastapi.testclient import TestClient
 
+from app.container.container import DIContainer
 from app.core.config import settings
 from app.infrastructure.datasource.dynamodb import (
     create_users_table,
@@ -11,7 +12,14 @@ from app.main import app
 
 @pytest.fixture(autouse=True)
 def setup_and_teardown_table():
-    """Create table before each test, delete after."""
+    """Create table before each test, delete after.
+
+    USER_REPOSITORY_BACKEND=memory の場合はテーブルを作らず、テストごとに空のリポジトリを作り直す。
+    """
+    if settings.user_repository_backend == "memory":
+        DIContainer.reset()
+        yield
+        return
     create_users_table()
     yield
     dynamodb = get_dynamodb_resource()
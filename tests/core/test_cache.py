@@ -0,0 +1,73 @@
+from app.core.cache import LRUTTLCache
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestLRUTTLCache:
+    def test_hit_and_miss_are_counted(self):
+        cache: LRUTTLCache[str, int] = LRUTTLCache(max_size=10, ttl_seconds=60)
+        cache.set("a", 1)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 1
+
+    def test_least_recently_used_is_evicted(self):
+        cache: LRUTTLCache[str, int] = LRUTTLCache(max_size=2, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats.evictions == 1
+        assert cache.stats.size == 2
+
+    def test_entry_expires_after_ttl(self):
+        clock = _FakeClock()
+        cache: LRUTTLCache[str, int] = LRUTTLCache(max_size=10, ttl_seconds=5, clock=clock)
+        cache.set("a", 1)
+
+        clock.now = 4.9
+        assert cache.get("a") == 1
+        clock.now = 5.0
+        assert cache.get("a") is None
+        assert cache.stats.expirations == 1
+        assert len(cache) == 0
+
+    def test_delete_removes_entry(self):
+        cache: LRUTTLCache[str, int] = LRUTTLCache(max_size=10, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.delete("a")
+        cache.delete("missing")
+
+        assert cache.get("a") is None
+
+    def test_total_weight_is_bounded(self):
+        cache: LRUTTLCache[str, list[int]] = LRUTTLCache(max_size=10, ttl_seconds=60, max_weight=5, weigher=len)
+        cache.set("a", [1, 2])
+        cache.set("b", [1, 2])
+        cache.set("c", [1, 2])
+
+        assert cache.get("a") is None
+        assert cache.get("b") == [1, 2]
+        assert cache.stats.weight == 4
+        assert cache.stats.evictions == 1
+
+    def test_weight_is_released_on_replace_and_delete(self):
+        cache: LRUTTLCache[str, list[int]] = LRUTTLCache(max_size=10, ttl_seconds=60, max_weight=5, weigher=len)
+        cache.set("a", [1, 2, 3])
+        cache.set("a", [1])
+        assert cache.stats.weight == 1
+
+        cache.delete("a")
+        assert cache.stats.weight == 0
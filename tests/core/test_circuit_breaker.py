@@ -0,0 +1,111 @@
+from app.core.circuit_breaker import CircuitBreaker, CircuitState
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _make_breaker(clock: _FakeClock, states: list[CircuitState] | None = None) -> CircuitBreaker:
+    return CircuitBreaker(
+        failure_threshold=2,
+        reset_timeout_seconds=10.0,
+        clock=clock,
+        on_state_change=states.append if states is not None else None,
+    )
+
+
+class TestCircuitBreaker:
+    def test_opens_after_consecutive_failures(self):
+        clock = _FakeClock()
+        breaker = _make_breaker(clock)
+
+        assert breaker.try_acquire()
+        breaker.record_failure()
+        assert breaker.state is CircuitState.CLOSED
+        assert breaker.try_acquire()
+        breaker.record_failure()
+
+        assert breaker.state is CircuitState.OPEN
+        assert not breaker.try_acquire()
+        assert breaker.retry_after() == 10.0
+
+    def test_success_resets_failure_count(self):
+        breaker = _make_breaker(_FakeClock())
+
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+
+        assert breaker.state is CircuitState.CLOSED
+
+    def test_half_open_allows_a_single_trial(self):
+        clock = _FakeClock()
+        states: list[CircuitState] = []
+        breaker = _make_breaker(clock, states)
+        breaker.record_failure()
+        breaker.record_failure()
+
+        clock.now = 10.0
+        assert breaker.try_acquire()
+        assert breaker.state is CircuitState.HALF_OPEN
+        assert not breaker.try_acquire()
+
+        breaker.record_success()
+        assert breaker.state is CircuitState.CLOSED
+        assert states == [CircuitState.OPEN, CircuitState.HALF_OPEN, CircuitState.CLOSED]
+
+    def test_failed_trial_reopens(self):
+        clock = _FakeClock()
+        breaker = _make_breaker(clock)
+        breaker.record_failure()
+        breaker.record_failure()
+
+        clock.now = 10.0
+        assert breaker.try_acquire()
+        breaker.record_failure()
+
+        assert breaker.state is CircuitState.OPEN
+        assert breaker.retry_after() == 10.0
+
+    def test_released_trial_lets_the_next_call_try(self):
+        clock = _FakeClock()
+        breaker = _make_breaker(clock)
+        breaker.record_failure()
+        breaker.record_failure()
+        clock.now = 10.0
+
+        assert breaker.try_acquire()
+        breaker.release()
+
+        assert breaker.try_acquire()
+
+    def test_half_open_admits_every_call_of_the_trial_key(self):
+        clock = _FakeClock()
+        breaker = _make_breaker(clock)
+        breaker.record_failure()
+        breaker.record_failure()
+        clock.now = 10.0
+        trial, other = object(), object()
+
+        assert breaker.try_acquire(trial)
+        assert breaker.try_acquire(trial)
+        assert not breaker.try_acquire(other)
+        assert not breaker.try_acquire()
+
+    def test_failures_while_open_do_not_delay_recovery(self):
+        clock = _FakeClock()
+        breaker = _make_breaker(clock)
+        breaker.record_failure()
+        breaker.record_failure()
+
+        # open になる前に始まっていた呼び出しが、後から失敗を報告する
+        clock.now = 8.0
+        breaker.record_failure()
+
+        assert breaker.retry_after() == 2.0
+        clock.now = 10.0
+        assert breaker.try_acquire()
@@ -1,5 +1,9 @@
+import logging
+from collections.abc import AsyncIterator, Iterator
+
 import pytest
 import structlog.testing
+from pydantic import BaseModel
 
 from app.core.constants import (
     LOG_ACTION_ERROR,
@@ -96,3 +100,165 @@ class TestLogAction:
 
         success_entry = next(e for e in logs if e["event"] == LOG_ACTION_SUCCESS)
         assert success_entry["result_type"] == "str"
+
+    def test_generator_logs_success_after_exhaustion(self):
+        @log_action()
+        def stream() -> Iterator[int]:
+            yield from range(3)
+
+        with structlog.testing.capture_logs() as logs:
+            gen = stream()
+            assert logs == []
+            assert list(gen) == [0, 1, 2]
+
+        success_entry = next(e for e in logs if e["event"] == LOG_ACTION_SUCCESS)
+        assert success_entry["result_count"] == 3
+
+    def test_generator_error_logged(self):
+        @log_action()
+        def stream() -> Iterator[int]:
+            yield 1
+            raise ValueError("boom")
+
+        with structlog.testing.capture_logs() as logs, pytest.raises(ValueError, match="boom"):
+            list(stream())
+
+        error_entry = next(e for e in logs if e["event"] == LOG_ACTION_ERROR)
+        assert error_entry["result_count"] == 1
+
+    async def test_coroutine_logged_after_await(self):
+        @log_action()
+        async def fetch() -> list[int]:
+            return [1, 2]
+
+        with structlog.testing.capture_logs() as logs:
+            result = await fetch()
+
+        assert result == [1, 2]
+        success_entry = next(e for e in logs if e["event"] == LOG_ACTION_SUCCESS)
+        assert success_entry["result_count"] == 2
+
+    async def test_coroutine_error_logged(self):
+        @log_action()
+        async def fail() -> None:
+            raise ValueError("boom")
+
+        with structlog.testing.capture_logs() as logs, pytest.raises(ValueError, match="boom"):
+            await fail()
+
+        events = [entry["event"] for entry in logs]
+        assert LOG_ACTION_ERROR in events
+        assert LOG_ACTION_SUCCESS not in events
+
+    async def test_async_generator_logs_success_after_exhaustion(self):
+        @log_action()
+        async def stream() -> AsyncIterator[int]:
+            for i in range(3):
+                yield i
+
+        with structlog.testing.capture_logs() as logs:
+            items = [item async for item in stream()]
+
+        assert items == [0, 1, 2]
+        success_entry = next(e for e in logs if e["event"] == LOG_ACTION_SUCCESS)
+        assert success_entry["result_count"] == 3
+
+    def test_defaults_are_logged(self):
+        @log_action()
+        def paginate(limit: int, cursor: str | None = None, *, order: str = "asc") -> None:
+            pass
+
+        with structlog.testing.capture_logs() as logs:
+            paginate(10)
+
+        start_entry = next(e for e in logs if e["event"] == LOG_ACTION_START)
+        assert start_entry["limit"] == 10
+        assert start_entry["cursor"] is None
+        assert start_entry["order"] == "asc"
+
+    def test_self_is_skipped_and_var_args_collected(self):
+        class Service:
+            @log_action()
+            def run(self, *items: int, **options: str) -> None:
+                pass
+
+        with structlog.testing.capture_logs() as logs:
+            Service().run(1, 2, mode="fast")
+
+        start_entry = next(e for e in logs if e["event"] == LOG_ACTION_START)
+        assert "self" not in start_entry
+        assert start_entry["items"] == (1, 2)
+        assert start_entry["options"] == {"mode": "fast"}
+
+    def test_base_model_args_are_summarized(self):
+        class Payload(BaseModel):
+            value: int
+
+        @log_action()
+        def handle(payload: Payload) -> None:
+            pass
+
+        with structlog.testing.capture_logs() as logs:
+            handle(payload=Payload(value=1))
+
+        start_entry = next(e for e in logs if e["event"] == LOG_ACTION_START)
+        assert start_entry["payload"] == "<Payload>"
+
+
+class TestLogActionFastPath:
+    @pytest.fixture
+    def warning_level(self):
+        original = structlog.get_config()
+        structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+        yield
+        structlog.configure(**original)
+
+    def test_disabled_info_skips_start_and_success(self, warning_level):
+        @log_action()
+        def greet(name: str) -> str:
+            return f"hello {name}"
+
+        with structlog.testing.capture_logs() as logs:
+            assert greet("Alice") == "hello Alice"
+
+        assert logs == []
+
+    def test_disabled_info_still_logs_errors(self, warning_level):
+        @log_action()
+        def fail() -> None:
+            raise ValueError("boom")
+
+        with structlog.testing.capture_logs() as logs, pytest.raises(ValueError):
+            fail()
+
+        assert [entry["event"] for entry in logs] == [LOG_ACTION_ERROR]
+
+    def test_sampled_out_calls_log_nothing_but_errors(self):
+        @log_action(sample_rate=0.0)
+        def ok() -> None:
+            pass
+
+        @log_action(sample_rate=0.0)
+        def fail() -> None:
+            raise ValueError("boom")
+
+        with structlog.testing.capture_logs() as logs:
+            ok()
+            with pytest.raises(ValueError):
+                fail()
+
+        assert [entry["event"] for entry in logs] == [LOG_ACTION_ERROR]
+
+    def test_partial_sampling(self, monkeypatch):
+        rolls = iter([0.05, 0.5])
+        monkeypatch.setattr("app.core.decorators.random.random", lambda: next(rolls))
+
+        @log_action(sample_rate=0.1)
+        def ok() -> None:
+            pass
+
+        with structlog.testing.capture_logs() as logs:
+            ok()
+            ok()
+
+        assert [entry["event"] for entry in logs] == [LOG_ACTION_START, LOG_ACTION_SUCCESS]
@@ -0,0 +1,26 @@
+from app.core.etag import compute_etag, etag_matches
+
+
+class TestComputeEtag:
+    def test_is_quoted_and_stable(self):
+        etag = compute_etag(b'{"user_id":"u1"}')
+
+        assert etag.startswith('"') and etag.endswith('"')
+        assert etag == compute_etag(b'{"user_id":"u1"}')
+
+    def test_changes_with_body(self):
+        assert compute_etag(b'{"user_id":"u1"}') != compute_etag(b'{"user_id":"u2"}')
+
+
+class TestEtagMatches:
+    def test_exact_match(self):
+        assert etag_matches('"abc"', '"abc"')
+
+    def test_list_and_weak_comparison(self):
+        assert etag_matches('"x", W/"abc"', '"abc"')
+
+    def test_wildcard(self):
+        assert etag_matches("*", '"abc"')
+
+    def test_no_match(self):
+        assert not etag_matches('"x", "y"', '"abc"')
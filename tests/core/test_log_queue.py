@@ -0,0 +1,89 @@
+import io
+import logging
+
+import structlog
+
+from app.core.log_queue import QueueLogPipeline
+
+
+def _record(message: str) -> logging.LogRecord:
+    return logging.LogRecord("test", logging.INFO, __file__, 0, message, None, None)
+
+
+class TestQueueLogPipeline:
+    def test_stop_flushes_pending_records(self):
+        stream = io.StringIO()
+        pipeline = QueueLogPipeline(logging.Formatter("%(message)s"), stream=stream)
+        pipeline.start()
+
+        for i in range(100):
+            pipeline.handler.handle(_record(f"line {i}"))
+        pipeline.stop()
+
+        assert stream.getvalue().splitlines() == [f"line {i}" for i in range(100)]
+        assert pipeline.stats.written == 100
+        assert pipeline.stats.queued == 0
+
+    def test_records_are_written_in_batches(self):
+        stream = io.StringIO()
+        pipeline = QueueLogPipeline(logging.Formatter("%(message)s"), stream=stream, batch_size=10)
+
+        # ワーカー起動前に積んでおけば、1 回の書き出しで batch_size 件ずつまとめられる
+        for i in range(25):
+            pipeline.handler.handle(_record(f"line {i}"))
+        pipeline.start()
+        pipeline.stop()
+
+        assert pipeline.stats.written == 25
+        assert pipeline.stats.batches == 3
+
+    def test_drop_policy_counts_dropped_records(self):
+        stream = io.StringIO()
+        pipeline = QueueLogPipeline(logging.Formatter("%(message)s"), stream=stream, max_size=2, overflow="drop")
+
+        for i in range(5):
+            pipeline.handler.handle(_record(f"line {i}"))
+
+        assert pipeline.stats.dropped == 3
+        assert pipeline.stats.queued == 2
+
+        pipeline.start()
+        pipeline.stop()
+        assert stream.getvalue().splitlines() == ["line 0", "line 1"]
+
+    def test_message_args_are_resolved_on_enqueue(self):
+        stream = io.StringIO()
+        pipeline = QueueLogPipeline(logging.Formatter("%(message)s"), stream=stream)
+        items = ["a"]
+        record = logging.LogRecord("test", logging.INFO, __file__, 0, "items=%s", (items,), None)
+
+        pipeline.handler.handle(record)
+        items.append("b")
+        pipeline.start()
+        pipeline.stop()
+
+        assert stream.getvalue() == "items=['a']\n"
+
+    def test_records_after_stop_are_written_synchronously(self):
+        stream = io.StringIO()
+        pipeline = QueueLogPipeline(logging.Formatter("%(message)s"), stream=stream, max_size=1)
+        pipeline.start()
+        pipeline.stop()
+
+        # キューの上限を超えても、停止後はキューに積まないので block しない
+        for i in range(3):
+            pipeline.handler.handle(_record(f"late {i}"))
+
+        assert stream.getvalue().splitlines() == ["late 0", "late 1", "late 2"]
+        assert pipeline.stats.queued == 0
+
+    def test_contextvars_are_captured_on_enqueue(self):
+        stream = io.StringIO()
+        pipeline = QueueLogPipeline(logging.Formatter("%(trace_id)s %(message)s"), stream=stream)
+        pipeline.start()
+
+        with structlog.contextvars.bound_contextvars(trace_id="trace-1"):
+            pipeline.handler.handle(_record("foreign"))
+        pipeline.stop()
+
+        assert stream.getvalue() == "trace-1 foreign\n"
@@ -0,0 +1,79 @@
+from app.core.metrics import MetricsRegistry
+
+
+class TestCounter:
+    def test_inc_per_label_set(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("requests_total", "Requests.", ("route",))
+
+        counter.inc("/a")
+        counter.inc("/a")
+        counter.inc("/b", amount=3)
+
+        assert counter.value("/a") == 2
+        assert counter.value("/b") == 3
+        assert counter.value("/c") == 0
+
+    def test_render(self):
+        registry = MetricsRegistry()
+        registry.counter("requests_total", "Requests.", ("route",)).inc("/a")
+
+        assert registry.render() == (
+            '# HELP requests_total Requests.\n# TYPE requests_total counter\nrequests_total{route="/a"} 1.0\n'
+        )
+
+    def test_label_values_are_escaped(self):
+        registry = MetricsRegistry()
+        registry.counter("requests_total", "Requests.", ("route",)).inc('a"b\\c')
+
+        assert 'requests_total{route="a\\"b\\\\c"} 1.0' in registry.render()
+
+
+class TestGauge:
+    def test_set_overwrites_and_renders(self):
+        registry = MetricsRegistry()
+        gauge = registry.gauge("circuit_state", "State.", ("operation",))
+
+        gauge.set(2, "save")
+        gauge.set(0, "save")
+
+        assert gauge.value("save") == 0
+        assert registry.render() == (
+            '# HELP circuit_state State.\n# TYPE circuit_state gauge\ncircuit_state{operation="save"} 0.0\n'
+        )
+
+
+class TestHistogram:
+    def test_buckets_are_cumulative(self):
+        registry = MetricsRegistry()
+        histogram = registry.histogram("latency_seconds", "Latency.", ("op",), buckets=(0.1, 1.0))
+
+        histogram.observe(0.05, "get")
+        histogram.observe(0.1, "get")
+        histogram.observe(0.5, "get")
+        histogram.observe(5.0, "get")
+
+        lines = registry.render().splitlines()
+        assert 'latency_seconds_bucket{op="get",le="0.1"} 2' in lines
+        assert 'latency_seconds_bucket{op="get",le="1.0"} 3' in lines
+        assert 'latency_seconds_bucket{op="get",le="+Inf"} 4' in lines
+        assert 'latency_seconds_sum{op="get"} 5.65' in lines
+        assert 'latency_seconds_count{op="get"} 4' in lines
+        assert histogram.count("get") == 4
+
+    def test_unobserved_label_set_is_not_rendered(self):
+        registry = MetricsRegistry()
+        registry.histogram("latency_seconds", "Latency.", ("op",))
+
+        assert registry.render() == "# HELP latency_seconds Latency.\n# TYPE latency_seconds histogram\n"
+
+
+class TestCallbackMetric:
+    def test_reads_value_at_render_time(self):
+        registry = MetricsRegistry()
+        state = {"in_flight": 1}
+        registry.callback("in_flight", "In flight.", "gauge", lambda: state["in_flight"])
+
+        state["in_flight"] = 3
+
+        assert registry.render() == "# HELP in_flight In flight.\n# TYPE in_flight gauge\nin_flight 3.0\n"
@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+
+from app.core.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    async def test_concurrent_calls_share_one_execution(self):
+        flight: SingleFlight[str, int] = SingleFlight()
+        calls = 0
+        release = asyncio.Event()
+
+        async def fetch() -> int:
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return 42
+
+        waiters = [asyncio.create_task(flight.do("k", fetch)) for _ in range(10)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*waiters)
+
+        assert results == [42] * 10
+        assert calls == 1
+        assert flight.stats.executions == 1
+        assert flight.stats.collapsed == 9
+        assert flight.stats.in_flight == 0
+
+    async def test_different_keys_run_separately(self):
+        flight: SingleFlight[str, str] = SingleFlight()
+
+        async def echo(value: str) -> str:
+            await asyncio.sleep(0)
+            return value
+
+        results = await asyncio.gather(flight.do("a", lambda: echo("a")), flight.do("b", lambda: echo("b")))
+
+        assert results == ["a", "b"]
+        assert flight.stats.executions == 2
+
+    async def test_exception_is_shared_and_key_is_released(self):
+        flight: SingleFlight[str, int] = SingleFlight()
+        release = asyncio.Event()
+
+        async def fail() -> int:
+            await release.wait()
+            raise ValueError("boom")
+
+        waiters = [asyncio.create_task(flight.do("k", fail)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+
+        assert all(isinstance(result, ValueError) for result in results)
+        assert flight.stats.in_flight == 0
+
+    async def test_leader_cancellation_does_not_cancel_followers(self):
+        flight: SingleFlight[str, int] = SingleFlight()
+        release = asyncio.Event()
+
+        async def fetch() -> int:
+            await release.wait()
+            return 1
+
+        leader = asyncio.create_task(flight.do("k", fetch))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.do("k", fetch))
+        await asyncio.sleep(0)
+        leader.cancel()
+        release.set()
+
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        assert await follower == 1
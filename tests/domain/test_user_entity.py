@@ -1,3 +1,5 @@
+from decimal import Decimal
+
 from app.domain.user.entity import User
 
 
@@ -34,3 +36,10 @@ def test_create_preserves_fields():
     assert user.email == "hanako@example.com"
     assert user.age == 25
     assert user.address == "Osaka"
+
+
+def test_from_projection_validates_only_read_fields():
+    user = User.from_projection({"user_id": "u-1", "age": Decimal("30"), "name_normalized": "taro"})
+
+    assert user.model_dump() == {"user_id": "u-1", "age": 30}
+    assert user.model_fields_set == {"user_id", "age"}
@@ -0,0 +1,56 @@
+from unittest.mock import MagicMock
+
+import pytest
+from botocore.exceptions import ClientError
+
+from app.infrastructure.datasource.backfill import backfill_name_prefix_attributes
+
+
+def _table(*pages: list[dict]) -> MagicMock:
+    table = MagicMock()
+    table.scan.side_effect = [
+        {"Items": items, **({"LastEvaluatedKey": {"user_id": f"k{i}"}} if i < len(pages) - 1 else {})}
+        for i, items in enumerate(pages)
+    ]
+    return table
+
+
+class TestBackfillNamePrefixAttributes:
+    def test_sets_missing_attributes_across_pages(self):
+        table = _table(
+            [{"user_id": "u-1", "name": "Taro"}],
+            [{"user_id": "u-2", "name": "HANAKO"}],
+        )
+
+        assert backfill_name_prefix_attributes(table) == 2
+
+        assert table.scan.call_args_list[1].kwargs["ExclusiveStartKey"] == {"user_id": "k0"}
+        first, second = (call.kwargs for call in table.update_item.call_args_list)
+        assert first["Key"] == {"user_id": "u-1"}
+        assert first["ExpressionAttributeValues"] == {":bucket": "t", ":normalized": "taro"}
+        assert second["ExpressionAttributeValues"] == {":bucket": "h", ":normalized": "hanako"}
+        assert first["ConditionExpression"] == "attribute_exists(#id)"
+
+    def test_skips_items_that_are_up_to_date(self):
+        table = _table([{"user_id": "u-1", "name": "Taro", "name_normalized": "taro"}])
+
+        assert backfill_name_prefix_attributes(table) == 0
+
+        table.update_item.assert_not_called()
+
+    def test_skips_items_deleted_after_the_scan(self):
+        table = _table([{"user_id": "u-1", "name": "Taro"}])
+        table.update_item.side_effect = ClientError(
+            {"Error": {"Code": "ConditionalCheckFailedException", "Message": "gone"}}, "UpdateItem"
+        )
+
+        assert backfill_name_prefix_attributes(table) == 0
+
+    def test_other_errors_propagate(self):
+        table = _table([{"user_id": "u-1", "name": "Taro"}])
+        table.update_item.side_effect = ClientError(
+            {"Error": {"Code": "ProvisionedThroughputExceededException", "Message": "slow down"}}, "UpdateItem"
+        )
+
+        with pytest.raises(ClientError):
+            backfill_name_prefix_attributes(table)
@@ -0,0 +1,127 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from botocore.exceptions import ClientError
+
+from app.core.exceptions import RepositoryError
+from app.core.types import UserId
+from app.infrastructure.datasource.dynamodb import serialize_item
+from app.infrastructure.repository import batch
+from app.infrastructure.repository.user_dynamodb_repository import UserDynamoDBRepository
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(batch, "backoff_delay", lambda attempt: 0)
+
+
+def _item(user_id: str) -> dict[str, object]:
+    return serialize_item(
+        {
+            "user_id": user_id,
+            "name": "Taro",
+            "email": "taro@example.com",
+            "age": 30,
+            "address": "Tokyo",
+            "created_at": "2026-01-01T00:00:00+00:00",
+        }
+    )
+
+
+def _make_repo(client: AsyncMock) -> UserDynamoDBRepository:
+    client_manager = MagicMock()
+    client_manager.get_client = AsyncMock(return_value=client)
+    return UserDynamoDBRepository(client_manager=client_manager, table_name="users")
+
+
+def _echo_batch_get(**kwargs):
+    keys = kwargs["RequestItems"]["users"]["Keys"]
+    return {"Responses": {"users": [_item(key["user_id"]["S"]) for key in keys]}}
+
+
+class TestFindByIds:
+    async def test_chunks_keys_by_100(self):
+        client = AsyncMock()
+        client.batch_get_item.side_effect = _echo_batch_get
+        repo = _make_repo(client)
+        user_ids = [UserId(f"u{i}") for i in range(250)]
+
+        users = await repo.find_by_ids(user_ids)
+
+        assert len(users) == 250
+        chunk_sizes = sorted(
+            len(call.kwargs["RequestItems"]["users"]["Keys"]) for call in client.batch_get_item.await_args_list
+        )
+        assert chunk_sizes == [50, 100, 100]
+
+    async def test_duplicate_ids_are_requested_once(self):
+        client = AsyncMock()
+        client.batch_get_item.side_effect = _echo_batch_get
+        repo = _make_repo(client)
+
+        users = await repo.find_by_ids([UserId("u1"), UserId("u1")])
+
+        assert [u.user_id for u in users] == ["u1"]
+
+    async def test_empty_input_skips_request(self):
+        client = AsyncMock()
+        repo = _make_repo(client)
+
+        assert await repo.find_by_ids([]) == []
+        client.batch_get_item.assert_not_awaited()
+
+    async def test_unprocessed_keys_are_retried(self):
+        client = AsyncMock()
+        client.batch_get_item.side_effect = [
+            {
+                "Responses": {"users": [_item("u1")]},
+                "UnprocessedKeys": {"users": {"Keys": [{"user_id": {"S": "u2"}}]}},
+            },
+            {"Responses": {"users": [_item("u2")]}},
+        ]
+        repo = _make_repo(client)
+
+        users = await repo.find_by_ids([UserId("u1"), UserId("u2")])
+
+        assert sorted(u.user_id for u in users) == ["u1", "u2"]
+        retry_request = client.batch_get_item.await_args_list[1].kwargs["RequestItems"]
+        assert retry_request == {"users": {"Keys": [{"user_id": {"S": "u2"}}]}}
+
+    async def test_gives_up_after_max_retries(self):
+        client = AsyncMock()
+        client.batch_get_item.return_value = {
+            "Responses": {"users": []},
+            "UnprocessedKeys": {"users": {"Keys": [{"user_id": {"S": "u1"}}]}},
+        }
+        repo = _make_repo(client)
+
+        with pytest.raises(RepositoryError) as exc_info:
+            await repo.find_by_ids([UserId("u1")])
+
+        assert exc_info.value.operation == "find_by_ids"
+        assert client.batch_get_item.await_count == batch.BATCH_MAX_RETRIES + 1
+
+    async def test_failed_chunk_cancels_the_other_chunks(self):
+        cancelled = asyncio.Event()
+
+        async def batch_get_item(RequestItems):
+            if RequestItems["users"]["Keys"][0]["user_id"]["S"] == "u0":
+                await asyncio.sleep(0)
+                raise ClientError({"Error": {"Code": "ValidationException", "Message": "bad key"}}, "BatchGetItem")
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return {}
+
+        client = AsyncMock()
+        client.batch_get_item.side_effect = batch_get_item
+        repo = _make_repo(client)
+
+        with pytest.raises(RepositoryError) as exc_info:
+            await repo.find_by_ids([UserId(f"u{i}") for i in range(150)])
+
+        assert cancelled.is_set()
+        assert isinstance(exc_info.value.__cause__, ClientError)
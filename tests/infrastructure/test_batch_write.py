@@ -0,0 +1,128 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from botocore.exceptions import ClientError, EndpointConnectionError
+
+from app.core.exceptions import PartialWriteError, RepositoryError
+from app.domain.user.entity import User
+from app.infrastructure.repository import batch
+from app.infrastructure.repository.user_dynamodb_repository import UserDynamoDBRepository
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(batch, "backoff_delay", lambda attempt: 0)
+
+
+def _make_users(count: int) -> list[User]:
+    return [User.create(name=f"U{i}", email=f"u{i}@example.com", age=20, address="Tokyo") for i in range(count)]
+
+
+def _make_repo(client: AsyncMock) -> UserDynamoDBRepository:
+    client_manager = MagicMock()
+    client_manager.get_client = AsyncMock(return_value=client)
+    return UserDynamoDBRepository(client_manager=client_manager, table_name="users")
+
+
+class TestSaveMany:
+    async def test_chunks_items_by_25(self):
+        client = AsyncMock()
+        client.batch_write_item.return_value = {}
+        repo = _make_repo(client)
+
+        await repo.save_many(_make_users(60))
+
+        calls = client.batch_write_item.await_args_list
+        assert sorted(len(call.kwargs["RequestItems"]["users"]) for call in calls) == [10, 25, 25]
+        put = calls[0].kwargs["RequestItems"]["users"][0]["PutRequest"]["Item"]
+        assert put["age"] == {"N": "20"}
+
+    async def test_empty_input_skips_request(self):
+        client = AsyncMock()
+        repo = _make_repo(client)
+
+        await repo.save_many([])
+
+        client.batch_write_item.assert_not_awaited()
+
+    async def test_unprocessed_items_are_retried(self):
+        leftover = {"users": [{"PutRequest": {"Item": {"user_id": {"S": "u1"}}}}]}
+        client = AsyncMock()
+        client.batch_write_item.side_effect = [{"UnprocessedItems": leftover}, {"UnprocessedItems": {}}]
+        repo = _make_repo(client)
+
+        await repo.save_many(_make_users(2))
+
+        assert client.batch_write_item.await_count == 2
+        assert client.batch_write_item.await_args_list[1].kwargs["RequestItems"] == leftover
+
+    async def test_wraps_client_error(self):
+        client = AsyncMock()
+        client.batch_write_item.side_effect = ClientError(
+            error_response={"Error": {"Code": "500", "Message": "DynamoDB error"}},
+            operation_name="BatchWriteItem",
+        )
+        repo = _make_repo(client)
+
+        with pytest.raises(RepositoryError) as exc_info:
+            await repo.save_many(_make_users(1))
+
+        assert exc_info.value.operation == "save_many"
+        assert isinstance(exc_info.value.__cause__, ClientError)
+
+    async def test_wraps_client_creation_error(self):
+        client_manager = MagicMock()
+        client_manager.get_client = AsyncMock(side_effect=EndpointConnectionError(endpoint_url="http://dynamodb"))
+        repo = UserDynamoDBRepository(client_manager=client_manager, table_name="users")
+
+        with pytest.raises(RepositoryError) as exc_info:
+            await repo.save_many(_make_users(1))
+
+        assert exc_info.value.operation == "save_many"
+        assert isinstance(exc_info.value.__cause__, EndpointConnectionError)
+
+    async def test_failed_chunk_cancels_the_rest_and_reports_written_ids(self):
+        users = _make_users(60)
+        cancelled = asyncio.Event()
+
+        async def batch_write_item(RequestItems):
+            first_name = RequestItems["users"][0]["PutRequest"]["Item"]["name"]["S"]
+            if first_name == "U0":
+                return {}
+            if first_name == "U25":
+                await asyncio.sleep(0)
+                raise ClientError(
+                    error_response={"Error": {"Code": "ValidationException", "Message": "bad item"}},
+                    operation_name="BatchWriteItem",
+                )
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return {}
+
+        client = AsyncMock()
+        client.batch_write_item.side_effect = batch_write_item
+        repo = _make_repo(client)
+
+        with pytest.raises(PartialWriteError) as exc_info:
+            await repo.save_many(users)
+
+        assert cancelled.is_set()
+        assert exc_info.value.operation == "save_many"
+        assert exc_info.value.written_ids == [user.user_id for user in users[:25]]
+        assert isinstance(exc_info.value.__cause__, ClientError)
+
+    async def test_exhausted_unprocessed_items_are_excluded_from_written_ids(self):
+        users = _make_users(2)
+        leftover = {"users": [{"PutRequest": {"Item": {"user_id": {"S": users[1].user_id}}}}]}
+        client = AsyncMock()
+        client.batch_write_item.return_value = {"UnprocessedItems": leftover}
+        repo = _make_repo(client)
+
+        with pytest.raises(PartialWriteError) as exc_info:
+            await repo.save_many(users)
+
+        assert exc_info.value.written_ids == [users[0].user_id]
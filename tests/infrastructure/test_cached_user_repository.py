@@ -0,0 +1,121 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.core.exceptions import RepositoryError
+from app.core.types import UserId
+from app.domain.user.entity import User
+from app.domain.user.i_user_repository import IUserRepository
+from app.infrastructure.repository.cached_user_repository import CachedUserRepository
+
+
+def _make_user(name: str = "Taro") -> User:
+    return User(
+        user_id=UserId("test-uuid"),
+        name=name,
+        email="taro@example.com",
+        age=30,
+        address="Tokyo",
+        created_at="2026-01-01T00:00:00+00:00",
+    )
+
+
+def _make_repo(inner: MagicMock) -> CachedUserRepository:
+    return CachedUserRepository(inner=inner, max_size=10, ttl_seconds=60)
+
+
+class TestCachedUserRepository:
+    async def test_second_lookup_is_served_from_cache(self):
+        inner = MagicMock(spec=IUserRepository)
+        inner.find_by_id.return_value = _make_user()
+        repo = _make_repo(inner)
+
+        first = await repo.find_by_id(UserId("test-uuid"))
+        second = await repo.find_by_id(UserId("test-uuid"))
+
+        assert first == second
+        inner.find_by_id.assert_awaited_once()
+        assert repo.stats.hits == 1
+        assert repo.stats.misses == 1
+
+    async def test_missing_user_is_not_cached(self):
+        inner = MagicMock(spec=IUserRepository)
+        inner.find_by_id.return_value = None
+        repo = _make_repo(inner)
+
+        assert await repo.find_by_id(UserId("missing")) is None
+        assert await repo.find_by_id(UserId("missing")) is None
+
+        assert inner.find_by_id.await_count == 2
+
+    async def test_save_updates_cached_entry(self):
+        inner = MagicMock(spec=IUserRepository)
+        inner.find_by_id.return_value = _make_user()
+        repo = _make_repo(inner)
+        await repo.find_by_id(UserId("test-uuid"))
+
+        await repo.save(_make_user(name="Renamed"))
+        result = await repo.find_by_id(UserId("test-uuid"))
+
+        assert result is not None
+        assert result.name == "Renamed"
+        inner.save.assert_awaited_once()
+        inner.find_by_id.assert_awaited_once()
+
+    async def test_failed_save_invalidates_entry(self):
+        inner = MagicMock(spec=IUserRepository)
+        inner.find_by_id.return_value = _make_user()
+        inner.save.side_effect = RepositoryError(message="boom", operation="save")
+        repo = _make_repo(inner)
+        await repo.find_by_id(UserId("test-uuid"))
+
+        with pytest.raises(RepositoryError):
+            await repo.save(_make_user(name="Renamed"))
+        await repo.find_by_id(UserId("test-uuid"))
+
+        assert inner.find_by_id.await_count == 2
+
+    async def test_search_is_delegated(self):
+        inner = MagicMock(spec=IUserRepository)
+        inner.search_by_name.return_value = [_make_user()]
+        repo = _make_repo(inner)
+
+        result = await repo.search_by_name("Taro")
+
+        assert len(result) == 1
+        inner.search_by_name.assert_awaited_once_with("Taro")
+
+    async def test_find_by_ids_fetches_only_uncached(self):
+        inner = MagicMock(spec=IUserRepository)
+        inner.find_by_id.return_value = _make_user()
+        other = _make_user().model_copy(update={"user_id": UserId("other")})
+        inner.find_by_ids.return_value = [other]
+        repo = _make_repo(inner)
+        await repo.find_by_id(UserId("test-uuid"))
+
+        result = await repo.find_by_ids([UserId("test-uuid"), UserId("other")])
+
+        assert sorted(u.user_id for u in result) == ["other", "test-uuid"]
+        inner.find_by_ids.assert_awaited_once_with(["other"])
+
+    async def test_save_many_populates_cache(self):
+        inner = MagicMock(spec=IUserRepository)
+        repo = _make_repo(inner)
+
+        await repo.save_many([_make_user()])
+        result = await repo.find_by_id(UserId("test-uuid"))
+
+        assert result is not None
+        inner.find_by_id.assert_not_awaited()
+
+    async def test_find_by_id_with_fields_does_not_cache_partial_user(self):
+        inner = MagicMock(spec=IUserRepository)
+        inner.find_by_id.return_value = User.from_projection({"user_id": "test-uuid", "name": "Taro"})
+        repo = _make_repo(inner)
+
+        await repo.find_by_id(UserId("test-uuid"), fields=frozenset({"name"}))
+        inner.find_by_id.return_value = _make_user()
+        result = await repo.find_by_id(UserId("test-uuid"))
+
+        assert result == _make_user()
+        assert inner.find_by_id.await_count == 2
@@ -0,0 +1,51 @@
+import asyncio
+
+import pytest
+from aiobotocore.httpsession import AIOHTTPSession
+
+from app.infrastructure.datasource.dynamodb import DynamoDBClientManager
+
+
+@pytest.fixture
+def slow_send(monkeypatch):
+    release = asyncio.Event()
+
+    async def send(self, request):
+        await release.wait()
+        return request
+
+    monkeypatch.setattr(AIOHTTPSession, "send", send)
+    return release
+
+
+class TestDynamoDBClientManager:
+    def test_config_comes_from_arguments(self):
+        manager = DynamoDBClientManager(
+            max_pool_connections=7, connect_timeout=1.5, read_timeout=3.0, retry_mode="adaptive", max_attempts=4
+        )
+
+        config = manager._config
+        assert config.max_pool_connections == 7
+        assert config.connect_timeout == 1.5
+        assert config.read_timeout == 3.0
+        assert config.retries == {"mode": "adaptive", "max_attempts": 4}
+
+    def test_retries_default_to_adaptive_mode(self):
+        # 再試行は botocore だけが行うので、スロットリング時に送信レートを絞る adaptive を既定にする
+        assert DynamoDBClientManager()._config.retries["mode"] == "adaptive"
+
+    async def test_stats_count_requests_waiting_for_a_connection(self, slow_send):
+        manager = DynamoDBClientManager(max_pool_connections=2)
+        session = manager._config.http_session_cls()
+
+        tasks = [asyncio.create_task(session.send(i)) for i in range(5)]
+        await asyncio.sleep(0)
+        during = manager.stats
+        slow_send.set()
+        await asyncio.gather(*tasks)
+
+        assert during.in_flight == 5
+        assert during.saturated == 3
+        assert manager.stats.in_flight == 0
+        assert manager.stats.peak_in_flight == 5
+        assert manager.stats.requests == 5
@@ -0,0 +1,87 @@
+import asyncio
+from unittest.mock import MagicMock
+
+from app.core.types import UserId
+from app.domain.user.entity import SearchCondition, User, UserSearchPlan
+from app.domain.user.i_user_repository import IUserRepository
+from app.infrastructure.repository.coalescing_user_repository import CoalescingUserRepository
+
+
+def _make_user() -> User:
+    return User(
+        user_id=UserId("test-uuid"),
+        name="Taro",
+        email="taro@example.com",
+        age=30,
+        address="Tokyo",
+        created_at="2026-01-01T00:00:00+00:00",
+    )
+
+
+def _slow(result: object):
+    async def call(*args, **kwargs):
+        await asyncio.sleep(0.01)
+        return result
+
+    return call
+
+
+class TestCoalescingUserRepository:
+    async def test_concurrent_find_by_id_hits_inner_once(self):
+        inner = MagicMock(spec=IUserRepository)
+        inner.find_by_id.side_effect = _slow(_make_user())
+        repo = CoalescingUserRepository(inner=inner)
+
+        results = await asyncio.gather(*(repo.find_by_id(UserId("test-uuid")) for _ in range(50)))
+
+        assert all(result is not None and result.name == "Taro" for result in results)
+        inner.find_by_id.assert_awaited_once_with(UserId("test-uuid"), fields=None)
+        assert repo.stats["find_by_id"].collapsed == 49
+
+    async def test_name_and_email_searches_are_keyed_separately(self):
+        inner = MagicMock(spec=IUserRepository)
+        inner.search_by_name.side_effect = _slow([_make_user()])
+        inner.search_by_email.side_effect = _slow([_make_user()])
+        repo = CoalescingUserRepository(inner=inner)
+
+        by_name = await asyncio.gather(*(repo.search_by_name("Taro") for _ in range(5)))
+        by_email = await asyncio.gather(*(repo.search_by_email("Taro") for _ in range(5)))
+
+        inner.search_by_name.assert_awaited_once_with("Taro")
+        inner.search_by_email.assert_awaited_once_with("Taro")
+        assert by_name[0] is not by_name[1]
+        assert len(by_email) == 5
+
+    async def test_equal_search_plans_are_coalesced(self):
+        inner = MagicMock(spec=IUserRepository)
+        inner.search.side_effect = _slow([_make_user()])
+        repo = CoalescingUserRepository(inner=inner)
+
+        # 同じ内容の plan は別インスタンスでも同じキーとして扱う
+        plans = [UserSearchPlan(index_conditions=(SearchCondition(attribute="name", value="Taro"),)) for _ in range(5)]
+        results = await asyncio.gather(*(repo.search(plan) for plan in plans))
+
+        inner.search.assert_awaited_once()
+        assert len(results) == 5
+
+    async def test_sequential_calls_are_not_coalesced(self):
+        inner = MagicMock(spec=IUserRepository)
+        inner.find_by_id.return_value = _make_user()
+        repo = CoalescingUserRepository(inner=inner)
+
+        await repo.find_by_id(UserId("test-uuid"))
+        await repo.find_by_id(UserId("test-uuid"))
+
+        assert inner.find_by_id.await_count == 2
+
+    async def test_different_fields_are_not_coalesced(self):
+        inner = MagicMock(spec=IUserRepository)
+        inner.find_by_id.side_effect = _slow(_make_user())
+        repo = CoalescingUserRepository(inner=inner)
+
+        await asyncio.gather(
+            repo.find_by_id(UserId("test-uuid")),
+            repo.find_by_id(UserId("test-uuid"), fields=frozenset({"name"})),
+        )
+
+        assert inner.find_by_id.await_count == 2
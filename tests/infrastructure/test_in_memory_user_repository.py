@@ -0,0 +1,109 @@
+import threading
+
+import pytest
+
+from app.core.exceptions import InvalidCursorError
+from app.core.types import UserId
+from app.domain.user.entity import User
+from app.infrastructure.repository.cursor import encode_cursor
+from app.infrastructure.repository.in_memory_user_repository import InMemoryUserRepository
+
+
+def _make_user(user_id: str, name: str = "Taro", email: str | None = None) -> User:
+    return User(
+        user_id=UserId(user_id),
+        name=name,
+        email=email or f"{user_id}@example.com",
+        age=30,
+        address="Tokyo",
+        created_at="2026-01-01T00:00:00+00:00",
+    )
+
+
+class TestInMemoryUserRepository:
+    async def test_save_and_find_by_id(self):
+        repo = InMemoryUserRepository()
+        user = _make_user("u-1")
+
+        await repo.save(user)
+
+        assert await repo.find_by_id(UserId("u-1")) == user
+        assert await repo.find_by_id(UserId("u-2")) is None
+
+    async def test_find_by_ids_skips_missing_and_duplicates(self):
+        repo = InMemoryUserRepository([_make_user("u-1"), _make_user("u-2")])
+
+        result = await repo.find_by_ids([UserId("u-1"), UserId("u-3"), UserId("u-1"), UserId("u-2")])
+
+        assert [user.user_id for user in result] == ["u-1", "u-2"]
+
+    async def test_search_uses_indexes(self):
+        repo = InMemoryUserRepository()
+        await repo.save_many([_make_user("u-1", "Taro"), _make_user("u-2", "Taro"), _make_user("u-3", "Hanako")])
+
+        assert {user.user_id for user in await repo.search_by_name("Taro")} == {"u-1", "u-2"}
+        assert [user.user_id for user in await repo.search_by_email("u-3@example.com")] == ["u-3"]
+        assert await repo.search_by_name("Nobody") == []
+
+    async def test_overwrite_moves_index_entries(self):
+        repo = InMemoryUserRepository([_make_user("u-1", "Taro", "old@example.com")])
+
+        await repo.save(_make_user("u-1", "Jiro", "new@example.com"))
+
+        assert await repo.search_by_name("Taro") == []
+        assert await repo.search_by_email("old@example.com") == []
+        assert [user.name for user in await repo.search_by_name("Jiro")] == ["Jiro"]
+        assert [user.user_id for user in await repo.search_by_email("new@example.com")] == ["u-1"]
+        assert len(await repo.find_all()) == 1
+
+    async def test_pages_cover_all_users_once(self):
+        repo = InMemoryUserRepository([_make_user(f"u-{i:02d}") for i in range(7)])
+
+        seen: list[str] = []
+        cursor = None
+        while True:
+            page = await repo.find_page(limit=3, cursor=cursor)
+            seen.extend(user.user_id for user in page.items)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+        assert seen == [f"u-{i:02d}" for i in range(7)]
+
+    async def test_exact_multiple_has_no_trailing_cursor(self):
+        repo = InMemoryUserRepository([_make_user(f"u-{i}") for i in range(3)])
+
+        page = await repo.find_page(limit=3)
+
+        assert len(page.items) == 3
+        assert page.next_cursor is None
+
+    async def test_invalid_cursor(self):
+        repo = InMemoryUserRepository()
+
+        with pytest.raises(InvalidCursorError):
+            await repo.find_page(limit=3, cursor="not-a-cursor")
+        with pytest.raises(InvalidCursorError):
+            await repo.find_page(limit=3, cursor=encode_cursor({"name": "Taro"}))
+
+    async def test_iter_all(self):
+        repo = InMemoryUserRepository([_make_user("u-1"), _make_user("u-2")])
+
+        assert [user.user_id async for user in repo.iter_all()] == ["u-1", "u-2"]
+
+    async def test_concurrent_writes_keep_indexes_consistent(self):
+        repo = InMemoryUserRepository()
+
+        def write(offset: int) -> None:
+            for i in range(200):
+                repo._put(_make_user(f"u-{offset}-{i}", name="Taro"))
+
+        threads = [threading.Thread(target=write, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(await repo.find_all()) == 800
+        assert len(await repo.search_by_name("Taro")) == 800
+        assert len((await repo.find_page(limit=1000)).items) == 800
@@ -0,0 +1,63 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.core.constants import METRIC_OUTCOME_ERROR, METRIC_OUTCOME_SUCCESS
+from app.core.exceptions import RepositoryError
+from app.core.metrics import repository_errors_total, repository_operation_duration_seconds
+from app.core.types import UserId
+from app.domain.user.entity import User
+from app.domain.user.i_user_repository import IUserRepository
+from app.infrastructure.repository.instrumented_user_repository import InstrumentedUserRepository
+
+
+def _make_user() -> User:
+    return User(
+        user_id=UserId("test-uuid"),
+        name="Taro",
+        email="taro@example.com",
+        age=30,
+        address="Tokyo",
+        created_at="2026-01-01T00:00:00+00:00",
+    )
+
+
+class TestInstrumentedUserRepository:
+    async def test_success_is_observed_per_operation(self):
+        inner = MagicMock(spec=IUserRepository)
+        inner.find_by_id.return_value = _make_user()
+        repo = InstrumentedUserRepository(inner=inner)
+        before = repository_operation_duration_seconds.count("find_by_id", METRIC_OUTCOME_SUCCESS)
+
+        result = await repo.find_by_id(UserId("test-uuid"))
+
+        assert result == _make_user()
+        assert repository_operation_duration_seconds.count("find_by_id", METRIC_OUTCOME_SUCCESS) == before + 1
+
+    async def test_repository_error_is_labeled_with_its_operation(self):
+        inner = MagicMock(spec=IUserRepository)
+        inner.find_all.side_effect = RepositoryError(message="boom", operation="parallel_scan")
+        repo = InstrumentedUserRepository(inner=inner)
+        errors_before = repository_errors_total.value("parallel_scan")
+        observed_before = repository_operation_duration_seconds.count("parallel_scan", METRIC_OUTCOME_ERROR)
+
+        with pytest.raises(RepositoryError):
+            await repo.find_all()
+
+        assert repository_errors_total.value("parallel_scan") == errors_before + 1
+        assert repository_operation_duration_seconds.count("parallel_scan", METRIC_OUTCOME_ERROR) == observed_before + 1
+
+    async def test_iter_all_is_observed_once_per_stream(self):
+        async def users():
+            yield _make_user()
+            yield _make_user()
+
+        inner = MagicMock(spec=IUserRepository)
+        inner.iter_all.return_value = users()
+        repo = InstrumentedUserRepository(inner=inner)
+        before = repository_operation_duration_seconds.count("iter_all", METRIC_OUTCOME_SUCCESS)
+
+        result = [user async for user in repo.iter_all()]
+
+        assert len(result) == 2
+        assert repository_operation_duration_seconds.count("iter_all", METRIC_OUTCOME_SUCCESS) == before + 1
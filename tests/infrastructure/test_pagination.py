@@ -0,0 +1,89 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.core.exceptions import InvalidCursorError
+from app.infrastructure.datasource.dynamodb import serialize_item
+from app.infrastructure.repository.cursor import decode_cursor, encode_cursor
+from app.infrastructure.repository.user_dynamodb_repository import UserDynamoDBRepository
+
+
+def _item(user_id: str) -> dict[str, object]:
+    return serialize_item(
+        {
+            "user_id": user_id,
+            "name": "Taro",
+            "email": "taro@example.com",
+            "age": 30,
+            "address": "Tokyo",
+            "created_at": "2026-01-01T00:00:00+00:00",
+        }
+    )
+
+
+def _make_repo(client: AsyncMock) -> UserDynamoDBRepository:
+    client_manager = MagicMock()
+    client_manager.get_client = AsyncMock(return_value=client)
+    return UserDynamoDBRepository(client_manager=client_manager, table_name="users")
+
+
+class TestCursor:
+    def test_round_trip(self):
+        key = {"user_id": "abc"}
+        assert decode_cursor(encode_cursor(key)) == key
+
+    @pytest.mark.parametrize("cursor", ["not-a-cursor", "W10", "!!!"])
+    def test_invalid_cursor_raises(self, cursor):
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(cursor)
+
+
+class TestFindPage:
+    async def test_returns_next_cursor_from_last_evaluated_key(self):
+        client = AsyncMock()
+        client.scan.return_value = {
+            "Items": [_item("u1")],
+            "LastEvaluatedKey": {"user_id": {"S": "u1"}},
+        }
+        repo = _make_repo(client)
+
+        page = await repo.find_page(limit=1)
+
+        client.scan.assert_awaited_once_with(TableName="users", Limit=1)
+        assert [u.user_id for u in page.items] == ["u1"]
+        assert page.next_cursor is not None
+        assert decode_cursor(page.next_cursor) == {"user_id": "u1"}
+
+    async def test_cursor_becomes_exclusive_start_key(self):
+        client = AsyncMock()
+        client.scan.return_value = {"Items": []}
+        repo = _make_repo(client)
+
+        page = await repo.find_page(limit=5, cursor=encode_cursor({"user_id": "u1"}))
+
+        client.scan.assert_awaited_once_with(TableName="users", Limit=5, ExclusiveStartKey={"user_id": {"S": "u1"}})
+        assert page.next_cursor is None
+
+    async def test_cursor_with_foreign_key_is_rejected(self):
+        repo = _make_repo(AsyncMock())
+
+        with pytest.raises(InvalidCursorError):
+            await repo.find_page(limit=5, cursor=encode_cursor({"name": "x"}))
+
+
+class TestFindAll:
+    async def test_follows_last_evaluated_key(self):
+        client = AsyncMock()
+        client.scan.side_effect = [
+            {"Items": [_item("u1")], "LastEvaluatedKey": {"user_id": {"S": "u1"}}},
+            {"Items": [_item("u2")]},
+        ]
+        repo = _make_repo(client)
+
+        users = await repo.find_all()
+
+        assert [u.user_id for u in users] == ["u1", "u2"]
+        assert client.scan.await_args_list[1].kwargs == {
+            "TableName": "users",
+            "ExclusiveStartKey": {"user_id": {"S": "u1"}},
+        }
@@ -0,0 +1,104 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from botocore.exceptions import ClientError
+
+from app.core.exceptions import RepositoryError
+from app.infrastructure.datasource.dynamodb import serialize_item
+from app.infrastructure.repository.parallel_scan import parallel_scan
+from app.infrastructure.repository.user_dynamodb_repository import UserDynamoDBRepository
+
+
+def _raw_item(user_id: str) -> dict[str, object]:
+    return serialize_item(
+        {
+            "user_id": user_id,
+            "name": "Taro",
+            "email": "taro@example.com",
+            "age": 30,
+            "address": "Tokyo",
+            "created_at": "2026-01-01T00:00:00+00:00",
+        }
+    )
+
+
+def _segmented_client(pages_by_segment: dict[int, list[list[str]]]) -> AsyncMock:
+    """セグメントごとに複数ページを返す低レベル client のフェイク。"""
+
+    async def scan(**kwargs):
+        await asyncio.sleep(0)
+        segment = kwargs["Segment"]
+        page_index = int(kwargs.get("ExclusiveStartKey", {}).get("page", 0))
+        pages = pages_by_segment[segment]
+        response = {"Items": [_raw_item(uid) for uid in pages[page_index]]}
+        if page_index + 1 < len(pages):
+            response["LastEvaluatedKey"] = {"page": page_index + 1}
+        return response
+
+    client = AsyncMock()
+    client.scan.side_effect = scan
+    return client
+
+
+async def _collect_user_ids(stream) -> list[str]:
+    return sorted([item["user_id"]["S"] async for item in stream])
+
+
+class TestParallelScan:
+    async def test_merges_all_segments_and_pages(self):
+        client = _segmented_client({0: [["a1", "a2"], ["a3"]], 1: [["b1"]], 2: [[]]})
+
+        user_ids = await _collect_user_ids(parallel_scan(client, "users", total_segments=3, max_workers=2))
+
+        assert user_ids == ["a1", "a2", "a3", "b1"]
+        segments = sorted({call.kwargs["Segment"] for call in client.scan.await_args_list})
+        assert segments == [0, 1, 2]
+        assert all(call.kwargs["TotalSegments"] == 3 for call in client.scan.await_args_list)
+
+    async def test_segment_error_raises_repository_error(self):
+        error = ClientError(
+            error_response={"Error": {"Code": "500", "Message": "DynamoDB error"}},
+            operation_name="Scan",
+        )
+        client = _segmented_client({0: [["a1"]], 1: [["b1"]]})
+        ok_scan = client.scan.side_effect
+
+        async def scan(**kwargs):
+            if kwargs["Segment"] == 1:
+                raise error
+            return await ok_scan(**kwargs)
+
+        client.scan.side_effect = scan
+
+        with pytest.raises(RepositoryError) as exc_info:
+            await _collect_user_ids(parallel_scan(client, "users", total_segments=2, max_workers=2))
+
+        assert exc_info.value.operation == "parallel_scan"
+        assert exc_info.value.__cause__ is error
+
+    async def test_closing_early_cancels_workers(self):
+        client = _segmented_client({0: [[f"a{i}"] for i in range(100)], 1: [[f"b{i}"] for i in range(100)]})
+
+        stream = parallel_scan(client, "users", total_segments=2, max_workers=2, buffer_pages=1)
+        await anext(stream)
+        await stream.aclose()
+
+        assert client.scan.await_count < 200
+        assert len(asyncio.all_tasks()) == 1
+
+
+class TestRepositoryParallelScan:
+    async def test_find_all_uses_segments_when_configured(self):
+        client_manager = MagicMock()
+        client_manager.get_client = AsyncMock(return_value=_segmented_client({0: [["a1"]], 1: [["b1"]]}))
+        repo = UserDynamoDBRepository(
+            client_manager=client_manager,
+            table_name="users",
+            scan_segments=2,
+            scan_max_workers=2,
+        )
+
+        users = await repo.find_all()
+
+        assert sorted(u.user_id for u in users) == ["a1", "b1"]
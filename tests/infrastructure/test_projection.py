@@ -0,0 +1,62 @@
+from unittest.mock import AsyncMock, MagicMock
+
+from app.core.types import UserId
+from app.domain.user.entity import SearchCondition, UserSearchPlan
+from app.infrastructure.datasource.dynamodb import serialize_item
+from app.infrastructure.repository.user_dynamodb_repository import UserDynamoDBRepository
+
+
+def _make_repo(client: AsyncMock) -> UserDynamoDBRepository:
+    client_manager = MagicMock()
+    client_manager.get_client = AsyncMock(return_value=client)
+    return UserDynamoDBRepository(client_manager=client_manager, table_name="users")
+
+
+class TestProjection:
+    async def test_find_by_id_pushes_projection_down(self):
+        client = AsyncMock()
+        client.get_item.return_value = {"Item": serialize_item({"user_id": "u-1", "name": "Taro"})}
+        repo = _make_repo(client)
+
+        user = await repo.find_by_id(UserId("u-1"), fields=frozenset({"name"}))
+
+        kwargs = client.get_item.call_args.kwargs
+        assert kwargs["ProjectionExpression"] == "#p0, #p1"
+        assert kwargs["ExpressionAttributeNames"] == {"#p0": "name", "#p1": "user_id"}
+        assert user is not None
+        assert user.model_dump() == {"user_id": "u-1", "name": "Taro"}
+
+    async def test_find_by_id_without_fields_reads_whole_item(self):
+        client = AsyncMock()
+        client.get_item.return_value = {}
+        repo = _make_repo(client)
+
+        assert await repo.find_by_id(UserId("u-1")) is None
+        assert "ProjectionExpression" not in client.get_item.call_args.kwargs
+
+    async def test_find_page_pushes_projection_down(self):
+        client = AsyncMock()
+        client.scan.return_value = {"Items": [serialize_item({"user_id": "u-1", "age": 30})]}
+        repo = _make_repo(client)
+
+        page = await repo.find_page(limit=10, fields=frozenset({"age"}))
+
+        assert client.scan.call_args.kwargs["ProjectionExpression"] == "#p0, #p1"
+        assert [user.age for user in page.items] == [30]
+
+    async def test_search_keeps_key_and_filter_names(self):
+        client = AsyncMock()
+        client.query.return_value = {"Items": [serialize_item({"user_id": "u-1", "name": "Taro"})]}
+        repo = _make_repo(client)
+        plan = UserSearchPlan(
+            index_conditions=(SearchCondition(attribute="email", value="taro@example.com"),),
+            filter_conditions=(SearchCondition(attribute="name", value="Taro"),),
+        )
+
+        users = await repo.search(plan, fields=frozenset({"name"}))
+
+        kwargs = client.query.call_args.kwargs
+        assert kwargs["ExpressionAttributeNames"] == {"#key": "email", "#f0": "name", "#p0": "name", "#p1": "user_id"}
+        assert kwargs["ProjectionExpression"] == "#p0, #p1"
+        assert kwargs["FilterExpression"] == "#f0 = :f0"
+        assert [user.name for user in users] == ["Taro"]
@@ -1,4 +1,4 @@
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from botocore.exceptions import ClientError
@@ -28,61 +28,64 @@ def _make_client_error() -> ClientError:
 
 
 def _make_repo_with_error(method: str) -> UserDynamoDBRepository:
-    table = MagicMock()
-    error = _make_client_error()
-    getattr(table, method).side_effect = error
-
-    # For query/scan that raise on the method call itself
-    if method in ("get_item", "scan", "query"):
-        getattr(table, method).side_effect = error
-    elif method == "put_item":
-        table.put_item.side_effect = error
-
-    return UserDynamoDBRepository(table=table)
+    client = AsyncMock()
+    getattr(client, method).side_effect = _make_client_error()
+    client_manager = MagicMock()
+    client_manager.get_client = AsyncMock(return_value=client)
+    return UserDynamoDBRepository(client_manager=client_manager, table_name="users")
 
 
 class TestRepositoryErrorWrapping:
-    def test_save_wraps_client_error(self):
+    async def test_save_wraps_client_error(self):
         repo = _make_repo_with_error("put_item")
 
         with pytest.raises(RepositoryError) as exc_info:
-            repo.save(_make_user())
+            await repo.save(_make_user())
 
         assert exc_info.value.operation == "save"
         assert isinstance(exc_info.value.__cause__, ClientError)
 
-    def test_find_by_id_wraps_client_error(self):
+    async def test_find_by_id_wraps_client_error(self):
         repo = _make_repo_with_error("get_item")
 
         with pytest.raises(RepositoryError) as exc_info:
-            repo.find_by_id(UserId("test-uuid"))
+            await repo.find_by_id(UserId("test-uuid"))
 
         assert exc_info.value.operation == "find_by_id"
         assert isinstance(exc_info.value.__cause__, ClientError)
 
-    def test_find_all_wraps_client_error(self):
+    async def test_find_all_wraps_client_error(self):
         repo = _make_repo_with_error("scan")
 
         with pytest.raises(RepositoryError) as exc_info:
-            repo.find_all()
+            await repo.find_all()
 
         assert exc_info.value.operation == "find_all"
         assert isinstance(exc_info.value.__cause__, ClientError)
 
-    def test_search_by_name_wraps_client_error(self):
+    async def test_find_page_wraps_client_error(self):
+        repo = _make_repo_with_error("scan")
+
+        with pytest.raises(RepositoryError) as exc_info:
+            await repo.find_page(limit=10)
+
+        assert exc_info.value.operation == "find_page"
+        assert isinstance(exc_info.value.__cause__, ClientError)
+
+    async def test_search_by_name_wraps_client_error(self):
         repo = _make_repo_with_error("query")
 
         with pytest.raises(RepositoryError) as exc_info:
-            repo.search_by_name("Taro")
+            await repo.search_by_name("Taro")
 
         assert exc_info.value.operation == "search_by_name"
         assert isinstance(exc_info.value.__cause__, ClientError)
 
-    def test_search_by_email_wraps_client_error(self):
+    async def test_search_by_email_wraps_client_error(self):
         repo = _make_repo_with_error("query")
 
         with pytest.raises(RepositoryError) as exc_info:
-            repo.search_by_email("taro@example.com")
+            await repo.search_by_email("taro@example.com")
 
         assert exc_info.value.operation == "search_by_email"
         assert isinstance(exc_info.value.__cause__, ClientError)
@@ -0,0 +1,235 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from botocore.exceptions import ClientError, EndpointConnectionError
+
+from app.core.circuit_breaker import CircuitState
+from app.core.exceptions import RepositoryError, RepositoryUnavailableError
+from app.core.metrics import dynamodb_circuit_rejections_total, dynamodb_circuit_state, dynamodb_retries_total
+from app.core.types import UserId
+from app.domain.user.entity import SearchCondition, UserSearchPlan
+from app.infrastructure.repository.resilience import OperationGuard, is_degraded, is_throttling
+from app.infrastructure.repository.user_dynamodb_repository import UserDynamoDBRepository
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _client_error(code: str, retry_attempts: int = 0) -> ClientError:
+    return ClientError(
+        error_response={
+            "Error": {"Code": code, "Message": code},
+            "ResponseMetadata": {"RetryAttempts": retry_attempts},
+        },
+        operation_name="GetItem",
+    )
+
+
+def _throttled(retry_attempts: int = 0) -> ClientError:
+    return _client_error("ProvisionedThroughputExceededException", retry_attempts)
+
+
+def _make_guard(clock: _FakeClock | None = None, **kwargs) -> OperationGuard:
+    options = {"failure_threshold": 2, "reset_timeout_seconds": 5.0}
+    return OperationGuard(**{**options, **kwargs}, clock=clock or _FakeClock())
+
+
+def _make_repo(client: AsyncMock, guard: OperationGuard) -> UserDynamoDBRepository:
+    client_manager = MagicMock()
+    client_manager.get_client = AsyncMock(return_value=client)
+    return UserDynamoDBRepository(client_manager=client_manager, table_name="users", guard=guard)
+
+
+class TestErrorClassification:
+    def test_throttling_codes(self):
+        assert is_throttling(_throttled())
+        assert is_throttling(_client_error("ThrottlingException"))
+        assert not is_throttling(_client_error("ValidationException"))
+
+    def test_degraded_includes_server_and_connection_errors(self):
+        assert is_degraded(_throttled())
+        assert is_degraded(_client_error("InternalServerError"))
+        assert is_degraded(EndpointConnectionError(endpoint_url="http://localhost:8000"))
+        assert not is_degraded(_client_error("ConditionalCheckFailedException"))
+
+
+class TestThrottling:
+    async def test_guard_does_not_retry_on_top_of_botocore(self):
+        fn = AsyncMock(side_effect=_throttled(retry_attempts=2))
+
+        with pytest.raises(RepositoryUnavailableError) as exc_info:
+            await _make_guard().call("test_throttled", fn)
+
+        assert fn.await_count == 1
+        assert exc_info.value.operation == "test_throttled"
+        assert exc_info.value.retry_after > 0
+        assert isinstance(exc_info.value.__cause__, ClientError)
+
+    async def test_botocore_retries_are_counted(self):
+        before = dynamodb_retries_total.value("test_retries")
+        guard = _make_guard()
+
+        await guard.call("test_retries", AsyncMock(return_value={"ResponseMetadata": {"RetryAttempts": 2}}))
+        with pytest.raises(RepositoryUnavailableError):
+            await guard.call("test_retries", AsyncMock(side_effect=_throttled(retry_attempts=3)))
+
+        assert dynamodb_retries_total.value("test_retries") == before + 5
+
+    async def test_other_errors_are_passed_through(self):
+        fn = AsyncMock(side_effect=_client_error("ValidationException"))
+
+        with pytest.raises(ClientError):
+            await _make_guard().call("test_passed_through", fn)
+
+        assert fn.await_count == 1
+
+
+class TestCircuitBreaker:
+    async def test_opens_and_rejects_without_calling_dynamodb(self):
+        guard = _make_guard()
+        failing = AsyncMock(side_effect=_client_error("InternalServerError"))
+        for _ in range(2):
+            with pytest.raises(ClientError):
+                await guard.call("test_open", failing)
+        before = dynamodb_circuit_rejections_total.value("test_open")
+        fn = AsyncMock(return_value="ok")
+
+        with pytest.raises(RepositoryUnavailableError) as exc_info:
+            await guard.call("test_open", fn)
+
+        fn.assert_not_awaited()
+        assert exc_info.value.retry_after == 5.0
+        assert dynamodb_circuit_rejections_total.value("test_open") == before + 1
+        assert dynamodb_circuit_state.value("test_open") == CircuitState.OPEN
+
+    async def test_breakers_are_per_operation(self):
+        guard = _make_guard()
+        failing = AsyncMock(side_effect=_client_error("InternalServerError"))
+        for _ in range(2):
+            with pytest.raises(ClientError):
+                await guard.call("test_degraded_op", failing)
+
+        assert await guard.call("test_healthy_op", AsyncMock(return_value="ok")) == "ok"
+
+    async def test_recovers_after_reset_timeout(self):
+        clock = _FakeClock()
+        guard = _make_guard(clock)
+        failing = AsyncMock(side_effect=_client_error("InternalServerError"))
+        for _ in range(2):
+            with pytest.raises(ClientError):
+                await guard.call("test_recover", failing)
+
+        clock.now = 5.0
+        assert await guard.call("test_recover", AsyncMock(return_value="ok")) == "ok"
+        assert dynamodb_circuit_state.value("test_recover") == CircuitState.CLOSED
+
+    async def test_cancelled_trial_does_not_block_half_open(self):
+        clock = _FakeClock()
+        guard = _make_guard(clock)
+        failing = AsyncMock(side_effect=_client_error("InternalServerError"))
+        for _ in range(2):
+            with pytest.raises(ClientError):
+                await guard.call("test_cancel", failing)
+        clock.now = 5.0
+
+        task = asyncio.create_task(guard.call("test_cancel", AsyncMock(side_effect=asyncio.Event().wait)))
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert await guard.call("test_cancel", AsyncMock(return_value="ok")) == "ok"
+
+
+class TestRepositoryIntegration:
+    async def test_throttled_find_by_id_is_unavailable(self):
+        client = AsyncMock()
+        client.get_item.side_effect = _throttled()
+        repo = _make_repo(client, _make_guard())
+
+        with pytest.raises(RepositoryUnavailableError) as exc_info:
+            await repo.find_by_id(UserId("u1"))
+
+        assert exc_info.value.operation == "find_by_id"
+        assert client.get_item.await_count == 1
+
+    async def test_open_breaker_fails_fast_with_unavailable(self):
+        client = AsyncMock()
+        client.get_item.side_effect = _client_error("InternalServerError")
+        repo = _make_repo(client, _make_guard())
+        for _ in range(2):
+            with pytest.raises(RepositoryError):
+                await repo.find_by_id(UserId("u1"))
+
+        with pytest.raises(RepositoryUnavailableError) as exc_info:
+            await repo.find_by_id(UserId("u1"))
+
+        assert exc_info.value.operation == "find_by_id"
+        assert client.get_item.await_count == 2
+
+    async def test_concurrent_search_queries_share_the_half_open_trial(self):
+        clock = _FakeClock()
+        guard = _make_guard(clock)
+        client = AsyncMock()
+        client.query.side_effect = _client_error("InternalServerError")
+        repo = _make_repo(client, guard)
+        plan = UserSearchPlan(
+            index_conditions=(
+                SearchCondition(attribute="name", value="Taro"),
+                SearchCondition(attribute="email", value="taro@example.com"),
+            )
+        )
+        for _ in range(2):
+            with pytest.raises(RepositoryError):
+                await repo.search(plan)
+        clock.now = 5.0
+
+        async def query(**kwargs):
+            # 兄弟の Query が half-open の間に並行して走るようにする
+            await asyncio.sleep(0)
+            return {"Items": []}
+
+        client.query.side_effect = query
+
+        assert await repo.search(plan) == []
+        assert guard.breaker("search").state is CircuitState.CLOSED
+
+    async def test_late_failures_do_not_extend_the_open_period(self):
+        clock = _FakeClock()
+        guard = _make_guard(clock)
+        release = asyncio.Event()
+
+        async def slow_failure():
+            await release.wait()
+            raise _client_error("InternalServerError")
+
+        slow = asyncio.create_task(guard.call("test_late", slow_failure))
+        await asyncio.sleep(0)
+        failing = AsyncMock(side_effect=_client_error("InternalServerError"))
+        for _ in range(2):
+            with pytest.raises(ClientError):
+                await guard.call("test_late", failing)
+
+        clock.now = 4.0
+        release.set()
+        with pytest.raises(ClientError):
+            await slow
+
+        clock.now = 5.0
+        assert await guard.call("test_late", AsyncMock(return_value="ok")) == "ok"
+
+    async def test_search_uses_its_own_operation_name(self):
+        client = AsyncMock()
+        client.query.side_effect = _throttled()
+        repo = _make_repo(client, _make_guard())
+
+        with pytest.raises(RepositoryUnavailableError) as exc_info:
+            await repo.search_by_email("taro@example.com")
+
+        assert exc_info.value.operation == "search_by_email"
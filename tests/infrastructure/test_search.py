@@ -0,0 +1,218 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from botocore.exceptions import ClientError
+
+from app.core.exceptions import RepositoryError
+from app.core.types import UserId
+from app.domain.user.entity import SearchCondition, User, UserSearchPlan
+from app.infrastructure.datasource.dynamodb import serialize_item
+from app.infrastructure.repository.in_memory_user_repository import InMemoryUserRepository
+from app.infrastructure.repository.user_dynamodb_repository import UserDynamoDBRepository
+
+_PLAN = UserSearchPlan(
+    index_conditions=(SearchCondition(attribute="email", value="taro@example.com"),),
+    filter_conditions=(SearchCondition(attribute="name", value="Taro"),),
+)
+
+
+def _make_user(user_id: str, name: str = "Taro", email: str = "taro@example.com") -> User:
+    return User(
+        user_id=UserId(user_id),
+        name=name,
+        email=email,
+        age=30,
+        address="Tokyo",
+        created_at="2026-01-01T00:00:00+00:00",
+    )
+
+
+def _make_repo(client: AsyncMock) -> UserDynamoDBRepository:
+    client_manager = MagicMock()
+    client_manager.get_client = AsyncMock(return_value=client)
+    return UserDynamoDBRepository(client_manager=client_manager, table_name="users")
+
+
+class TestDynamoDBSearch:
+    async def test_filters_are_pushed_down(self):
+        client = AsyncMock()
+        client.query.return_value = {"Items": [serialize_item(_make_user("u-1").model_dump())]}
+        repo = _make_repo(client)
+
+        result = await repo.search(_PLAN)
+
+        assert [user.user_id for user in result] == ["u-1"]
+        kwargs = client.query.call_args.kwargs
+        assert kwargs["IndexName"] == "email-index"
+        assert kwargs["KeyConditionExpression"] == "#key = :value"
+        assert kwargs["FilterExpression"] == "#f0 = :f0"
+        assert kwargs["ExpressionAttributeNames"] == {"#key": "email", "#f0": "name"}
+        assert kwargs["ExpressionAttributeValues"] == {":value": {"S": "taro@example.com"}, ":f0": {"S": "Taro"}}
+
+    async def test_follows_last_evaluated_key(self):
+        client = AsyncMock()
+        client.query.side_effect = [
+            {"Items": [], "LastEvaluatedKey": {"user_id": {"S": "u-0"}}},
+            {"Items": [serialize_item(_make_user("u-1").model_dump())]},
+        ]
+        repo = _make_repo(client)
+
+        result = await repo.search(_PLAN)
+
+        assert [user.user_id for user in result] == ["u-1"]
+        assert client.query.call_args_list[1].kwargs["ExclusiveStartKey"] == {"user_id": {"S": "u-0"}}
+
+    async def test_multiple_indexes_are_queried_concurrently_and_intersected(self):
+        in_flight = 0
+        max_in_flight = 0
+        items_by_index = {
+            "email-index": [_make_user("u-1"), _make_user("u-2")],
+            "name-index": [_make_user("u-2"), _make_user("u-3")],
+        }
+
+        async def query(**kwargs):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return {"Items": [serialize_item(user.model_dump()) for user in items_by_index[kwargs["IndexName"]]]}
+
+        client = AsyncMock()
+        client.query.side_effect = query
+        repo = _make_repo(client)
+        plan = UserSearchPlan(
+            index_conditions=(
+                SearchCondition(attribute="email", value="taro@example.com"),
+                SearchCondition(attribute="name", value="Taro"),
+            )
+        )
+
+        result = await repo.search(plan)
+
+        assert [user.user_id for user in result] == ["u-2"]
+        assert client.query.await_count == 2
+        assert max_in_flight == 2
+
+    async def test_failed_index_query_cancels_the_other(self):
+        cancelled = asyncio.Event()
+
+        async def query(**kwargs):
+            if kwargs["IndexName"] == "email-index":
+                await asyncio.sleep(0)
+                raise ClientError({"Error": {"Code": "ValidationException", "Message": "bad query"}}, "Query")
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return {"Items": []}
+
+        client = AsyncMock()
+        client.query.side_effect = query
+        repo = _make_repo(client)
+        plan = UserSearchPlan(
+            index_conditions=(
+                SearchCondition(attribute="email", value="taro@example.com"),
+                SearchCondition(attribute="name", value="Taro"),
+            )
+        )
+
+        with pytest.raises(RepositoryError) as exc_info:
+            await repo.search(plan)
+
+        assert cancelled.is_set()
+        assert isinstance(exc_info.value.__cause__, ClientError)
+
+    async def test_unindexed_attribute(self):
+        repo = _make_repo(AsyncMock())
+        plan = UserSearchPlan(index_conditions=(SearchCondition(attribute="address", value="Tokyo"),))
+
+        with pytest.raises(RepositoryError) as exc_info:
+            await repo.search(plan)
+        assert exc_info.value.operation == "search"
+
+
+class TestDynamoDBNamePrefixSearch:
+    async def test_query_is_bounded_by_limit(self):
+        client = AsyncMock()
+        client.query.return_value = {"Items": [serialize_item(_make_user("u-1").model_dump())]}
+        repo = _make_repo(client)
+
+        result = await repo.search_by_name_prefix("TA", limit=5)
+
+        assert [user.user_id for user in result] == ["u-1"]
+        kwargs = client.query.call_args.kwargs
+        assert kwargs["IndexName"] == "name-prefix-index"
+        assert kwargs["KeyConditionExpression"] == "#bucket = :bucket AND begins_with(#normalized, :prefix)"
+        assert kwargs["ExpressionAttributeValues"] == {":bucket": {"S": "t"}, ":prefix": {"S": "ta"}}
+        assert kwargs["Limit"] == 5
+
+    async def test_saved_items_carry_prefix_attributes(self):
+        client = AsyncMock()
+        repo = _make_repo(client)
+
+        # 全角の "Taro"
+        # 全角の "Taro"
+        await repo.save(_make_user("u-1", name="\uff34\uff41\uff52\uff4f"))
+
+        item = client.put_item.call_args.kwargs["Item"]
+        assert item["name_prefix_bucket"] == {"S": "t"}
+        assert item["name_normalized"] == {"S": "taro"}
+
+
+class TestInMemorySearch:
+    async def test_index_then_filter(self):
+        repo = InMemoryUserRepository(
+            [
+                _make_user("u-1"),
+                _make_user("u-2", name="Jiro"),
+                _make_user("u-3", email="other@example.com"),
+            ]
+        )
+
+        result = await repo.search(_PLAN)
+
+        assert [user.user_id for user in result] == ["u-1"]
+
+    async def test_intersect(self):
+        repo = InMemoryUserRepository(
+            [
+                _make_user("u-1"),
+                _make_user("u-2", name="Jiro"),
+                _make_user("u-3", email="other@example.com"),
+            ]
+        )
+        plan = UserSearchPlan(
+            index_conditions=(
+                SearchCondition(attribute="email", value="taro@example.com"),
+                SearchCondition(attribute="name", value="Taro"),
+            )
+        )
+
+        result = await repo.search(plan)
+
+        assert [user.user_id for user in result] == ["u-1"]
+
+    async def test_name_prefix(self):
+        repo = InMemoryUserRepository(
+            [
+                _make_user("u-1", name="Takashi"),
+                _make_user("u-2", name="takeshi"),
+                _make_user("u-3", name="Hanako"),
+                _make_user("u-4", name="Tal"),
+            ]
+        )
+
+        assert [user.name for user in await repo.search_by_name_prefix("TAK", limit=10)] == ["Takashi", "takeshi"]
+        assert [user.name for user in await repo.search_by_name_prefix("ta", limit=2)] == ["Takashi", "takeshi"]
+        assert await repo.search_by_name_prefix("zz", limit=10) == []
+
+    async def test_name_prefix_follows_renames(self):
+        repo = InMemoryUserRepository([_make_user("u-1", name="Takashi")])
+
+        await repo.save(_make_user("u-1", name="Hanako"))
+
+        assert await repo.search_by_name_prefix("tak", limit=10) == []
+        assert [user.user_id for user in await repo.search_by_name_prefix("han", limit=10)] == ["u-1"]
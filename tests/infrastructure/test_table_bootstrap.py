@@ -0,0 +1,146 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from botocore.exceptions import ClientError
+
+from app.core.config import settings
+from app.infrastructure.constants import INDEX_EMAIL, INDEX_NAME, INDEX_NAME_PREFIX
+from app.infrastructure.datasource import bootstrap
+from app.infrastructure.datasource.dynamodb import ensure_users_table
+
+
+def _table(*index_names: str, billing_mode: str = "PROVISIONED") -> dict:
+    return {
+        "Table": {
+            "TableStatus": "ACTIVE",
+            "GlobalSecondaryIndexes": [{"IndexName": name} for name in index_names],
+            "BillingModeSummary": {"BillingMode": billing_mode},
+        }
+    }
+
+
+def _client_error(code: str, operation: str) -> ClientError:
+    return ClientError({"Error": {"Code": code, "Message": code}}, operation)
+
+
+@pytest.fixture
+def dynamodb_client():
+    client = MagicMock()
+    client.describe_table = AsyncMock(return_value=_table(INDEX_NAME, INDEX_EMAIL, INDEX_NAME_PREFIX))
+    client.create_table = AsyncMock()
+    client.update_table = AsyncMock()
+    waiter = MagicMock()
+    waiter.wait = AsyncMock()
+    client.get_waiter.return_value = waiter
+    return client
+
+
+class TestEnsureUsersTable:
+    async def test_existing_table_is_only_described(self, dynamodb_client):
+        await ensure_users_table(dynamodb_client)
+
+        dynamodb_client.describe_table.assert_awaited_once_with(TableName=settings.dynamodb_table_name)
+        dynamodb_client.create_table.assert_not_awaited()
+        dynamodb_client.update_table.assert_not_awaited()
+
+    async def test_missing_index_is_added_to_existing_table(self, dynamodb_client):
+        dynamodb_client.describe_table.return_value = _table(INDEX_NAME, INDEX_EMAIL)
+
+        await ensure_users_table(dynamodb_client)
+
+        update = dynamodb_client.update_table.await_args.kwargs
+        assert update["TableName"] == settings.dynamodb_table_name
+        [index_update] = update["GlobalSecondaryIndexUpdates"]
+        assert index_update["Create"]["IndexName"] == INDEX_NAME_PREFIX
+        assert "ProvisionedThroughput" in index_update["Create"]
+        assert {attribute["AttributeName"] for attribute in update["AttributeDefinitions"]} == {
+            "name_prefix_bucket",
+            "name_normalized",
+        }
+        dynamodb_client.create_table.assert_not_awaited()
+
+    async def test_index_added_to_on_demand_table_has_no_throughput(self, dynamodb_client):
+        dynamodb_client.describe_table.return_value = _table(INDEX_NAME, INDEX_EMAIL, billing_mode="PAY_PER_REQUEST")
+
+        await ensure_users_table(dynamodb_client)
+
+        [index_update] = dynamodb_client.update_table.await_args.kwargs["GlobalSecondaryIndexUpdates"]
+        assert "ProvisionedThroughput" not in index_update["Create"]
+
+    async def test_index_update_in_progress_is_left_for_next_start(self, dynamodb_client):
+        dynamodb_client.describe_table.return_value = _table()
+        dynamodb_client.update_table.side_effect = _client_error("LimitExceededException", "UpdateTable")
+
+        await ensure_users_table(dynamodb_client)
+
+        dynamodb_client.update_table.assert_awaited_once()
+
+    async def test_missing_table_is_created_and_awaited(self, dynamodb_client):
+        dynamodb_client.describe_table.side_effect = _client_error("ResourceNotFoundException", "DescribeTable")
+
+        await ensure_users_table(dynamodb_client)
+
+        assert dynamodb_client.create_table.await_args.kwargs["TableName"] == settings.dynamodb_table_name
+        dynamodb_client.get_waiter.assert_called_once_with("table_exists")
+        dynamodb_client.get_waiter.return_value.wait.assert_awaited_once_with(TableName=settings.dynamodb_table_name)
+
+    async def test_concurrent_creation_waits_for_the_other_creator(self, dynamodb_client):
+        dynamodb_client.describe_table.side_effect = _client_error("ResourceNotFoundException", "DescribeTable")
+        dynamodb_client.create_table.side_effect = _client_error("ResourceInUseException", "CreateTable")
+
+        await ensure_users_table(dynamodb_client)
+
+        dynamodb_client.get_waiter.return_value.wait.assert_awaited_once()
+
+    async def test_other_errors_propagate(self, dynamodb_client):
+        dynamodb_client.describe_table.side_effect = _client_error("AccessDeniedException", "DescribeTable")
+
+        with pytest.raises(ClientError):
+            await ensure_users_table(dynamodb_client)
+
+        dynamodb_client.create_table.assert_not_awaited()
+
+
+class TestBootstrapDynamoDB:
+    async def test_creates_client_and_checks_table(self, monkeypatch, dynamodb_client):
+        from app.infrastructure.datasource import dynamodb
+
+        get_client = AsyncMock(return_value=dynamodb_client)
+        monkeypatch.setattr(dynamodb.dynamodb_client_manager, "get_client", get_client)
+
+        await bootstrap.bootstrap_dynamodb()
+
+        get_client.assert_awaited_once()
+        dynamodb_client.describe_table.assert_awaited_once()
+
+    async def test_failure_is_raised(self, monkeypatch):
+        from app.infrastructure.datasource import dynamodb
+
+        get_client = AsyncMock(side_effect=_client_error("UnrecognizedClientException", "DescribeTable"))
+        monkeypatch.setattr(dynamodb.dynamodb_client_manager, "get_client", get_client)
+
+        with pytest.raises(ClientError):
+            await bootstrap.bootstrap_dynamodb()
+
+
+class TestBootstrapWithRetry:
+    async def test_retries_with_capped_backoff(self, monkeypatch):
+        attempts = AsyncMock(side_effect=[RuntimeError("down"), RuntimeError("down"), RuntimeError("down"), None])
+        sleep = AsyncMock()
+        monkeypatch.setattr(bootstrap, "bootstrap_dynamodb", attempts)
+        monkeypatch.setattr(bootstrap.asyncio, "sleep", sleep)
+
+        await bootstrap.bootstrap_dynamodb_with_retry(max_attempts=5, base_delay=1.0, max_delay=3.0)
+
+        assert attempts.await_count == 4
+        assert [call.args[0] for call in sleep.await_args_list] == [1.0, 2.0, 3.0]
+
+    async def test_last_error_is_raised_after_max_attempts(self, monkeypatch):
+        attempts = AsyncMock(side_effect=RuntimeError("down"))
+        monkeypatch.setattr(bootstrap, "bootstrap_dynamodb", attempts)
+        monkeypatch.setattr(bootstrap.asyncio, "sleep", AsyncMock())
+
+        with pytest.raises(RuntimeError):
+            await bootstrap.bootstrap_dynamodb_with_retry(max_attempts=3, base_delay=0.0, max_delay=0.0)
+
+        assert attempts.await_count == 3
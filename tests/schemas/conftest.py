@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def setup_and_teardown_table():
+    """Override parent fixture - schema tests don't need DynamoDB."""
+    yield
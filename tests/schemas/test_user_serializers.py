@@ -0,0 +1,38 @@
+import json
+
+from app.core.types import UserId
+from app.domain.user.entity import User, UserPage
+from app.schemas.user import UserResponse, dump_user, dump_user_page, dump_users
+
+
+def _make_user(user_id: str = "test-uuid") -> User:
+    return User(
+        user_id=UserId(user_id),
+        name="Taro",
+        email="taro@example.com",
+        age=30,
+        address="Tokyo",
+        created_at="2026-01-01T00:00:00+00:00",
+    )
+
+
+def test_dump_user_matches_response_model():
+    user = _make_user()
+
+    assert dump_user(user) == UserResponse.from_entity(user).model_dump_json().encode()
+
+
+def test_dump_users_with_fields():
+    users = [_make_user("a"), User.from_projection({"user_id": "b", "name": "Hanako"})]
+
+    assert json.loads(dump_users(users, frozenset({"name"}))) == [{"name": "Taro"}, {"name": "Hanako"}]
+
+
+def test_dump_user_page_keeps_next_cursor():
+    page = UserPage(items=[_make_user()], next_cursor="c1")
+
+    assert json.loads(dump_user_page(page, frozenset({"user_id"}))) == {
+        "items": [{"user_id": "test-uuid"}],
+        "next_cursor": "c1",
+    }
+    assert json.loads(dump_user_page(page))["items"][0] == UserResponse.from_entity(_make_user()).model_dump()
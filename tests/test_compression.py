@@ -0,0 +1,183 @@
+import asyncio
+import zlib
+
+from starlette.responses import Response, StreamingResponse
+
+from app.core.constants import ENCODING_GZIP, MEDIA_TYPE_NDJSON
+from app.middleware import compression_middleware
+from app.middleware.compression_middleware import CompressionMiddleware, available_encoders, select_encoding
+
+
+def _create_users(client, count: int) -> None:
+    payload = {
+        "users": [
+            {"name": f"Zip{i}", "email": f"zip{i}@example.com", "age": 20 + i % 50, "address": "Tokyo"}
+            for i in range(count)
+        ]
+    }
+    assert client.post("/users/bulk", json=payload).status_code == 201
+
+
+async def _collect(app, accept_encoding: str) -> list[dict]:
+    messages: list[dict] = []
+
+    async def receive() -> dict:
+        # StreamingResponse は切断を待ち続けるので、切断は通知しない
+        await asyncio.Event().wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict) -> None:
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(b"accept-encoding", accept_encoding.encode())],
+    }
+    await app(scope, receive, send)
+    return messages
+
+
+class TestSelectEncoding:
+    def test_gzip_is_selected(self):
+        assert select_encoding("gzip, deflate", (ENCODING_GZIP,)) == ENCODING_GZIP
+
+    def test_highest_quality_wins_and_ties_follow_server_order(self):
+        assert select_encoding("gzip;q=0.5, br", ("br", "gzip")) == "br"
+        assert select_encoding("gzip;q=1.0, br;q=0.2", ("br", "gzip")) == "gzip"
+        assert select_encoding("gzip, br", ("br", "gzip")) == "br"
+
+    def test_refused_and_unknown_encodings(self):
+        assert select_encoding("gzip;q=0", (ENCODING_GZIP,)) is None
+        assert select_encoding("identity", (ENCODING_GZIP,)) is None
+        assert select_encoding("*", (ENCODING_GZIP,)) == ENCODING_GZIP
+        assert select_encoding("*, gzip;q=0", (ENCODING_GZIP,)) is None
+
+
+class _FakeBrotli:
+    """brotli パッケージと同じ Compressor の形を zlib で真似る。"""
+
+    class Compressor:
+        def __init__(self, quality: int) -> None:
+            self._compressor = zlib.compressobj()
+
+        def process(self, data: bytes) -> bytes:
+            return self._compressor.compress(data)
+
+        def flush(self) -> bytes:
+            return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+        def finish(self) -> bytes:
+            return self._compressor.flush(zlib.Z_FINISH)
+
+
+class TestAvailableEncoders:
+    def test_gzip_is_always_available(self, monkeypatch):
+        monkeypatch.setattr(compression_middleware, "_import_optional", lambda name: None)
+
+        assert list(available_encoders(gzip_level=6)) == [ENCODING_GZIP]
+
+    def test_brotli_is_preferred_when_installed(self, monkeypatch):
+        monkeypatch.setattr(
+            compression_middleware, "_import_optional", lambda name: _FakeBrotli if name == "brotli" else None
+        )
+
+        encoders = available_encoders(gzip_level=6)
+        encoder = encoders["br"]()
+        compressed = encoder.compress(b"a" * 100, finish=False) + encoder.compress(b"b" * 100, finish=True)
+
+        assert list(encoders) == ["br", ENCODING_GZIP]
+        assert zlib.decompress(compressed) == b"a" * 100 + b"b" * 100
+
+
+class TestCompressionMiddleware:
+    def test_large_list_is_compressed(self, client):
+        _create_users(client, 30)
+
+        response = client.get("/users", headers={"Accept-Encoding": "gzip"})
+
+        assert response.status_code == 200
+        assert response.headers["Content-Encoding"] == ENCODING_GZIP
+        assert "Accept-Encoding" in response.headers["Vary"]
+        assert len(response.json()["items"]) == 30
+
+    def test_small_bodies_are_not_compressed(self, client):
+        created = client.post(
+            "/users", json={"name": "Tiny", "email": "tiny@example.com", "age": 1, "address": "Tokyo"}
+        ).json()
+
+        assert "Content-Encoding" not in client.get("/health", headers={"Accept-Encoding": "gzip"}).headers
+        response = client.get(f"/users/{created['user_id']}", headers={"Accept-Encoding": "gzip"})
+        assert "Content-Encoding" not in response.headers
+        # 圧縮しなくても、同じリクエストへの 304 と揃えるため ETag は弱く、Vary は付ける
+        assert response.headers["ETag"].startswith("W/")
+        assert "Accept-Encoding" in response.headers["Vary"]
+
+    def test_identity_is_not_compressed(self, client):
+        _create_users(client, 30)
+
+        response = client.get("/users", headers={"Accept-Encoding": "identity"})
+
+        assert "Content-Encoding" not in response.headers
+        assert "Accept-Encoding" in response.headers["Vary"]
+        assert not response.headers["ETag"].startswith("W/")
+
+    def test_identity_not_modified_matches_identity_response(self, client):
+        _create_users(client, 30)
+        first = client.get("/users", headers={"Accept-Encoding": "identity"})
+
+        revalidated = client.get(
+            "/users", headers={"Accept-Encoding": "identity", "If-None-Match": first.headers["ETag"]}
+        )
+
+        assert revalidated.status_code == 304
+        assert revalidated.headers["ETag"] == first.headers["ETag"]
+        assert revalidated.headers["Vary"] == first.headers["Vary"]
+
+    def test_compressed_etag_is_weak_and_revalidates(self, client):
+        _create_users(client, 30)
+        first = client.get("/users", headers={"Accept-Encoding": "gzip"})
+        etag = first.headers["ETag"]
+        assert etag.startswith('W/"')
+
+        revalidated = client.get("/users", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+
+        assert revalidated.status_code == 304
+        assert revalidated.headers["ETag"] == etag
+        assert revalidated.headers["Vary"] == first.headers["Vary"]
+
+    async def test_streaming_response_is_compressed_chunk_by_chunk(self):
+        lines = [b'{"user_id":"u%d","name":"streaming user"}\n' % i for i in range(200)]
+
+        async def body():
+            for line in lines:
+                yield line
+
+        async def app(scope, receive, send):
+            await StreamingResponse(body(), media_type=MEDIA_TYPE_NDJSON)(scope, receive, send)
+
+        messages = await _collect(CompressionMiddleware(app, minimum_size=256), "gzip")
+
+        start, *chunks = messages
+        headers = dict(start["headers"])
+        assert headers[b"content-encoding"] == b"gzip"
+        assert b"content-length" not in headers
+        assert len(chunks) > 2
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        # 途中のチャンクまでで、それまでに送った行が伸長できる
+        partial = decompressor.decompress(chunks[0]["body"])
+        assert partial and b"".join(lines).startswith(partial)
+        rest = b"".join(decompressor.decompress(chunk["body"]) for chunk in chunks[1:])
+        assert partial + rest == b"".join(lines)
+
+    async def test_non_compressible_content_type_passes_through(self):
+        payload = bytes(range(256)) * 20
+
+        async def app(scope, receive, send):
+            await Response(payload, media_type="image/png")(scope, receive, send)
+
+        messages = await _collect(CompressionMiddleware(app, minimum_size=16), "gzip")
+
+        assert b"content-encoding" not in dict(messages[0]["headers"])
+        assert messages[1]["body"] == payload
@@ -1,8 +1,12 @@
 import json
+import logging
+import logging.handlers
 import uuid
 
-from app.core.constants import HEADER_REQUEST_ID, HEADER_TRACE_ID
-from app.core.logger import setup_logging
+import structlog
+
+from app.core.constants import HEADER_REQUEST_ID, HEADER_TRACE_ID, LOG_REQUEST_COMPLETED
+from app.core.logger import setup_logging, shutdown_logging
 
 
 class TestTraceId:
@@ -45,3 +49,65 @@ class TestTraceId:
         resp1 = client.get("/users")
         resp2 = client.get("/users")
         assert resp1.headers[HEADER_TRACE_ID] != resp2.headers[HEADER_TRACE_ID]
+
+    def test_streaming_response_has_trace_id_header(self, client):
+        custom_id = "stream-trace-1"
+        response = client.get("/users/export", headers={HEADER_REQUEST_ID: custom_id})
+        assert response.status_code == 200
+        assert response.headers[HEADER_TRACE_ID] == custom_id
+
+    def test_request_completed_logged_with_status(self, client, capfd):
+        setup_logging(json_logs=True, log_level="INFO")
+        client.get("/users/nonexistent")
+
+        captured = capfd.readouterr()
+        logs = [json.loads(line) for line in captured.err.strip().split("\n") if line.strip()]
+        completed = [entry for entry in logs if entry["event"] == LOG_REQUEST_COMPLETED]
+        assert len(completed) == 1
+        assert completed[0]["status_code"] == 404
+        assert completed[0]["duration_ms"] >= 0
+
+
+class TestAsyncLogging:
+    """LOG_ASYNC_ENABLED 時もバックグラウンドで書き出されたログに trace_id が含まれることを検証する。"""
+
+    def test_trace_id_in_async_log_output(self, client, capfd):
+        setup_logging(json_logs=True, log_level="INFO", async_logs=True)
+        try:
+            response = client.get("/users")
+        finally:
+            shutdown_logging()
+        trace_id = response.headers[HEADER_TRACE_ID]
+
+        captured = capfd.readouterr()
+        app_logs = [
+            entry
+            for entry in (json.loads(line) for line in captured.err.strip().split("\n") if line.strip())
+            if entry.get("logger", "").startswith("app.")
+        ]
+
+        assert len(app_logs) > 0
+        for entry in app_logs:
+            assert entry["trace_id"] == trace_id
+
+    def test_foreign_records_keep_trace_id(self, capfd):
+        setup_logging(json_logs=True, log_level="INFO", async_logs=True)
+        try:
+            with structlog.contextvars.bound_contextvars(trace_id="trace-foreign"):
+                logging.getLogger("tests.foreign").info("from stdlib")
+        finally:
+            shutdown_logging()
+
+        entries = [json.loads(line) for line in capfd.readouterr().err.splitlines() if line.strip()]
+        foreign = [entry for entry in entries if entry.get("event") == "from stdlib"]
+        assert foreign[0]["trace_id"] == "trace-foreign"
+
+    def test_logs_after_shutdown_are_written(self, capfd):
+        setup_logging(json_logs=True, log_level="INFO", async_logs=True)
+        shutdown_logging()
+
+        logging.getLogger("uvicorn.error").info("Application shutdown complete.")
+
+        entries = [json.loads(line) for line in capfd.readouterr().err.splitlines() if line.strip()]
+        assert any(entry.get("event") == "Application shutdown complete." for entry in entries)
+        assert not isinstance(logging.getLogger().handlers[0], logging.handlers.QueueHandler)
@@ -0,0 +1,74 @@
+from app.container.container import DIContainer
+from app.core.config import settings
+from app.core.constants import MEDIA_TYPE_PROMETHEUS, METRIC_ROUTE_UNMATCHED
+from app.core.metrics import http_request_duration_seconds, http_requests_total
+
+
+class TestMetricsEndpoint:
+    def test_metrics_exposition(self, client):
+        client.get("/health")
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == MEDIA_TYPE_PROMETHEUS
+        assert "# TYPE http_request_duration_seconds histogram" in response.text
+        assert 'http_requests_total{method="GET",route="/health",status="200"}' in response.text
+
+    def test_route_template_is_used_as_label(self, client):
+        before = http_requests_total.value("GET", "/users/{user_id}", "404")
+
+        client.get("/users/nonexistent-1")
+        client.get("/users/nonexistent-2")
+
+        assert http_requests_total.value("GET", "/users/{user_id}", "404") == before + 2
+        assert http_request_duration_seconds.count("GET", "/users/nonexistent-1", "404") == 0
+
+    def test_unmatched_route(self, client):
+        before = http_requests_total.value("GET", METRIC_ROUTE_UNMATCHED, "404")
+
+        client.get("/no-such-path")
+
+        assert http_requests_total.value("GET", METRIC_ROUTE_UNMATCHED, "404") == before + 1
+
+    def test_repository_operations_are_exposed(self, client):
+        client.get("/users/nonexistent")
+        response = client.get("/metrics")
+
+        assert 'repository_operation_duration_seconds_count{operation="find_by_id",outcome="success"}' in response.text
+
+    def test_cache_and_coalescing_stats_are_exposed(self, client, monkeypatch):
+        monkeypatch.setattr(settings, "user_cache_enabled", True)
+        monkeypatch.setattr(settings, "request_coalescing_enabled", True)
+        DIContainer.reset()
+        try:
+            before = _samples(client.get("/metrics").text)
+            user_id = client.post(
+                "/users", json={"name": "Metric", "email": "metric@example.com", "age": 30, "address": "Tokyo"}
+            ).json()["user_id"]
+            client.get(f"/users/{user_id}")
+            client.get("/users/nonexistent")
+            after = _samples(client.get("/metrics").text)
+        finally:
+            DIContainer.reset()
+
+        assert after["user_cache_hits_total"] == before["user_cache_hits_total"] + 1
+        assert after["user_cache_misses_total"] == before["user_cache_misses_total"] + 1
+        assert after["user_cache_size"] >= 1
+        assert "user_cache_evictions_total" in after
+        assert "user_cache_expirations_total" in after
+        # キャッシュミスの 1 件だけが coalescing を通る
+        assert after["request_coalescing_calls_total"] == before["request_coalescing_calls_total"] + 1
+        assert after["request_coalescing_executions_total"] == before["request_coalescing_executions_total"] + 1
+        assert "request_coalescing_collapsed_total" in after
+        assert after["request_coalescing_in_flight"] == 0
+
+
+def _samples(text: str) -> dict[str, float]:
+    """ラベルのないサンプル行を名前と値の dict にする。"""
+    samples: dict[str, float] = {}
+    for line in text.splitlines():
+        name, _, value = line.partition(" ")
+        if line.startswith("#") or "{" in name or not value:
+            continue
+        samples[name] = float(value)
+    return samples
@@ -0,0 +1,88 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.main as main_module
+from app.core.config import settings
+from app.infrastructure.datasource import bootstrap as bootstrap_module
+
+
+@pytest.fixture
+def fast_start(monkeypatch):
+    """起動処理を gate が開くまで止めるスタブに差し替え、fast start を有効にする。
+
+    state["failures"] 回目までの試行は state["error"] で失敗する (None なら何度でも失敗する)。
+    """
+    gate = threading.Event()
+    state = {"error": None, "failures": None, "attempts": 0}
+
+    async def bootstrap():
+        await asyncio.to_thread(gate.wait)
+        state["attempts"] += 1
+        failures = state["failures"]
+        if state["error"] is not None and (failures is None or state["attempts"] <= failures):
+            raise state["error"]
+
+    async def shutdown():
+        return None
+
+    monkeypatch.setattr(settings, "user_repository_backend", "dynamodb")
+    monkeypatch.setattr(settings, "fast_start_enabled", True)
+    monkeypatch.setattr(settings, "bootstrap_retry_base_delay_seconds", 0.0)
+    monkeypatch.setattr(bootstrap_module, "bootstrap_dynamodb", bootstrap)
+    monkeypatch.setattr(main_module, "shutdown_dynamodb", shutdown)
+    yield gate, state
+    gate.set()
+
+
+def _wait_for_status(client: TestClient, expected: str) -> dict:
+    for _ in range(100):
+        response = client.get("/ready")
+        if response.json()["status"] == expected:
+            return {"status_code": response.status_code, **response.json()}
+        threading.Event().wait(0.01)
+    raise AssertionError(f"/ready never became {expected}")
+
+
+class TestReadiness:
+    def test_ready_after_blocking_startup(self, client):
+        response = client.get("/ready")
+
+        assert response.status_code == 200
+        assert response.json() == {"status": "ready"}
+
+    def test_fast_start_serves_liveness_before_ready(self, fast_start):
+        gate, _ = fast_start
+        with TestClient(main_module.app) as client:
+            assert client.get("/health").status_code == 200
+            response = client.get("/ready")
+            assert response.status_code == 503
+            assert response.json() == {"status": "starting"}
+
+            gate.set()
+
+            assert _wait_for_status(client, "ready")["status_code"] == 200
+
+    def test_fast_start_retries_failed_bootstrap(self, fast_start):
+        gate, state = fast_start
+        state["error"] = RuntimeError("dynamodb not up yet")
+        state["failures"] = 2
+        with TestClient(main_module.app) as client:
+            gate.set()
+
+            assert _wait_for_status(client, "ready")["status_code"] == 200
+            assert state["attempts"] == 3
+            assert client.get("/health").status_code == 200
+
+    def test_fast_start_fails_liveness_after_exhausting_retries(self, fast_start, monkeypatch):
+        gate, state = fast_start
+        monkeypatch.setattr(settings, "bootstrap_max_attempts", 2)
+        state["error"] = RuntimeError("dynamodb unreachable")
+        with TestClient(main_module.app) as client:
+            gate.set()
+
+            assert _wait_for_status(client, "failed")["status_code"] == 503
+            assert state["attempts"] == 2
+            assert client.get("/health").status_code == 503
@@ -1,4 +1,16 @@
 # tests/test_users.py
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+from app.api.dependencies import get_user_service
+from app.api.v1.endpoints.users import export_users
+from app.container.container import DIContainer
+from app.core.config import settings
+from app.core.constants import EXPORT_CHUNK_USERS
+from app.core.exceptions import PartialWriteError, RepositoryUnavailableError
+from app.domain.user.entity import User
+from app.main import app
+from app.usecase.user.user_service import UserService
 
 
 def test_create_user(client):
@@ -19,6 +31,36 @@ def test_create_user(client):
     assert "created_at" in data
 
 
+def test_bulk_create_users(client):
+    payload = {
+        "users": [
+            {"name": f"Bulk{i}", "email": f"bulk{i}@example.com", "age": 20 + i, "address": "Chiba"} for i in range(30)
+        ]
+    }
+    response = client.post("/users/bulk", json=payload)
+    assert response.status_code == 201
+    created = response.json()
+    assert [user["name"] for user in created] == [f"Bulk{i}" for i in range(30)]
+
+    listed = client.get("/users", params={"limit": 100}).json()
+    assert len(listed["items"]) == 30
+
+
+def test_bulk_create_users_validates_every_item(client):
+    payload = {
+        "users": [
+            {"name": "Ok", "email": "ok@example.com", "age": 20, "address": "Chiba"},
+            {"name": "Bad", "email": "not-an-email", "age": 200, "address": "Chiba"},
+        ]
+    }
+    response = client.post("/users/bulk", json=payload)
+    assert response.status_code == 422
+    error_locations = {tuple(error["loc"]) for error in response.json()["detail"]}
+    assert ("body", "users", 1, "email") in error_locations
+    assert ("body", "users", 1, "age") in error_locations
+    assert client.get("/users").json()["items"] == []
+
+
 def test_get_user(client):
     create_resp = client.post(
         "/users",
@@ -53,7 +95,211 @@ def test_list_users(client):
 
     response = client.get("/users")
     assert response.status_code == 200
-    assert len(response.json()) == 2
+    data = response.json()
+    assert len(data["items"]) == 2
+    assert data["next_cursor"] is None or isinstance(data["next_cursor"], str)
+
+
+def test_list_users_paginates_with_cursor(client):
+    for i in range(3):
+        client.post(
+            "/users",
+            json={"name": f"P{i}", "email": f"p{i}@example.com", "age": 20, "address": "Nara"},
+        )
+
+    seen: list[str] = []
+    cursor = None
+    while True:
+        params = {"limit": 2} if cursor is None else {"limit": 2, "cursor": cursor}
+        response = client.get("/users", params=params)
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["items"]) <= 2
+        seen.extend(item["user_id"] for item in data["items"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+
+    assert len(seen) == 3
+    assert len(set(seen)) == 3
+
+
+def test_list_users_invalid_cursor(client):
+    response = client.get("/users", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid cursor"}
+
+
+def test_sparse_fieldsets(client):
+    created = client.post(
+        "/users",
+        json={"name": "Sparse", "email": "sparse@example.com", "age": 40, "address": "Osaka"},
+    ).json()
+
+    got = client.get(f"/users/{created['user_id']}", params={"fields": "user_id,name"})
+    assert got.status_code == 200
+    assert got.json() == {"user_id": created["user_id"], "name": "Sparse"}
+
+    listed = client.get("/users", params={"fields": "name"}).json()
+    assert listed == {"items": [{"name": "Sparse"}], "next_cursor": None}
+
+    searched = client.get("/users/search", params={"email": "sparse@example.com", "fields": "age"}).json()
+    assert searched == [{"age": 40}]
+
+
+def test_sparse_fieldsets_unknown_field(client):
+    response = client.get("/users", params={"fields": "name,password"})
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid fields: password"}
+
+
+def test_conditional_get_user(client):
+    created = client.post(
+        "/users",
+        json={"name": "Etag", "email": "etag@example.com", "age": 33, "address": "Nagoya"},
+    ).json()
+
+    first = client.get(f"/users/{created['user_id']}")
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"] == "no-cache"
+
+    revalidated = client.get(f"/users/{created['user_id']}", headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["ETag"] == etag
+
+    projected = client.get(f"/users/{created['user_id']}", params={"fields": "name"}, headers={"If-None-Match": etag})
+    assert projected.status_code == 200
+    assert projected.headers["ETag"] != etag
+
+
+def test_conditional_list_and_search(client):
+    client.post("/users", json={"name": "Poll", "email": "poll1@example.com", "age": 20, "address": "Kobe"})
+    listed = client.get("/users")
+    searched = client.get("/users/search", params={"name": "Poll"})
+
+    assert client.get("/users", headers={"If-None-Match": listed.headers["ETag"]}).status_code == 304
+    assert (
+        client.get(
+            "/users/search", params={"name": "Poll"}, headers={"If-None-Match": searched.headers["ETag"]}
+        ).status_code
+        == 304
+    )
+
+    client.post("/users", json={"name": "Poll", "email": "poll2@example.com", "age": 21, "address": "Kobe"})
+    changed = client.get("/users", headers={"If-None-Match": listed.headers["ETag"]})
+    assert changed.status_code == 200
+    assert len(changed.json()["items"]) == 2
+
+
+def test_cache_control_is_configurable(client, monkeypatch):
+    monkeypatch.setattr(settings, "http_cache_control", "public, max-age=5")
+    assert client.get("/users").headers["Cache-Control"] == "public, max-age=5"
+
+    monkeypatch.setattr(settings, "http_cache_control", "")
+    assert "Cache-Control" not in client.get("/users").headers
+
+
+def test_query_cache_sees_local_writes(client, monkeypatch):
+    monkeypatch.setattr(settings, "query_cache_enabled", True)
+    DIContainer.reset()
+    try:
+        client.post("/users", json={"name": "Cached", "email": "cached1@example.com", "age": 20, "address": "Sendai"})
+        assert len(client.get("/users").json()["items"]) == 1
+        assert len(client.get("/users/search", params={"name": "Cached"}).json()) == 1
+
+        client.post("/users", json={"name": "Cached", "email": "cached2@example.com", "age": 21, "address": "Sendai"})
+        assert len(client.get("/users").json()["items"]) == 2
+        assert len(client.get("/users/search", params={"name": "Cached"}).json()) == 2
+    finally:
+        DIContainer.reset()
+
+
+def test_repository_unavailable_returns_503_with_retry_after(client):
+    service = MagicMock(spec=UserService)
+    error = RepositoryUnavailableError(message="Circuit breaker is open", operation="find_by_id", retry_after=2.3)
+    service.get_user = AsyncMock(side_effect=error)
+    app.dependency_overrides[get_user_service] = lambda: service
+    try:
+        response = client.get("/users/some-id")
+    finally:
+        app.dependency_overrides.pop(get_user_service)
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "3"
+    assert response.json() == {"detail": "Service temporarily unavailable"}
+
+
+def test_partial_bulk_write_returns_written_ids(client):
+    service = MagicMock(spec=UserService)
+    error = PartialWriteError(message="Saved 1 of 2 users", operation="save_many", written_ids=["u-1"])
+    service.create_users = AsyncMock(side_effect=error)
+    app.dependency_overrides[get_user_service] = lambda: service
+    payload = {
+        "users": [{"name": f"P{i}", "email": f"p{i}@example.com", "age": 20, "address": "Chiba"} for i in range(2)]
+    }
+    try:
+        response = client.post("/users/bulk", json=payload)
+    finally:
+        app.dependency_overrides.pop(get_user_service)
+
+    assert response.status_code == 500
+    assert response.json() == {"detail": "Internal server error", "written_user_ids": ["u-1"]}
+
+
+def test_list_users_limit_out_of_range(client):
+    response = client.get("/users", params={"limit": 0})
+    assert response.status_code == 422
+
+
+def test_batch_get_users(client):
+    ids = [
+        client.post(
+            "/users",
+            json={"name": f"G{i}", "email": f"g{i}@example.com", "age": 20, "address": "Gifu"},
+        ).json()["user_id"]
+        for i in range(3)
+    ]
+
+    response = client.post("/users/batch-get", json={"user_ids": [ids[2], "missing-id", ids[0]]})
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["user_id"] for item in data["items"]] == [ids[2], ids[0]]
+    assert data["missing"] == ["missing-id"]
+
+
+def test_batch_get_users_requires_ids(client):
+    response = client.post("/users/batch-get", json={"user_ids": []})
+    assert response.status_code == 422
+
+
+def test_export_users_streams_ndjson(client):
+    for i in range(3):
+        client.post(
+            "/users",
+            json={"name": f"E{i}", "email": f"e{i}@example.com", "age": 20, "address": "Oita"},
+        )
+
+    response = client.get("/users/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines() if line]
+    assert sorted(line["name"] for line in lines) == ["E0", "E1", "E2"]
+
+
+async def test_export_users_sends_lines_in_chunks():
+    async def users():
+        for i in range(EXPORT_CHUNK_USERS * 2 + 1):
+            yield User.create(name=f"E{i}", email=f"e{i}@example.com", age=20, address="Oita")
+
+    service = MagicMock(spec=UserService)
+    service.export_users.return_value = users()
+
+    response = await export_users(service=service)
+    chunks = [chunk async for chunk in response.body_iterator]
+
+    assert [chunk.count(b"\n") for chunk in chunks] == [EXPORT_CHUNK_USERS, EXPORT_CHUNK_USERS, 1]
+    assert all(chunk.endswith(b"\n") for chunk in chunks)
 
 
 def test_search_by_name(client):
@@ -138,6 +384,27 @@ def test_search_no_params_returns_all(client):
     assert len(response.json()) >= 1
 
 
+def test_search_by_name_prefix(client):
+    # 3 件目は全角の "Takumi"。大文字・小文字や全角・半角の違いは区別しない
+    for name in ["Takashi", "takeshi", "\uff34\uff41\uff4b\uff55\uff4d\uff49", "Hanako"]:
+        client.post(
+            "/users",
+            json={"name": name, "email": f"{name}@example.com", "age": 20, "address": "Tokyo"},
+        )
+
+    response = client.get("/users/search", params={"name_prefix": "TAK"})
+    assert response.status_code == 200
+    assert [user["name"] for user in response.json()] == ["Takashi", "takeshi", "\uff34\uff41\uff4b\uff55\uff4d\uff49"]
+
+    response = client.get("/users/search", params={"name_prefix": "tak", "limit": 2})
+    assert [user["name"] for user in response.json()] == ["Takashi", "takeshi"]
+
+
+def test_search_by_name_prefix_validation(client):
+    assert client.get("/users/search", params={"name_prefix": ""}).status_code == 422
+    assert client.get("/users/search", params={"name_prefix": "a", "limit": 0}).status_code == 422
+
+
 def test_health(client):
     response = client.get("/health")
     assert response.status_code == 200
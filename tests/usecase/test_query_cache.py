@@ -0,0 +1,91 @@
+import asyncio
+
+from app.core.constants import METRIC_CACHE_HIT, METRIC_CACHE_MISS
+from app.core.metrics import query_cache_lookups_total
+from app.core.types import UserId
+from app.domain.user.entity import User, UserPage
+from app.usecase.user.query_cache import UserQueryCache
+
+
+def _make_user(user_id: str) -> User:
+    return User(
+        user_id=UserId(user_id),
+        name="Taro",
+        email="taro@example.com",
+        age=30,
+        address="Tokyo",
+        created_at="2026-01-01T00:00:00+00:00",
+    )
+
+
+class _Loader:
+    def __init__(self, value: object) -> None:
+        self.value = value
+        self.calls = 0
+
+    async def __call__(self) -> object:
+        self.calls += 1
+        return self.value
+
+
+class TestUserQueryCache:
+    async def test_second_lookup_is_a_hit(self):
+        cache = UserQueryCache(max_entries=10, max_users=100, ttl_seconds=60)
+        load = _Loader(UserPage(items=[_make_user("a")]))
+        hits = query_cache_lookups_total.value("page", METRIC_CACHE_HIT)
+        misses = query_cache_lookups_total.value("page", METRIC_CACHE_MISS)
+
+        first = await cache.page((10, None, None), load)
+        second = await cache.page((10, None, None), load)
+
+        assert second is first
+        assert load.calls == 1
+        assert query_cache_lookups_total.value("page", METRIC_CACHE_HIT) == hits + 1
+        assert query_cache_lookups_total.value("page", METRIC_CACHE_MISS) == misses + 1
+
+    async def test_different_queries_do_not_share_entries(self):
+        cache = UserQueryCache(max_entries=10, max_users=100, ttl_seconds=60)
+        load = _Loader([_make_user("a")])
+
+        await cache.users(("Taro", None), load)
+        await cache.users(("Hanako", None), load)
+
+        assert load.calls == 2
+
+    async def test_invalidate_bumps_generation(self):
+        cache = UserQueryCache(max_entries=10, max_users=100, ttl_seconds=60)
+        load = _Loader([_make_user("a")])
+        await cache.users(("Taro", None), load)
+
+        cache.invalidate()
+        await cache.users(("Taro", None), load)
+
+        assert cache.generation == 1
+        assert load.calls == 2
+
+    async def test_read_overlapping_a_write_is_not_served_afterwards(self):
+        cache = UserQueryCache(max_entries=10, max_users=100, ttl_seconds=60)
+        release = asyncio.Event()
+
+        async def slow_load() -> list[User]:
+            await release.wait()
+            return [_make_user("stale")]
+
+        reader = asyncio.create_task(cache.users(("Taro", None), slow_load))
+        await asyncio.sleep(0)
+        cache.invalidate()
+        release.set()
+        await reader
+
+        fresh = _Loader([_make_user("fresh")])
+        result = await cache.users(("Taro", None), fresh)
+
+        assert [user.user_id for user in result] == ["fresh"]
+
+    async def test_total_users_are_bounded(self):
+        cache = UserQueryCache(max_entries=10, max_users=3, ttl_seconds=60)
+        await cache.page(("p1",), _Loader(UserPage(items=[_make_user("a"), _make_user("b")])))
+        await cache.page(("p2",), _Loader(UserPage(items=[_make_user("c"), _make_user("d")])))
+
+        assert cache.stats.size == 1
+        assert cache.stats.weight == 2
@@ -0,0 +1,39 @@
+from app.domain.user.entity import SearchCondition, UserSearchPlan
+from app.usecase.user.search_planner import plan_user_search
+
+
+class TestPlanUserSearch:
+    def test_no_conditions(self):
+        assert plan_user_search(name=None, email=None) is None
+        assert plan_user_search(name="", email="") is None
+
+    def test_single_condition_uses_its_index(self):
+        assert plan_user_search(name="Taro", email=None) == UserSearchPlan(
+            index_conditions=(SearchCondition(attribute="name", value="Taro"),)
+        )
+        assert plan_user_search(name=None, email="taro@example.com") == UserSearchPlan(
+            index_conditions=(SearchCondition(attribute="email", value="taro@example.com"),)
+        )
+
+    def test_email_is_preferred_and_name_becomes_filter(self):
+        plan = plan_user_search(name="Taro", email="taro@example.com")
+
+        assert plan == UserSearchPlan(
+            index_conditions=(SearchCondition(attribute="email", value="taro@example.com"),),
+            filter_conditions=(SearchCondition(attribute="name", value="Taro"),),
+        )
+
+    def test_intersect_strategy_queries_every_index(self):
+        plan = plan_user_search(name="Taro", email="taro@example.com", strategy="intersect")
+
+        assert plan == UserSearchPlan(
+            index_conditions=(
+                SearchCondition(attribute="email", value="taro@example.com"),
+                SearchCondition(attribute="name", value="Taro"),
+            ),
+        )
+
+    def test_intersect_strategy_with_single_condition(self):
+        assert plan_user_search(name="Taro", email=None, strategy="intersect") == UserSearchPlan(
+            index_conditions=(SearchCondition(attribute="name", value="Taro"),)
+        )
@@ -4,9 +4,10 @@ import pytest
 
 from app.core.exceptions import UserNotFoundError
 from app.core.types import UserId
-from app.domain.user.entity import User
+from app.domain.user.entity import SearchCondition, User, UserPage, UserSearchPlan
 from app.domain.user.i_user_repository import IUserRepository
 from app.schemas.user import UserCreate
+from app.usecase.user.query_cache import UserQueryCache
 from app.usecase.user.user_service import UserService
 
 
@@ -24,11 +25,11 @@ def _make_user(**overrides: object) -> User:
 
 
 class TestCreateUser:
-    def test_creates_and_saves_user(self):
+    async def test_creates_and_saves_user(self):
         repo = MagicMock(spec=IUserRepository)
         service = UserService(user_repository=repo)
 
-        result = service.create_user(UserCreate(name="Taro", email="taro@example.com", age=30, address="Tokyo"))
+        result = await service.create_user(UserCreate(name="Taro", email="taro@example.com", age=30, address="Tokyo"))
 
         repo.save.assert_called_once()
         saved_user = repo.save.call_args[0][0]
@@ -38,78 +39,246 @@ class TestCreateUser:
         assert result.user_id is not None
 
 
+class TestCreateUsers:
+    async def test_saves_all_users_in_one_call(self):
+        repo = MagicMock(spec=IUserRepository)
+        service = UserService(user_repository=repo)
+
+        result = await service.create_users(
+            [
+                UserCreate(name="Taro", email="taro@example.com", age=30, address="Tokyo"),
+                UserCreate(name="Hanako", email="hanako@example.com", age=25, address="Osaka"),
+            ]
+        )
+
+        repo.save_many.assert_awaited_once()
+        saved_users = repo.save_many.call_args[0][0]
+        assert [user.name for user in saved_users] == ["Taro", "Hanako"]
+        assert [user.name for user in result] == ["Taro", "Hanako"]
+        assert len({user.user_id for user in result}) == 2
+
+
 class TestGetUser:
-    def test_returns_user_when_found(self):
+    async def test_returns_user_when_found(self):
         repo = MagicMock(spec=IUserRepository)
         user = _make_user()
         repo.find_by_id.return_value = user
         service = UserService(user_repository=repo)
 
-        result = service.get_user(UserId("test-uuid"))
+        result = await service.get_user(UserId("test-uuid"))
 
         assert result.user_id == "test-uuid"
         assert result.name == "Taro"
 
-    def test_raises_when_not_found(self):
+    async def test_raises_when_not_found(self):
         repo = MagicMock(spec=IUserRepository)
         repo.find_by_id.return_value = None
         service = UserService(user_repository=repo)
 
         with pytest.raises(UserNotFoundError):
-            service.get_user(UserId("nonexistent"))
+            await service.get_user(UserId("nonexistent"))
+
+    async def test_passes_fields_through(self):
+        repo = MagicMock(spec=IUserRepository)
+        user = User.from_projection({"user_id": "test-uuid", "name": "Taro"})
+        repo.find_by_id.return_value = user
+        service = UserService(user_repository=repo)
+
+        result = await service.get_user(UserId("test-uuid"), fields=frozenset({"name"}))
+
+        assert result is user
+        repo.find_by_id.assert_awaited_once_with("test-uuid", fields=frozenset({"name"}))
+
+
+class TestGetUsers:
+    async def test_preserves_input_order_and_reports_missing(self):
+        repo = MagicMock(spec=IUserRepository)
+        repo.find_by_ids.return_value = [
+            _make_user(user_id=UserId("b"), name="B"),
+            _make_user(user_id=UserId("a"), name="A"),
+        ]
+        service = UserService(user_repository=repo)
+
+        result = await service.get_users([UserId("a"), UserId("x"), UserId("b"), UserId("a")])
+
+        assert [user.name for user in result.items] == ["A", "B"]
+        assert result.missing == ["x"]
+        repo.find_by_ids.assert_awaited_once_with(["a", "x", "b"])
 
 
 class TestListUsers:
-    def test_returns_all_users(self):
+    async def test_returns_page(self):
+        repo = MagicMock(spec=IUserRepository)
+        repo.find_page.return_value = UserPage(
+            items=[_make_user(), _make_user(name="Hanako")],
+            next_cursor="next",
+        )
+        service = UserService(user_repository=repo)
+
+        result = await service.list_users(limit=2)
+
+        assert len(result.items) == 2
+        assert result.next_cursor == "next"
+        repo.find_page.assert_called_once_with(limit=2, cursor=None, fields=None)
+
+    async def test_passes_cursor_through(self):
+        repo = MagicMock(spec=IUserRepository)
+        repo.find_page.return_value = UserPage(items=[])
+        service = UserService(user_repository=repo)
+
+        result = await service.list_users(limit=10, cursor="abc")
+
+        assert result.items == []
+        assert result.next_cursor is None
+        repo.find_page.assert_called_once_with(limit=10, cursor="abc", fields=None)
+
+
+class TestExportUsers:
+    async def test_streams_iter_all(self):
+        async def users():
+            for name in ["Taro", "Hanako", "Jiro"]:
+                yield _make_user(name=name)
+
         repo = MagicMock(spec=IUserRepository)
-        repo.find_all.return_value = [_make_user(), _make_user(name="Hanako")]
+        repo.iter_all.return_value = users()
         service = UserService(user_repository=repo)
 
-        result = service.list_users()
+        result = [user.name async for user in service.export_users()]
 
-        assert len(result) == 2
+        assert result == ["Taro", "Hanako", "Jiro"]
+        repo.iter_all.assert_called_once_with()
+        repo.find_page.assert_not_called()
+
+    def test_is_lazy(self):
+        repo = MagicMock(spec=IUserRepository)
+        service = UserService(user_repository=repo)
+
+        service.export_users()
+
+        repo.iter_all.assert_not_called()
 
 
 class TestSearchUsers:
-    def test_search_by_name(self):
+    async def test_search_by_name(self):
         repo = MagicMock(spec=IUserRepository)
-        repo.search_by_name.return_value = [_make_user()]
+        repo.search.return_value = [_make_user()]
         service = UserService(user_repository=repo)
 
-        result = service.search_users(name="Taro", email=None)
+        result = await service.search_users(name="Taro", email=None)
 
         assert len(result) == 1
-        repo.search_by_name.assert_called_once_with("Taro")
+        repo.search.assert_called_once_with(
+            UserSearchPlan(index_conditions=(SearchCondition(attribute="name", value="Taro"),)), fields=None
+        )
 
-    def test_search_by_email(self):
+    async def test_search_by_email(self):
         repo = MagicMock(spec=IUserRepository)
-        repo.search_by_email.return_value = [_make_user()]
+        repo.search.return_value = [_make_user()]
         service = UserService(user_repository=repo)
 
-        result = service.search_users(name=None, email="taro@example.com")
+        result = await service.search_users(name=None, email="taro@example.com")
 
         assert len(result) == 1
-        repo.search_by_email.assert_called_once_with("taro@example.com")
+        repo.search.assert_called_once_with(
+            UserSearchPlan(index_conditions=(SearchCondition(attribute="email", value="taro@example.com"),)),
+            fields=None,
+        )
 
-    def test_search_by_name_and_email(self):
+    async def test_search_by_name_and_email_uses_email_index(self):
         repo = MagicMock(spec=IUserRepository)
-        repo.search_by_name.return_value = [
-            _make_user(),
-            _make_user(email="other@example.com"),
-        ]
+        repo.search.return_value = [_make_user()]
         service = UserService(user_repository=repo)
 
-        result = service.search_users(name="Taro", email="taro@example.com")
+        result = await service.search_users(name="Taro", email="taro@example.com")
 
         assert len(result) == 1
         assert result[0].email == "taro@example.com"
+        repo.search.assert_called_once_with(
+            UserSearchPlan(
+                index_conditions=(SearchCondition(attribute="email", value="taro@example.com"),),
+                filter_conditions=(SearchCondition(attribute="name", value="Taro"),),
+            ),
+            fields=None,
+        )
+        repo.search_by_name.assert_not_called()
+
+    async def test_search_by_name_prefix_filters_bounded_results(self):
+        repo = MagicMock(spec=IUserRepository)
+        repo.search_by_name_prefix.return_value = [_make_user(), _make_user(email="other@example.com")]
+        service = UserService(user_repository=repo)
+
+        result = await service.search_users(name=None, email="taro@example.com", name_prefix="Ta", limit=5)
 
-    def test_search_no_params_returns_all(self):
+        assert [user.email for user in result] == ["taro@example.com"]
+        repo.search_by_name_prefix.assert_called_once_with("Ta", 5, fields=None)
+        repo.search.assert_not_called()
+
+    async def test_search_by_name_prefix_with_fields_reads_filter_attributes(self):
+        repo = MagicMock(spec=IUserRepository)
+        repo.search_by_name_prefix.return_value = [
+            User.from_projection({"user_id": "a", "name": "Taro", "email": "taro@example.com"}),
+            User.from_projection({"user_id": "b", "name": "Takeshi", "email": "other@example.com"}),
+        ]
+        service = UserService(user_repository=repo)
+
+        result = await service.search_users(
+            name=None, email="taro@example.com", name_prefix="Ta", limit=5, fields=frozenset({"name"})
+        )
+
+        assert [user.name for user in result] == ["Taro"]
+        repo.search_by_name_prefix.assert_called_once_with("Ta", 5, fields=frozenset({"name", "email"}))
+
+    async def test_search_no_params_returns_all(self):
         repo = MagicMock(spec=IUserRepository)
         repo.find_all.return_value = [_make_user()]
         service = UserService(user_repository=repo)
 
-        result = service.search_users(name=None, email=None)
+        result = await service.search_users(name=None, email=None)
 
         assert len(result) == 1
         repo.find_all.assert_called_once()
+
+
+class TestQueryCache:
+    @staticmethod
+    def _service(repo: MagicMock) -> UserService:
+        cache = UserQueryCache(max_entries=10, max_users=1_000, ttl_seconds=60)
+        return UserService(user_repository=repo, query_cache=cache)
+
+    async def test_list_and_search_are_served_from_cache(self):
+        repo = MagicMock(spec=IUserRepository)
+        repo.find_page.return_value = UserPage(items=[_make_user()])
+        repo.search.return_value = [_make_user()]
+        service = self._service(repo)
+
+        await service.list_users(limit=10)
+        await service.list_users(limit=10)
+        await service.search_users(name="Taro", email=None)
+        await service.search_users(name="Taro", email=None, limit=5)
+
+        repo.find_page.assert_called_once()
+        repo.search.assert_called_once()
+
+    async def test_create_user_invalidates_cached_queries(self):
+        repo = MagicMock(spec=IUserRepository)
+        repo.find_page.return_value = UserPage(items=[])
+        service = self._service(repo)
+
+        await service.list_users(limit=10)
+        await service.create_user(UserCreate(name="Taro", email="taro@example.com", age=30, address="Tokyo"))
+        await service.list_users(limit=10)
+
+        assert repo.find_page.call_count == 2
+
+    async def test_failed_write_still_invalidates(self):
+        repo = MagicMock(spec=IUserRepository)
+        repo.find_page.return_value = UserPage(items=[])
+        repo.save_many.side_effect = RuntimeError("timeout")
+        service = self._service(repo)
+
+        await service.list_users(limit=10)
+        with pytest.raises(RuntimeError):
+            await service.create_users([UserCreate(name="Taro", email="taro@example.com", age=30, address="Tokyo")])
+        await service.list_users(limit=10)
+
+        assert repo.find_page.call_count == 2